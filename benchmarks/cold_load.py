@@ -0,0 +1,91 @@
+"""
+Cold-load benchmark: the original serial, pure-Python YAML path against the libyaml C loader,
+alone and with the rules JSON loaded concurrently and large files parsed across a process pool
+(one worker per core).
+
+Usage:
+    python benchmarks/cold_load.py --concepts 30000 --rules 50000
+
+The speedup from the process pool depends on the number of cores; the C loader alone is
+typically several times faster than the pure-Python one. The synthetic concepts all sit in the
+quantity_types section of lower.yaml, so the report also lists the chunk sizes that section is
+split into for the pool, and the parallel variant's speedup over the serial C loader.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, Optional
+
+import yaml
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_ontology_dir, generate_rules_file
+from src.fast_yaml import split_yaml_mapping
+from src.loader import OntologyLoader
+
+VARIANTS = {
+    "serial_python": {"parallel": False, "yaml_loader": yaml.SafeLoader},
+    "serial_c": {"parallel": False},
+    "parallel_c": {"parallel": True, "yaml_workers": os.cpu_count() or 1},
+}
+
+
+def run(n_concepts: int, n_rules: int, repeats: int, seed: int = 0,
+        workers: Optional[int] = None) -> Dict[str, object]:
+    """
+    Returns the best-of-`repeats` load time in seconds for each loader variant, with the size of
+    lower.yaml and the sizes (MB) of the chunks the parallel variant splits it into. `workers`
+    overrides the parallel variant's pool size (default: one per core).
+    """
+    variants = dict(VARIANTS)
+    if workers is not None:
+        variants["parallel_c"] = {**VARIANTS["parallel_c"], "yaml_workers": workers}
+    with tempfile.TemporaryDirectory() as tmp:
+        ontology_dir = generate_ontology_dir(os.path.join(tmp, 'ontology'), n_concepts, seed)
+        rules_path = generate_rules_file(os.path.join(tmp, 'rules.json'), n_rules, n_concepts, seed)
+        with open(os.path.join(ontology_dir, 'lower.yaml')) as f:
+            text = f.read()
+        workers = variants["parallel_c"]["yaml_workers"]
+        chunks = split_yaml_mapping(text, max(len(text) // workers, 1)) or [text]
+        results = {"lower_yaml_mb": len(text) / (1024 * 1024),
+                   "lower_yaml_chunks_mb": [len(chunk) / (1024 * 1024) for chunk in chunks]}
+        reference = None
+        for name, options in variants.items():
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                ontology = OntologyLoader(ontology_dir, rules_path, **options).get_ontology()
+                timings.append(time.perf_counter() - start)
+            if reference is None:
+                reference = ontology
+            elif ontology != reference:
+                raise AssertionError(f"{name} produced a different ontology")
+            results[name] = min(timings)
+        return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concepts", type=int, default=30000, help="Synthetic concepts to add (default: 30000)")
+    parser.add_argument("--rules", type=int, default=50000, help="Synthetic WEM Rules to generate (default: 50000)")
+    parser.add_argument("--repeats", type=int, default=3, help="Loads per variant; the best is reported (default: 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="Process pool size for parallel_c (default: one per core)")
+    args = parser.parse_args(argv)
+
+    results = run(args.concepts, args.rules, args.repeats, args.seed, args.workers)
+    baseline = results["serial_python"]
+    print(f"concepts={args.concepts} rules={args.rules} lower.yaml={results['lower_yaml_mb']:.1f} MB cpus={os.cpu_count()}")
+    for name in VARIANTS:
+        print(f"{name:<14} {results[name]:8.3f} s  {baseline / results[name]:5.1f}x")
+    chunks = ", ".join(f"{size:.2f}" for size in results["lower_yaml_chunks_mb"])
+    print(f"lower.yaml chunks (MB): {chunks}")
+    print(f"parallel_c over serial_c: {results['serial_c'] / results['parallel_c']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Load test for the HTTP transport: many concurrent agent sessions against one warm server,
+compared with the stdio baseline where every session starts its own server process.
+
+Usage:
+    python benchmarks/http_load.py --sessions 20 --concurrency 5 --calls 10
+    python benchmarks/http_load.py --transports streamable-http --url http://127.0.0.1:8000/mcp
+
+Reports sessions per second and tool-call latency percentiles for each transport. Without --url
+an HTTP server is started on a free local port for the duration of the run.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager, contextmanager
+from itertools import cycle, islice
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamable_http_client
+
+from benchmarks.run_benchmarks import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRANSPORTS = ('stdio', 'streamable-http')
+
+# A typical agent session: mostly definitions and table mappings
+SESSION_CALLS: List[Tuple[str, dict]] = [
+    ("get_concept_definition", {"concept_name": "DispatchPrice"}),
+    ("get_table_mapping", {"concept": "DispatchPrice"}),
+    ("get_concept_definition", {"concept_name": "RegulationRaise"}),
+    ("validate_operation", {"operation": "aggregation",
+                            "parameters": {"market_services": ["RegulationRaise", "RegulationLower"]}}),
+    ("resolve_concepts", {"names": ["Storage", "sent_out_data", "NAQ"]}),
+]
+
+ClientFactory = Callable[[], object]
+
+
+def stdio_factory() -> ClientFactory:
+    params = StdioServerParameters(command=sys.executable, args=["-m", "src.server"], cwd=ROOT)
+
+    @asynccontextmanager
+    async def open_client():
+        with open(os.devnull, 'w') as errlog:
+            async with stdio_client(params, errlog=errlog) as (read, write):
+                yield read, write
+    return open_client
+
+
+def http_factory(url: str) -> ClientFactory:
+    @asynccontextmanager
+    async def open_client():
+        async with streamable_http_client(url) as (read, write, _):
+            yield read, write
+    return open_client
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def http_server(port: Optional[int] = None, per_client_limit: int = 4, timeout: float = 60.0):
+    """Starts `python -m src.server --transport streamable-http` and yields its URL once it accepts connections."""
+    port = port or _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.server", "--transport", "streamable-http", "--port", str(port),
+         "--per-client-limit", str(per_client_limit)],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"HTTP server exited with code {process.returncode}")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("HTTP server did not start")
+                time.sleep(0.1)
+        yield f"http://127.0.0.1:{port}/mcp"
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+async def run_session(open_client: ClientFactory, calls: List[Tuple[str, dict]]) -> Tuple[float, List[float]]:
+    """Runs one session (connect, initialize, call tools); returns its duration and per-call latencies."""
+    start = time.perf_counter()
+    latencies = []
+    async with open_client() as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            for name, arguments in calls:
+                call_start = time.perf_counter()
+                result = await session.call_tool(name, arguments)
+                latencies.append(time.perf_counter() - call_start)
+                if result.isError:
+                    raise RuntimeError(f"{name} failed: {result.content}")
+    return time.perf_counter() - start, latencies
+
+
+async def run_load(open_client: ClientFactory, sessions: int, concurrency: int, calls_per_session: int) -> Dict[str, float]:
+    """Runs `sessions` sessions, at most `concurrency` at a time, and summarizes them."""
+    calls = list(islice(cycle(SESSION_CALLS), calls_per_session))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded():
+        async with semaphore:
+            return await run_session(open_client, calls)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(bounded() for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+
+    durations = sorted(duration for duration, _ in results)
+    latencies = sorted(latency for _, session_latencies in results for latency in session_latencies)
+    return {
+        "sessions": sessions,
+        "tool_calls": len(latencies),
+        "sessions_per_sec": sessions / elapsed if elapsed else 0.0,
+        "session_p50_ms": percentile(durations, 50) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def run(sessions: int, concurrency: int, calls_per_session: int, transports=TRANSPORTS,
+        url: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for transport in transports:
+        if transport == 'stdio':
+            results[transport] = asyncio.run(run_load(stdio_factory(), sessions, concurrency, calls_per_session))
+        elif url:
+            results[transport] = asyncio.run(run_load(http_factory(url), sessions, concurrency, calls_per_session))
+        else:
+            with http_server(per_client_limit=max(concurrency, 1)) as server_url:
+                results[transport] = asyncio.run(
+                    run_load(http_factory(server_url), sessions, concurrency, calls_per_session))
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20, help="Agent sessions to run (default: 20)")
+    parser.add_argument("--concurrency", type=int, default=5, help="Sessions open at once (default: 5)")
+    parser.add_argument("--calls", type=int, default=10, help="Tool calls per session (default: 10)")
+    parser.add_argument("--transports", nargs="+", choices=TRANSPORTS, default=list(TRANSPORTS))
+    parser.add_argument("--url", help="Use a running HTTP server instead of starting one")
+    args = parser.parse_args(argv)
+
+    results = run(args.sessions, args.concurrency, args.calls, args.transports, args.url)
+    print(f"sessions={args.sessions} concurrency={args.concurrency} calls/session={args.calls} cpus={os.cpu_count()}")
+    for transport, r in results.items():
+        print(f"{transport:<16} {r['sessions_per_sec']:7.2f} sessions/s  session p50 {r['session_p50_ms']:8.1f} ms  "
+              f"tool p50 {r['p50_ms']:6.1f} ms  p95 {r['p95_ms']:6.1f} ms  p99 {r['p99_ms']:6.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
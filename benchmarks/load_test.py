@@ -0,0 +1,405 @@
+"""
+Load generator simulating concurrent agent sessions against the MCP server.
+
+Usage:
+    python benchmarks/load_test.py --driver in-process --sessions 200 --concurrency 20
+    python benchmarks/load_test.py --driver stdio --sessions 10 --concurrency 4
+    python benchmarks/load_test.py --driver http --sessions 100 --concurrency 20
+    python benchmarks/load_test.py --mix get_concept_definition=0.6,search_wem_rules=0.4
+    python benchmarks/load_test.py --record trace.jsonl     # also save the generated sessions
+    python benchmarks/load_test.py --trace trace.jsonl      # replay recorded agent sessions
+
+Sessions are drawn from a weighted tool mix (by default mostly get_concept_definition and
+get_table_mapping with occasional search_wem_rules and compare_versions), or replayed from a
+trace: JSON lines of {"session", "tool", "arguments"} with an optional "think_ms" pause before
+the call. The report gives throughput, per-tool latency percentiles and histograms, and the
+resident memory of the server process(es) sampled over the run.
+
+The in-process driver calls the tools through FastMCP's dispatcher in this process; the tools are
+synchronous, so its concurrency measures queueing rather than parallelism. The stdio driver starts
+one server process per session, as agents do today; the http driver shares one warm server.
+
+Errors count calls that raised or failed in transport, and calls whose tool returned an error
+result. Tools report errors as text, so error results are read from the server's own metrics
+registry: per call in process, at the end of each stdio session, and before and after the run
+over http (with --url this includes other clients' errors on that server).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run_benchmarks import percentile
+from src.metrics import Histogram, LATENCY_BUCKETS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DRIVERS = ('in-process', 'stdio', 'http')
+
+DEFAULT_MIX = {
+    "get_concept_definition": 0.50,
+    "get_table_mapping": 0.35,
+    "search_wem_rules": 0.12,
+    "compare_versions": 0.03,
+}
+
+SEARCH_QUERIES = ["capacity", "dispatch", "settlement", "facility", "reserve", "outage", "bid", "price"]
+
+# Builds the arguments of a call from a random generator and the concept and table names
+ARGUMENTS: Dict[str, Callable[[random.Random, dict], dict]] = {
+    "get_concept_definition": lambda rng, names: {"concept_name": rng.choice(names["concepts"])},
+    "get_table_mapping": lambda rng, names: {"concept": rng.choice(names["tables"])},
+    "search_wem_rules": lambda rng, names: {"query": rng.choice(SEARCH_QUERIES)},
+    "compare_versions": lambda rng, names: {"base_ref": "HEAD", "target_ref": "HEAD"},
+    "resolve_concepts": lambda rng, names: {"names": rng.sample(names["concepts"], min(3, len(names["concepts"])))},
+    "validate_operation": lambda rng, names: {
+        "operation": "aggregation", "parameters": {"market_services": ["RegulationRaise", "RegulationLower"]}},
+}
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parses "tool=weight,tool=weight" into normalised weights."""
+    mix = {}
+    for part in text.split(','):
+        tool, _, weight = part.partition('=')
+        tool = tool.strip()
+        if tool not in ARGUMENTS:
+            raise ValueError(f"Unknown tool '{tool}' in mix. Use any of {sorted(ARGUMENTS)}")
+        try:
+            mix[tool] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight '{weight}' for {tool}")
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("Mix weights must sum to a positive number")
+    return {tool: weight / total for tool, weight in mix.items()}
+
+
+def workload_names(ontology=None) -> dict:
+    """Concept names (with a few misses) and table names to draw call arguments from."""
+    if ontology is None:
+        from src.loader import OntologyLoader
+        ontology = OntologyLoader(os.path.join(ROOT, 'ontology')).get_ontology()
+    concepts = (list(ontology.market_services) + list(ontology.facility_types) + list(ontology.quantity_types)
+                + list(ontology.markets) + list(ontology.tables) + ["Battery", "DispatchPrise"])
+    tables = [table.concept for table in ontology.tables.values()] + list(ontology.tables)
+    return {"concepts": concepts, "tables": tables}
+
+
+def generate_sessions(n_sessions: int, calls_per_session: int, mix: Dict[str, float], names: dict,
+                      seed: int = 0) -> List[List[dict]]:
+    rng = random.Random(seed)
+    tools, weights = list(mix), list(mix.values())
+    return [
+        [{"tool": tool, "arguments": ARGUMENTS[tool](rng, names)}
+         for tool in rng.choices(tools, weights, k=calls_per_session)]
+        for _ in range(n_sessions)
+    ]
+
+
+def save_trace(path: str, sessions: List[List[dict]]):
+    with open(path, 'w') as f:
+        for session_id, calls in enumerate(sessions):
+            for call in calls:
+                f.write(json.dumps({"session": session_id, **call}) + "\n")
+
+
+def load_trace(path: str) -> List[List[dict]]:
+    """Reads a trace into sessions, keeping the order of calls within each session."""
+    sessions: Dict[object, List[dict]] = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                sessions.setdefault(record.get("session"), []).append(record)
+    return list(sessions.values())
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Current resident set size of a process in MB (Linux only; None elsewhere)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def child_pids(pid: int) -> List[int]:
+    children = []
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return children
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; the parent pid follows the closing parenthesis
+                if int(f.read().rsplit(')', 1)[1].split()[1]) == pid:
+                    children.append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return children
+
+
+class MemorySampler:
+    """Samples the summed RSS of a set of processes on a background thread."""
+
+    def __init__(self, pids: Callable[[], List[int]], interval: float = 0.25):
+        self.pids = pids
+        self.interval = interval
+        self.samples: List[List[float]] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        start = time.perf_counter()
+        while True:
+            sizes = [rss_mb(pid) for pid in self.pids()]
+            sizes = [size for size in sizes if size is not None]
+            if sizes:
+                self.samples.append([round(time.perf_counter() - start, 3), round(sum(sizes), 1)])
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def summary(self) -> dict:
+        values = [mb for _, mb in self.samples]
+        return {
+            "samples": self.samples,
+            "peak_mb": max(values) if values else None,
+            "final_mb": values[-1] if values else None,
+        }
+
+
+def tool_errors(metrics: dict) -> Dict[str, int]:
+    """Error counts by tool from a metrics registry report (see get_server_metrics)."""
+    return {tool: stats["errors"] for tool, stats in metrics["tools"].items() if stats["errors"]}
+
+
+def add_counts(total: Dict[str, int], counts: Dict[str, int], sign: int = 1):
+    for tool, count in counts.items():
+        total[tool] = total.get(tool, 0) + sign * count
+        if not total[tool]:
+            del total[tool]
+
+
+async def server_tool_errors(session) -> Dict[str, int]:
+    result = await session.call_tool("get_server_metrics", {})
+    return tool_errors(json.loads(result.content[0].text))
+
+
+@asynccontextmanager
+async def in_process_session():
+    """
+    Calls return whether the tool recorded an error in the registry. The tools run synchronously,
+    so no other call interleaves between the two reads.
+    """
+    from src import server
+    from src.metrics import registry
+
+    def errors(tool: str) -> int:
+        stats = registry.tools.get(tool)
+        return stats.errors if stats else 0
+
+    async def call(tool: str, arguments: dict) -> bool:
+        before = errors(tool)
+        await server.mcp.call_tool(tool, arguments)
+        return errors(tool) > before
+    yield call
+
+
+def mcp_session(open_client, server_errors: Optional[Dict[str, int]] = None, shared_server: bool = False):
+    """
+    Sessions over an MCP client. Error results are not visible to the client, so when `server_errors`
+    is given tool failures are left to the server's metrics: each session adds its own server's
+    error counts when it ends, unless the server is shared and read once for the whole run.
+    """
+    @asynccontextmanager
+    async def session_factory():
+        from mcp import ClientSession
+        async with open_client() as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+
+                async def call(tool: str, arguments: dict) -> bool:
+                    result = await session.call_tool(tool, arguments)
+                    if result.isError and server_errors is None:
+                        raise RuntimeError(f"{tool} failed: {result.content}")
+                    return False
+                yield call
+                if server_errors is not None and not shared_server:
+                    add_counts(server_errors, await server_tool_errors(session))
+    return session_factory
+
+
+async def shared_server_errors(open_client) -> Dict[str, int]:
+    """Error counts of a shared server, read through a session of its own."""
+    from mcp import ClientSession
+    async with open_client() as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            return await server_tool_errors(session)
+
+
+async def run_sessions(open_session, sessions: List[List[dict]], concurrency: int) -> dict:
+    """
+    Runs the sessions, at most `concurrency` at a time, recording every call's latency. A call is
+    an error if it raises or returns True.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+
+    async def run_one(calls):
+        async with semaphore:
+            async with open_session() as call:
+                for record in calls:
+                    if record.get("think_ms"):
+                        await asyncio.sleep(record["think_ms"] / 1000)
+                    start = time.perf_counter()
+                    try:
+                        failed = await call(record["tool"], record.get("arguments", {}))
+                    except Exception:
+                        failed = True
+                    if failed:
+                        errors[record["tool"]] = errors.get(record["tool"], 0) + 1
+                    latencies.setdefault(record["tool"], []).append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_one(calls) for calls in sessions))
+    return {"elapsed": time.perf_counter() - start, "latencies": latencies, "errors": errors}
+
+
+def latency_summary(samples: List[float]) -> dict:
+    ordered = sorted(samples)
+    histogram = Histogram(LATENCY_BUCKETS)
+    for value in ordered:
+        histogram.observe(value)
+    return {
+        "calls": len(ordered),
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p90_ms": percentile(ordered, 90) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+        "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+        "histogram": histogram.to_dict()["buckets"],
+    }
+
+
+def run(driver: str, sessions: List[List[dict]], concurrency: int, url: Optional[str] = None,
+        sample_interval: float = 0.25) -> dict:
+    """Drives the sessions through one driver and returns the load report."""
+    from contextlib import nullcontext
+    from benchmarks.http_load import http_factory, http_server, stdio_factory
+
+    if driver not in DRIVERS:
+        raise ValueError(f"Unknown driver '{driver}'. Use one of {list(DRIVERS)}")
+    if driver == 'in-process':
+        from src import server  # noqa: F401  (load the ontology before timing starts)
+        pids = lambda: [os.getpid()]
+    else:
+        pids = lambda: child_pids(os.getpid())
+
+    server_context = http_server(per_client_limit=max(concurrency, 1)) if driver == 'http' and not url else nullcontext(url)
+    server_errors: Dict[str, int] = {}
+    with server_context as server_url:
+        if driver == 'in-process':
+            open_session = in_process_session
+        elif driver == 'stdio':
+            open_session = mcp_session(stdio_factory(), server_errors)
+        else:
+            open_session = mcp_session(http_factory(server_url), server_errors, shared_server=True)
+            add_counts(server_errors, asyncio.run(shared_server_errors(http_factory(server_url))), -1)
+        with MemorySampler(pids, sample_interval) as sampler:
+            outcome = asyncio.run(run_sessions(open_session, sessions, concurrency))
+        if driver == 'http':
+            add_counts(server_errors, asyncio.run(shared_server_errors(http_factory(server_url))))
+    errors = dict(outcome["errors"])
+    add_counts(errors, {tool: count for tool, count in server_errors.items() if tool in outcome["latencies"]})
+
+    all_latencies = [value for values in outcome["latencies"].values() for value in values]
+    elapsed = outcome["elapsed"]
+    return {
+        "driver": driver,
+        "sessions": len(sessions),
+        "concurrency": concurrency,
+        "calls": len(all_latencies),
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "calls_per_sec": len(all_latencies) / elapsed if elapsed else 0.0,
+        "sessions_per_sec": len(sessions) / elapsed if elapsed else 0.0,
+        "overall": latency_summary(all_latencies),
+        "tools": {tool: latency_summary(values) for tool, values in sorted(outcome["latencies"].items())},
+        "memory": sampler.summary(),
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"driver={report['driver']} sessions={report['sessions']} concurrency={report['concurrency']} "
+        f"calls={report['calls']} errors={sum(report['errors'].values())}",
+        f"throughput: {report['calls_per_sec']:.1f} calls/s, {report['sessions_per_sec']:.2f} sessions/s "
+        f"over {report['elapsed_s']:.2f} s",
+        f"{'tool':<28}{'calls':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+    ]
+    for name, stats in list(report["tools"].items()) + [("(all)", report["overall"])]:
+        lines.append(f"{name:<28}{stats['calls']:>8}{stats['p50_ms']:>10.2f}{stats['p90_ms']:>10.2f}"
+                     f"{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+    memory = report["memory"]
+    if memory["peak_mb"] is not None:
+        lines.append(f"memory: peak {memory['peak_mb']:.1f} MB, final {memory['final_mb']:.1f} MB "
+                     f"({len(memory['samples'])} samples)")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--driver", choices=DRIVERS, default="in-process")
+    parser.add_argument("--sessions", type=int, default=100, help="Sessions to generate (default: 100)")
+    parser.add_argument("--calls", type=int, default=10, help="Tool calls per generated session (default: 10)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Sessions open at once (default: 10)")
+    parser.add_argument("--mix", help="Tool weights, e.g. get_concept_definition=0.6,search_wem_rules=0.4")
+    parser.add_argument("--trace", help="Replay sessions from a JSON-lines trace instead of generating them")
+    parser.add_argument("--record", help="Write the sessions that were run to this trace file")
+    parser.add_argument("--url", help="For the http driver: use a running server instead of starting one")
+    parser.add_argument("--sample-interval", type=float, default=0.25, help="Seconds between memory samples")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        sessions = load_trace(args.trace)
+    else:
+        mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+        sessions = generate_sessions(args.sessions, args.calls, mix, workload_names(), args.seed)
+    if args.record:
+        save_trace(args.record, sessions)
+
+    report = run(args.driver, sessions, args.concurrency, args.url, args.sample_interval)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
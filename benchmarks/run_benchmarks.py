@@ -0,0 +1,206 @@
+"""
+Benchmark suite for the loader, tool lookups, validation, search and version comparison.
+
+Usage:
+    python benchmarks/run_benchmarks.py --concepts 10000 --rules 100000
+    python benchmarks/run_benchmarks.py --save-baseline       # store results as the baseline
+    python benchmarks/run_benchmarks.py --tolerance 0.25      # fail if >25% slower than baseline
+
+Each benchmark reports throughput, latency percentiles and the peak memory it allocated, traced
+with tracemalloc over a separate pass so tracing does not slow the timed calls. The baseline
+stores the run configuration (concepts, rules, iterations, seed) with the results, and a run with
+a different configuration is not compared against it.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import cycle, islice
+from typing import Callable, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import generate_ontology_dir, generate_rules_file, synthetic_concept_names, WORDS
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def peak_allocated_mb(fn: Callable, inputs: List[tuple]) -> float:
+    """Peak memory in MB allocated by one call of fn(*args) per input, traced with tracemalloc."""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start, _ = tracemalloc.get_traced_memory()
+    try:
+        for args in inputs:
+            fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return max(peak - start, 0) / (1024 * 1024)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(fn: Callable, inputs: List[tuple], iterations: int) -> Dict[str, float]:
+    """
+    Calls fn(*args) `iterations` times, cycling through `inputs`, and summarizes latencies.
+    Memory is then traced over one more pass through `inputs` (at most `iterations` calls).
+    """
+    timings = []
+    for args in islice(cycle(inputs), iterations):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    total = sum(timings)
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / total if total else 0.0,
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+        "peak_alloc_mb": peak_allocated_mb(fn, inputs[:iterations]),
+    }
+
+
+def run_suite(n_concepts: int, n_rules: int, iterations: int, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    from src import server
+    from src.loader import OntologyLoader
+    from src.catalog import DataCatalog
+
+    results = {}
+
+    # Version comparison runs against the real repository before the synthetic ontology is installed.
+    results["compare_versions"] = measure(server.compare_versions, [("HEAD", "HEAD")], max(1, iterations // 100))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ontology_dir = generate_ontology_dir(os.path.join(temp_dir, "ontology"), n_concepts, seed)
+        rules_path = generate_rules_file(os.path.join(temp_dir, "rules.json"), n_rules, n_concepts, seed)
+
+        loaders = []
+        results["loader"] = measure(
+            lambda: loaders.append(OntologyLoader(ontology_dir, rules_path)), [()], max(1, iterations // 100)
+        )
+        ontology = loaders[-1].get_ontology()
+        del loaders
+
+    original_ontology = server.ontology
+    server._init_components(ontology)
+    try:
+        names = synthetic_concept_names(n_concepts)[:200] or ["Energy"]
+        lookups = names[:100] + [f"SQ{i}" for i in range(min(50, len(names)))] + ["sent_out_data", "RTM", "Storage"]
+        results["get_concept_definition"] = measure(server.get_concept_definition, [(n,) for n in lookups], iterations)
+
+        queries = [(w,) for w in WORDS[:5]] + [(n,) for n in names[:5]]
+        results["search_wem_rules"] = measure(server.search_wem_rules, queries, max(1, iterations // 10))
+
+        validation_cases = [
+            ("dispatch_weighted_price", {"units": {"quantity": "MW", "price": "AUD/MWh"}}),
+            ("dispatch_weighted_price", {"facility_type": "Storage", "separate_flows": False}),
+            ("aggregation", {"market_services": ["RegulationRaise", "RegulationLower", "Energy"]}),
+            ("any", {"source_interval": "DispatchInterval", "target_interval": "TradingInterval"}),
+            ("calculate_capacity_factor", {"facility_type": "Storage", "cf_type": "discharge"}),
+        ]
+        results["validate_operation"] = measure(server.validator.validate_operation, validation_cases, iterations)
+
+        catalog = DataCatalog(ontology)
+        concepts = [(ontology.tables[t].concept,) for t in list(ontology.tables)[-50:]] + [("Missing",)]
+        results["catalog_get_table_for_concept"] = measure(catalog.get_table_for_concept, concepts, iterations)
+        results["catalog_get_columns"] = measure(catalog.get_columns, [(t,) for t in list(ontology.tables)[-50:]], iterations)
+    finally:
+        server._init_components(original_ontology)
+
+    return results
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                        tolerance: float) -> List[str]:
+    """Returns a description of every metric that regressed by more than `tolerance` (a fraction)."""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in ["p50_ms", "p95_ms", "peak_alloc_mb"]:
+            if current.get(metric) is None or not base.get(metric):
+                continue
+            if current[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name}.{metric}: {current[metric]:.3f} vs baseline {base[metric]:.3f}")
+    return regressions
+
+
+def config_mismatches(config: Dict[str, int], baseline_config: Optional[Dict[str, int]]) -> List[str]:
+    """Describes every run setting that differs from the baseline's; results are only comparable when empty."""
+    if not baseline_config:
+        return ["baseline has no recorded configuration"]
+    return [f"{key}={config.get(key)} vs baseline {baseline_config.get(key)}"
+            for key in sorted(set(config) | set(baseline_config)) if config.get(key) != baseline_config.get(key)]
+
+
+def format_results(results: Dict[str, Dict[str, float]]) -> str:
+    lines = [f"{'benchmark':<32}{'ops/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'alloc MB':>10}"]
+    for name, r in results.items():
+        lines.append(f"{name:<32}{r['ops_per_sec']:>12.1f}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}"
+                     f"{r['p99_ms']:>10.3f}{r['peak_alloc_mb']:>10.2f}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concepts", type=int, default=1000, help="Synthetic concepts to add (default: 1000)")
+    parser.add_argument("--rules", type=int, default=10000, help="Synthetic WEM Rules to generate (default: 10000)")
+    parser.add_argument("--iterations", type=int, default=500, help="Calls per lookup benchmark (default: 500)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results to the baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression fraction (default: 0.25)")
+    parser.add_argument("--output", help="Also write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    config = {"concepts": args.concepts, "rules": args.rules, "iterations": args.iterations, "seed": args.seed}
+    results = run_suite(args.concepts, args.rules, args.iterations, args.seed)
+    print(" ".join(f"{key}={value}" for key, value in config.items()))
+    print(format_results(results))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"config": config, "results": results}, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({"config": config, "results": results}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        mismatches = config_mismatches(config, baseline.get("config"))
+        if mismatches:
+            print("\nNot comparing against the baseline, which was recorded with a different configuration:")
+            for mismatch in mismatches:
+                print(f"  {mismatch}")
+            return 2
+        regressions = compare_to_baseline(results, baseline["results"], args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
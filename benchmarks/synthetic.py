@@ -0,0 +1,123 @@
+"""
+Synthetic ontology and WEM Rules corpus generators for benchmarking.
+
+The generated ontology starts from the real YAML files in `ontology/` and adds
+synthetic quantity types, market services and tables, so every code path sees
+realistic structure at arbitrary scale.
+"""
+import json
+import os
+import random
+from typing import List
+
+import yaml
+
+ONTOLOGY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ontology')
+ONTOLOGY_FILES = ["upper.yaml", "lower.yaml", "catalog.yaml", "rules.yaml"]
+
+UNITS = ["MW", "MWh", "AUD/MWh", "hours", "Intervals"]
+CATEGORIES = ["Financial", "Capacity", "Energy", "ESS", "Forecast", "Generation"]
+WORDS = [
+    "facility", "dispatch", "interval", "capacity", "reserve", "price", "market", "service",
+    "settlement", "obligation", "network", "access", "storage", "generation", "load", "frequency",
+    "regulation", "contingency", "participant", "forecast", "credit", "certified", "outage", "trading",
+]
+
+
+def _load(filename: str) -> dict:
+    with open(os.path.join(ONTOLOGY_DIR, filename), 'r') as f:
+        return yaml.safe_load(f)
+
+
+def _dump(data: dict, path: str):
+    with open(path, 'w') as f:
+        yaml.safe_dump(data, f, sort_keys=False)
+
+
+def synthetic_concept_names(n_concepts: int) -> List[str]:
+    """Names of the synthetic quantity types generated for `n_concepts`."""
+    return [f"SyntheticQuantity{i}" for i in range(_split(n_concepts)[0])]
+
+
+def _split(n_concepts: int):
+    """Splits a concept budget into (quantity types, market services, tables)."""
+    n_services = n_concepts // 10
+    n_tables = n_concepts // 10
+    return n_concepts - n_services - n_tables, n_services, n_tables
+
+
+def generate_ontology_dir(path: str, n_concepts: int, seed: int = 0) -> str:
+    """
+    Writes an ontology directory with `n_concepts` synthetic concepts added to the real ontology.
+    Returns `path`.
+    """
+    rng = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+    upper, lower, catalog, rules = (_load(f) for f in ONTOLOGY_FILES)
+    n_quantities, n_services, n_tables = _split(n_concepts)
+
+    quantity_types = lower.setdefault('quantity_types', {})
+    for i in range(n_quantities):
+        quantity_types[f"SyntheticQuantity{i}"] = {
+            'name': f"Synthetic Quantity {i}",
+            'unit': rng.choice(UNITS),
+            'description': " ".join(rng.choices(WORDS, k=12)),
+            'category': rng.choice(CATEGORIES),
+            'aliases': [f"SQ{i}", f"Synthetic Quantity Alias {i}"],
+        }
+
+    market_services = lower['market_services']
+    service_names = [f"SyntheticService{i}" for i in range(n_services)]
+    for i, name in enumerate(service_names):
+        market_services[name] = {
+            'dispatch_interval': 'DispatchInterval',
+            'pricing_interval': 'DispatchInterval',
+            'category': 'FCESS',
+            'wem_rule_reference': f"Clause {rng.randint(1, 10)}.{rng.randint(1, 40)}.{rng.randint(1, 20)}",
+            'compatible_with': rng.sample(service_names, min(4, len(service_names))),
+            'aggregation_rules': {'within_category': 'allowed', 'with_energy': 'forbidden'},
+        }
+
+    tables = catalog['tables']
+    for i in range(n_tables):
+        tables[f"synthetic_table_{i}"] = {
+            'concept': f"SyntheticQuantity{i % max(n_quantities, 1)}",
+            'columns': {'timestamp': 'timestamp', 'facility': 'facility', 'value': 'value'},
+            'constraints': [{'unique': ['timestamp', 'facility']}],
+        }
+
+    for filename, data in zip(ONTOLOGY_FILES, (upper, lower, catalog, rules)):
+        _dump(data, os.path.join(path, filename))
+    return path
+
+
+def generate_rules_file(path: str, n_rules: int, n_concepts: int = 0, seed: int = 0) -> str:
+    """
+    Writes a WEM Rules JSON corpus with `n_rules` rules. About a third of clauses have
+    several dated versions. Rule text mentions synthetic concept names so concept linking
+    has work to do. Returns `path`.
+    """
+    rng = random.Random(seed)
+    concept_names = synthetic_concept_names(n_concepts) or ["Facility"]
+    rules = []
+    clause = 0
+    while len(rules) < n_rules:
+        clause += 1
+        section = f"{clause % 12 + 1}.{clause // 12 % 60 + 1}.{clause // 720 + 1}"
+        n_versions = rng.choice([1, 1, 2, 3])
+        for version in range(min(n_versions, n_rules - len(rules))):
+            mentioned = rng.choice(concept_names)
+            rules.append({
+                "id": f"{section}@v{version}",
+                "title": " ".join(rng.choices(WORDS, k=4)).title(),
+                "content": f"{' '.join(rng.choices(WORDS, k=40))} {mentioned} {' '.join(rng.choices(WORDS, k=20))}.",
+                "section": section,
+                "conditions": [],
+                "actions": [],
+                "entities": [mentioned],
+                "effective_date": f"{2015 + version * 3}-{rng.randint(1, 12):02d}-01",
+                "types": ["obligation"],
+            })
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(rules, f)
+    return path
@@ -0,0 +1,123 @@
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+from .models import Ontology
+
+# Sections whose concepts carry a `wem_rule_reference`.
+REFERENCED_SECTIONS = [
+    'markets',
+    'market_services',
+    'facility_classes',
+    'capability_classes',
+    'technology_types',
+]
+
+# Matches clause numbers such as "3.9.2", "2.29.1A(b)", "4.11.4(a)" or "7".
+# A parenthetical preceded by a space (e.g. "Chapter 11 (Glossary)") is a note, not a sub-clause.
+_CLAUSE_PATTERN = re.compile(r'(\d+[A-Za-z]*(?:\.\d+[A-Za-z]*)*)((?:\([0-9A-Za-z]+\))*)')
+
+ClauseKey = Tuple[str, ...]
+
+
+def _parse_labelled(text: Optional[str]) -> List[Tuple[ClauseKey, str]]:
+    if not text:
+        return []
+    parsed = []
+    for number, subparagraphs in _CLAUSE_PATTERN.findall(text):
+        parts = number.split('.')
+        parts.extend(re.findall(r'\(([0-9A-Za-z]+)\)', subparagraphs))
+        parsed.append((tuple(parts), number + subparagraphs))
+    return parsed
+
+
+def parse_clause_references(text: Optional[str]) -> List[ClauseKey]:
+    """
+    Parses every clause number in a reference string into a normalized key.
+    e.g. "Clause 2.29.1A(b)" -> [("2", "29", "1A", "b")], "Chapter 7" -> [("7",)]
+    """
+    return [key for key, _ in _parse_labelled(text)]
+
+
+def parse_clause_reference(text: Optional[str]) -> Optional[ClauseKey]:
+    """Returns the most specific clause key in a reference string, if any."""
+    keys = parse_clause_references(text)
+    if not keys:
+        return None
+    return max(keys, key=len)
+
+
+def _prefix_range(sorted_keys: List[ClauseKey], prefix: ClauseKey) -> List[ClauseKey]:
+    """Returns all keys in a sorted list that start with `prefix`."""
+    found = []
+    pos = bisect_left(sorted_keys, prefix)
+    while pos < len(sorted_keys) and sorted_keys[pos][:len(prefix)] == prefix:
+        found.append(sorted_keys[pos])
+        pos += 1
+    return found
+
+
+class ClauseIndex:
+    """
+    Bidirectional index between concepts' `wem_rule_reference` clauses and WEM Rule sections.
+
+    Clause keys are kept sorted so every sub-clause of a prefix (e.g. "3.9" -> "3.9.2", "3.9.7")
+    is a contiguous range found by binary search.
+    """
+
+    def __init__(self, ontology: Ontology):
+        self._concepts_by_clause: Dict[ClauseKey, List[Tuple[str, str]]] = {}
+        self._clauses_by_concept: Dict[str, List[ClauseKey]] = {}
+        self._rules_by_clause: Dict[ClauseKey, List[str]] = {}
+        self._labels: Dict[ClauseKey, str] = {}
+
+        for section in REFERENCED_SECTIONS:
+            for name, item in getattr(ontology, section).items():
+                for key, label in _parse_labelled(getattr(item, 'wem_rule_reference', None)):
+                    self._labels.setdefault(key, label)
+                    self._concepts_by_clause.setdefault(key, []).append((section, name))
+                    self._clauses_by_concept.setdefault(name, []).append(key)
+
+        for rule_id, rule in ontology.wem_rules.items():
+            key = parse_clause_reference(rule.section)
+            if key:
+                self._rules_by_clause.setdefault(key, []).append(rule_id)
+
+        self._concept_keys = sorted(self._concepts_by_clause)
+        self._rule_keys = sorted(self._rules_by_clause)
+
+    def concepts_for_clause(self, clause: str) -> List[Tuple[str, str]]:
+        """Returns (section, concept name) pairs referencing `clause` or any of its sub-clauses."""
+        prefix = parse_clause_reference(clause)
+        if not prefix:
+            return []
+        concepts = []
+        for key in _prefix_range(self._concept_keys, prefix):
+            concepts.extend(self._concepts_by_clause[key])
+        return concepts
+
+    def rules_for_clause(self, clause: str) -> List[str]:
+        """Returns ids of rules whose section is `clause` or one of its sub-clauses."""
+        prefix = parse_clause_reference(clause)
+        if not prefix:
+            return []
+        return self._rules_under(prefix)
+
+    def clauses_for_concept(self, concept_name: str) -> List[str]:
+        return [self._labels[k] for k in self._clauses_by_concept.get(concept_name, [])]
+
+    def rules_for_concept(self, concept_name: str) -> List[str]:
+        """Returns ids of rules in the clause subtree(s) referenced by a concept."""
+        seen: Set[str] = set()
+        rule_ids = []
+        for prefix in self._clauses_by_concept.get(concept_name, []):
+            for rule_id in self._rules_under(prefix):
+                if rule_id not in seen:
+                    seen.add(rule_id)
+                    rule_ids.append(rule_id)
+        return rule_ids
+
+    def _rules_under(self, prefix: ClauseKey) -> List[str]:
+        rule_ids = []
+        for key in _prefix_range(self._rule_keys, prefix):
+            rule_ids.extend(self._rules_by_clause[key])
+        return rule_ids
@@ -0,0 +1,251 @@
+"""
+Columnar export of the ontology for analytical engines.
+
+Each ontology section becomes a table of NumPy column arrays. Categorical values (units,
+categories, intervals, ...) are dictionary-encoded as int32 ids into shared dictionaries. Ids are
+assigned in sorted value order, so they do not depend on YAML ordering, and when an earlier
+export's dictionaries are given, their ids are kept: new values get new ids after the existing
+ones and values no longer used keep their rows, so an id never changes meaning between exports.
+Missing ids are -1.
+
+Tables can be written as memory-mappable `.npy` record arrays or, when pyarrow is installed,
+as Parquet files. Exporting into a directory that holds an earlier export reuses its dictionaries.
+"""
+import argparse
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .models import Ontology
+from .temporal_index import parse_effective_date
+
+Columns = Dict[str, np.ndarray]
+
+MISSING_ID = -1
+
+DictionaryIds = Dict[str, Dict[str, int]]
+
+
+class _Dictionary:
+    def __init__(self, values, previous: Optional[Dict[str, int]] = None):
+        self._ids = dict(previous or {})
+        next_id = max(self._ids.values(), default=-1) + 1
+        for value in sorted({v for v in values if v is not None} - set(self._ids)):
+            self._ids[value] = next_id
+            next_id += 1
+
+    def items(self) -> list:
+        """(id, value) pairs in id order."""
+        return sorted((i, v) for v, i in self._ids.items())
+
+    def encode(self, values) -> np.ndarray:
+        return np.array([self._ids.get(v, MISSING_ID) if v is not None else MISSING_ID for v in values],
+                        dtype=np.int32)
+
+
+def _strings(values) -> np.ndarray:
+    values = ["" if v is None else str(v) for v in values]
+    width = max([len(v) for v in values] + [1])
+    return np.array(values, dtype=f"U{width}")
+
+
+def _floats(values) -> np.ndarray:
+    return np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+
+
+def _dates(values) -> np.ndarray:
+    parsed = [parse_effective_date(v) for v in values]
+    return np.array([np.datetime64(d, 'D') if d else np.datetime64('NaT') for d in parsed], dtype='datetime64[D]')
+
+
+def _flatten_quantity_types(quantity_types, parent: Optional[str] = None, rows: Optional[list] = None) -> list:
+    if rows is None:
+        rows = []
+    for name, qt in quantity_types.items():
+        rows.append((name, parent, qt))
+        if qt.variants:
+            _flatten_quantity_types(qt.variants, name, rows)
+    return rows
+
+
+def build_tables(ontology: Ontology, previous: Optional[DictionaryIds] = None) -> Dict[str, Columns]:
+    """
+    Builds column arrays for every exported section, plus a `dictionaries` table.
+    `previous` holds the dictionaries of an earlier export (see dictionary_ids); their ids are kept.
+    """
+    previous = previous or {}
+    services = sorted(ontology.market_services.items())
+    facility_types = sorted(ontology.facility_types.items())
+    quantity_rows = sorted(_flatten_quantity_types(ontology.quantity_types), key=lambda r: r[0])
+    tables = sorted(ontology.tables.items())
+    rules = sorted(ontology.wem_rules.items())
+
+    flows = [(ft_name, flow) for ft_name, ft in facility_types for flow in ft.flows]
+    columns = [(table_name, logical, physical)
+               for table_name, mapping in tables for logical, physical in mapping.columns.items()]
+
+    dictionary_values = {
+        'category': [s.category for _, s in services] + [qt.category for _, _, qt in quantity_rows],
+        'interval': list(ontology.interval_types)
+            + [v for _, s in services for v in (s.dispatch_interval, s.pricing_interval, s.settlement_interval)],
+        'unit': [qt.unit for _, _, qt in quantity_rows],
+        'flow': [flow for _, flow in flows],
+        'facility_class': list(ontology.facility_classes) + [ft.default_class for _, ft in facility_types],
+        'technology_type': list(ontology.technology_types) + [ft.default_technology for _, ft in facility_types],
+        'concept': [m.concept for _, m in tables],
+        'rule_section': [r.section for _, r in rules],
+    }
+    dictionaries = {name: _Dictionary(values, previous.get(name)) for name, values in dictionary_values.items()}
+    ids = {
+        'market_service': {name: i for i, (name, _) in enumerate(services)},
+        'facility_type': {name: i for i, (name, _) in enumerate(facility_types)},
+        'quantity_type': {name: i for i, (name, _, _) in enumerate(quantity_rows)},
+        'table': {name: i for i, (name, _) in enumerate(tables)},
+    }
+
+    result: Dict[str, Columns] = {}
+    result['market_services'] = {
+        'market_service_id': np.arange(len(services), dtype=np.int32),
+        'name': _strings([n for n, _ in services]),
+        'category_id': dictionaries['category'].encode([s.category for _, s in services]),
+        'dispatch_interval_id': dictionaries['interval'].encode([s.dispatch_interval for _, s in services]),
+        'pricing_interval_id': dictionaries['interval'].encode([s.pricing_interval for _, s in services]),
+        'settlement_interval_id': dictionaries['interval'].encode([s.settlement_interval for _, s in services]),
+        'wem_rule_reference': _strings([s.wem_rule_reference for _, s in services]),
+    }
+    result['facility_types'] = {
+        'facility_type_id': np.arange(len(facility_types), dtype=np.int32),
+        'name': _strings([n for n, _ in facility_types]),
+        'default_class_id': dictionaries['facility_class'].encode([ft.default_class for _, ft in facility_types]),
+        'default_technology_id': dictionaries['technology_type'].encode(
+            [ft.default_technology for _, ft in facility_types]),
+        'separate_flows_default': np.array([ft.separate_flows_default for _, ft in facility_types], dtype=bool),
+    }
+    result['facility_type_flows'] = {
+        'facility_type_id': np.array([ids['facility_type'][n] for n, _ in flows], dtype=np.int32),
+        'flow_id': dictionaries['flow'].encode([flow for _, flow in flows]),
+    }
+    result['quantity_types'] = {
+        'quantity_type_id': np.arange(len(quantity_rows), dtype=np.int32),
+        'name': _strings([n for n, _, _ in quantity_rows]),
+        'display_name': _strings([qt.name for _, _, qt in quantity_rows]),
+        'parent_id': np.array([ids['quantity_type'].get(p, MISSING_ID) for _, p, _ in quantity_rows],
+                              dtype=np.int32),
+        'unit_id': dictionaries['unit'].encode([qt.unit for _, _, qt in quantity_rows]),
+        'category_id': dictionaries['category'].encode([qt.category for _, _, qt in quantity_rows]),
+        'valid_min': _floats([qt.valid_range[0] if qt.valid_range else None for _, _, qt in quantity_rows]),
+        'valid_max': _floats([qt.valid_range[1] if qt.valid_range else None for _, _, qt in quantity_rows]),
+        'abstract': np.array([bool(qt.abstract) for _, _, qt in quantity_rows], dtype=bool),
+    }
+    result['table_columns'] = {
+        'table_id': np.array([ids['table'][t] for t, _, _ in columns], dtype=np.int32),
+        'table_name': _strings([t for t, _, _ in columns]),
+        'concept_id': dictionaries['concept'].encode([ontology.tables[t].concept for t, _, _ in columns]),
+        'column': _strings([logical for _, logical, _ in columns]),
+        'physical_column': _strings([physical for _, _, physical in columns]),
+    }
+    result['wem_rules'] = {
+        'rule_id': _strings([rule_id for rule_id, _ in rules]),
+        'section_id': dictionaries['rule_section'].encode([r.section for _, r in rules]),
+        'title': _strings([r.title for _, r in rules]),
+        'effective_date': _dates([r.effective_date for _, r in rules]),
+        'entity_count': np.array([len(r.entities) for _, r in rules], dtype=np.int32),
+    }
+
+    dictionary_rows = [(name, i, v) for name, d in sorted(dictionaries.items()) for i, v in d.items()]
+    result['dictionaries'] = {
+        'dictionary': _strings([name for name, _, _ in dictionary_rows]),
+        'id': np.array([i for _, i, _ in dictionary_rows], dtype=np.int32),
+        'value': _strings([v for _, _, v in dictionary_rows]),
+    }
+    return result
+
+
+def dictionary_ids(tables: Dict[str, Columns]) -> DictionaryIds:
+    """The value -> id mapping of every dictionary in an exported `dictionaries` table."""
+    d = tables['dictionaries']
+    ids: DictionaryIds = {}
+    for name, i, value in zip(d['dictionary'], d['id'], d['value']):
+        ids.setdefault(str(name), {})[str(value)] = int(i)
+    return ids
+
+
+def load_dictionaries(output_dir: str) -> Optional[DictionaryIds]:
+    """Reads the dictionaries of an earlier export in `output_dir`, if there is one."""
+    npy_path = os.path.join(output_dir, "dictionaries.npy")
+    parquet_path = os.path.join(output_dir, "dictionaries.parquet")
+    if os.path.exists(npy_path):
+        records = np.load(npy_path)
+        return dictionary_ids({'dictionaries': {name: records[name] for name in records.dtype.names}})
+    if os.path.exists(parquet_path):
+        import pyarrow.parquet as pq
+        table = pq.read_table(parquet_path)
+        return dictionary_ids({'dictionaries': {name: table.column(name).to_numpy() for name in table.column_names}})
+    return None
+
+
+def to_record_array(columns: Columns) -> np.ndarray:
+    """Packs a table's columns into a single NumPy structured (record) array."""
+    names = list(columns)
+    length = len(next(iter(columns.values()))) if columns else 0
+    records = np.empty(length, dtype=[(name, columns[name].dtype) for name in names])
+    for name in names:
+        records[name] = columns[name]
+    return records
+
+
+def write_numpy(tables: Dict[str, Columns], output_dir: str) -> List[str]:
+    """Writes one `.npy` record array per table. Load with `np.load(path, mmap_mode='r')`."""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for name, columns in tables.items():
+        path = os.path.join(output_dir, f"{name}.npy")
+        np.save(path, to_record_array(columns))
+        paths.append(path)
+    return paths
+
+
+def write_parquet(tables: Dict[str, Columns], output_dir: str) -> List[str]:
+    """Writes one Parquet file per table. Requires pyarrow."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow); use the numpy format instead.")
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for name, columns in tables.items():
+        path = os.path.join(output_dir, f"{name}.parquet")
+        pq.write_table(pa.table({column: pa.array(values) for column, values in columns.items()}), path)
+        paths.append(path)
+    return paths
+
+
+def export_ontology(ontology: Ontology, output_dir: str, format: str = "numpy") -> List[str]:
+    """
+    Exports the ontology to `output_dir` as "numpy" record arrays or "parquet" files, keeping the
+    dictionary ids of an earlier export found there.
+    """
+    tables = build_tables(ontology, load_dictionaries(output_dir))
+    if format == "parquet":
+        return write_parquet(tables, output_dir)
+    if format == "numpy":
+        return write_numpy(tables, output_dir)
+    raise ValueError(f"Unknown export format '{format}'. Expected 'numpy' or 'parquet'.")
+
+
+if __name__ == "__main__":
+    from .loader import OntologyLoader
+
+    parser = argparse.ArgumentParser(description="Export the ontology as columnar files.")
+    parser.add_argument("output_dir")
+    parser.add_argument("--format", choices=["numpy", "parquet"], default="numpy")
+    parser.add_argument("--ontology-dir", default=os.path.join(os.path.dirname(os.path.dirname(__file__)), 'ontology'))
+    parser.add_argument("--rules-path", default=None)
+    args = parser.parse_args()
+
+    ontology = OntologyLoader(args.ontology_dir, args.rules_path).get_ontology()
+    for path in export_ontology(ontology, args.output_dir, args.format):
+        print(path)
@@ -0,0 +1,169 @@
+"""
+Compact, read-only representation of a loaded ontology.
+
+Pydantic models are used at the load boundary only. `compact_ontology` converts every section into
+frozen records with `__slots__` (no per-instance dict), interned strings and tuples in place of
+lists. Records keep the attribute names of their models and the `dict()` / `copy(update=...)`
+methods the tools use, so they can replace the models wherever the ontology is read.
+
+The result is a CompactOntology, not an `Ontology`: it has the same sections, but holds records
+rather than models, so it is its own read-only type. `model_dump()` gives the plain data back.
+"""
+import sys
+from typing import Any, Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from .models import Ontology
+
+
+class CompactRecord:
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _model: Type[BaseModel] = BaseModel
+
+    def __init__(self, **values):
+        for field in self._fields:
+            object.__setattr__(self, field, values.get(field))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def dict(self) -> dict:
+        """The record as plain dicts and lists, like the pydantic model's dict()."""
+        return {field: _thaw(getattr(self, field)) for field in self._fields}
+
+    def copy(self, update: dict = None) -> 'CompactRecord':
+        values = {field: getattr(self, field) for field in self._fields}
+        values.update(update or {})
+        return type(self)(**values)
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self._fields)
+
+    __hash__ = None
+
+    def __repr__(self):
+        values = ", ".join(f"{f}={getattr(self, f)!r}" for f in self._fields)
+        return f"{type(self).__name__}({values})"
+
+
+_RECORD_TYPES: Dict[type, type] = {}
+
+
+def record_type(model: Type[BaseModel]) -> type:
+    """Returns the slotted record class for a pydantic model class, e.g. WEMRule -> CompactWEMRule."""
+    if model not in _RECORD_TYPES:
+        fields = tuple(model.model_fields)
+        _RECORD_TYPES[model] = type(f"Compact{model.__name__}", (CompactRecord,),
+                                    {"__slots__": fields, "_fields": fields, "_model": model})
+    return _RECORD_TYPES[model]
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, CompactRecord):
+        return value.dict()
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _thaw(v) for k, v in value.items()}
+    return value
+
+
+def compact(value: Any) -> Any:
+    """Converts models to records, interns strings and turns lists into tuples, recursively."""
+    if isinstance(value, BaseModel):
+        record = record_type(type(value))
+        return record(**{field: compact(getattr(value, field)) for field in record._fields})
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(compact(v) for v in value)
+    if isinstance(value, dict):
+        return {compact(k): compact(v) for k, v in value.items()}
+    return value
+
+
+class CompactOntology:
+    """The sections of an `Ontology` as compact records, read-only."""
+
+    __slots__ = tuple(Ontology.model_fields)
+    _fields: Tuple[str, ...] = tuple(Ontology.model_fields)
+
+    def __init__(self, **sections):
+        unknown = set(sections) - set(self._fields)
+        if unknown:
+            raise ValueError(f"Unknown ontology sections: {', '.join(sorted(unknown))}")
+        for field in self._fields:
+            object.__setattr__(self, field, sections.get(field))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompactOntology is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("CompactOntology is read-only")
+
+    def model_copy(self, update: Optional[dict] = None) -> 'CompactOntology':
+        """A new ontology with the sections in `update` replaced (and compacted)."""
+        values = {field: getattr(self, field) for field in self._fields}
+        values.update({field: compact(value) for field, value in (update or {}).items()})
+        return CompactOntology(**values)
+
+    def model_dump(self) -> dict:
+        """The ontology as plain dicts and lists, like `Ontology.model_dump()`."""
+        return {field: _thaw(getattr(self, field)) for field in self._fields}
+
+    def to_model(self) -> Ontology:
+        """Validates the data back into a pydantic `Ontology`."""
+        return Ontology.model_validate(self.model_dump())
+
+    def __repr__(self):
+        sizes = ", ".join(f"{f}={len(getattr(self, f))}" for f in self._fields
+                          if isinstance(getattr(self, f), (dict, tuple)))
+        return f"CompactOntology({sizes})"
+
+
+def compact_ontology(ontology: Ontology) -> CompactOntology:
+    """Returns the ontology with every section converted to compact records."""
+    return CompactOntology(**{field: compact(getattr(ontology, field)) for field in Ontology.model_fields})
+
+
+def deep_sizeof(value: Any, seen: set) -> int:
+    """Bytes used by a value and everything it references, counting shared objects once."""
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, CompactRecord):
+        size += sum(deep_sizeof(getattr(value, f), seen) for f in value._fields)
+    elif isinstance(value, BaseModel):
+        size += deep_sizeof(value.__dict__, seen)
+        size += deep_sizeof(getattr(value, '__pydantic_fields_set__', None), seen)
+    elif isinstance(value, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(v, seen) for v in value)
+    return size
+
+
+def memory_report(ontology) -> Dict[str, dict]:
+    """
+    Approximate memory per ontology section. Objects shared between sections (such as interned
+    strings) are counted in the first section that references them.
+    """
+    seen: set = set()
+    report = {}
+    for field in Ontology.model_fields:
+        value = getattr(ontology, field)
+        items = len(value) if isinstance(value, (dict, list, tuple)) else int(value is not None)
+        report[field] = {"items": items, "bytes": deep_sizeof(value, seen)}
+    report["total"] = {
+        "items": sum(r["items"] for r in report.values()),
+        "bytes": sum(r["bytes"] for r in report.values()),
+    }
+    return report
@@ -0,0 +1,98 @@
+"""
+Precomputed aggregation compatibility between market services.
+
+Two services may be aggregated when each either lists the other in `compatible_with` or declares
+no `compatible_with` list at all (an explicit list on either side restricts the pair), or when they
+share a category and either declares `within_category: allowed`. `with_energy: forbidden` then overrides this for pairs with an Energy
+category service. The result is a symmetric bit-matrix, one int per service, so checking a set of
+services is a handful of AND/NOT operations on its bit mask.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import Ontology
+from .ontology_graph import OntologyGraph
+
+ENERGY_CATEGORY = 'Energy'
+
+
+class CompatibilityMatrix:
+    def __init__(self, ontology: Ontology, graph: Optional[OntologyGraph] = None):
+        graph = graph or OntologyGraph(ontology)
+        self.services: List[str] = list(ontology.market_services)
+        self._bits: Dict[str, int] = {name: 1 << i for i, name in enumerate(self.services)}
+        services = ontology.market_services
+        n = len(self.services)
+
+        everything = (1 << n) - 1
+        by_category: Dict[Optional[str], int] = {}
+        for name, service in services.items():
+            by_category[service.category] = by_category.get(service.category, 0) | self._bits[name]
+        energy = by_category.get(ENERGY_CATEGORY, 0)
+
+        listed = [0] * n
+        allowed = [0] * n
+        forbidden = [0] * n
+        for i, name in enumerate(self.services):
+            service = services[name]
+            rules = service.aggregation_rules or {}
+            if service.compatible_with is None:
+                listed[i] = everything
+            else:
+                nodes = graph.node('market_services', name).linked('compatible_with')
+                listed[i] = self.mask(node.name for node in nodes)
+            if rules.get('within_category') == 'allowed':
+                allowed[i] |= by_category[service.category]
+            elif rules.get('within_category') == 'forbidden':
+                forbidden[i] |= by_category[service.category] & ~self._bits[name]
+            if rules.get('with_energy') == 'forbidden':
+                forbidden[i] |= energy
+
+        # Symmetrise: compatible_with lists must agree on both sides, while a category rule on either
+        # side allows the pair and a forbidding rule on either side forbids it
+        self.rows: List[int] = []
+        for i in range(n):
+            row_listed, row_allowed, row_forbidden = listed[i], allowed[i], forbidden[i]
+            for j in range(n):
+                if not listed[j] >> i & 1:
+                    row_listed &= ~(1 << j)
+                if allowed[j] >> i & 1:
+                    row_allowed |= 1 << j
+                if forbidden[j] >> i & 1:
+                    row_forbidden |= 1 << j
+            self.rows.append(((row_listed | row_allowed) & ~row_forbidden) | 1 << i)
+
+    def mask(self, services: Iterable[str]) -> int:
+        """Bit mask of the known services in `services`; unknown names are ignored."""
+        bits = 0
+        for name in services:
+            bits |= self._bits.get(name, 0)
+        return bits
+
+    def compatible(self, a: str, b: str) -> bool:
+        if a not in self._bits or b not in self._bits:
+            return False
+        return bool(self.rows[self._bits[a].bit_length() - 1] & self._bits[b])
+
+    def conflicts(self, services: Iterable[str]) -> List[Tuple[str, str]]:
+        """Every incompatible pair among `services`, in matrix order."""
+        selected = self.mask(services)
+        pairs = []
+        remaining = selected
+        while remaining:
+            low = remaining & -remaining
+            i = low.bit_length() - 1
+            remaining ^= low
+            # Only pairs (i, j) with j > i, so each conflict is reported once
+            clash = selected & ~self.rows[i] & ~((low << 1) - 1)
+            while clash:
+                bit = clash & -clash
+                clash ^= bit
+                pairs.append((self.services[i], self.services[bit.bit_length() - 1]))
+        return pairs
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Compatible services for each service (excluding itself)."""
+        return {
+            name: [other for j, other in enumerate(self.services) if j != i and self.rows[i] >> j & 1]
+            for i, name in enumerate(self.services)
+        }
@@ -0,0 +1,244 @@
+"""
+Dependency DAG of derived quantities and a vectorized evaluator over it.
+
+Edges come from quantity type formulas (e.g. DurationRating = EnergyCapacity / NameplateCapacity),
+`requires` and `required_for` between quantity types, and PriceType.derived_from. The graph is
+topologically ordered and checked for cycles when it is built. Only formula edges are needed to
+compute a value; the other edges order and document the graph.
+
+Evaluation takes whole-fleet input arrays, works out the subgraph the requested quantities need,
+and computes each formula once over the arrays in topological order, so intermediates shared by
+several targets are computed once.
+
+Quantity nodes are keyed by their path in the quantity type tree, so variants with the same name
+under different parents stay distinct. Names in formulas, targets and inputs are resolved through
+the quantity type index like any other quantity name. A formula that is not plain arithmetic
+makes its quantity non-derivable (reported with the error) rather than failing the build.
+"""
+import ast
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from .models import Ontology
+from .quantity_index import QuantityTypeIndex
+from .units import MEASURED_SYMBOLS
+
+DEPENDENCY_FIELDS = ('formula', 'requires', 'required_for', 'derived_from')
+
+
+class DerivationError(ValueError):
+    pass
+
+
+class CycleError(DerivationError):
+    def __init__(self, cycle: List[str]):
+        super().__init__(f"Dependency cycle: {' -> '.join(cycle)}")
+        self.cycle = cycle
+
+
+def formula_symbols(formula: str) -> List[str]:
+    """Names used by an arithmetic formula, in order of first use. Raises DerivationError otherwise."""
+    try:
+        tree = ast.parse(formula, mode='eval')
+    except SyntaxError:
+        raise DerivationError(f"Cannot parse formula '{formula}'")
+    symbols = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if node.id not in symbols:
+                symbols.append(node.id)
+        elif not isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Load, ast.operator,
+                                   ast.unaryop)) and not (isinstance(node, ast.Constant)
+                                                          and isinstance(node.value, (int, float))):
+            raise DerivationError(f"Unsupported expression in formula '{formula}'")
+    return symbols
+
+
+class Derivation:
+    """
+    A node of the DAG: a quantity type, price type or measured input. A formula that cannot be
+    evaluated leaves the node non-derivable, with the reason in `error`.
+    """
+
+    __slots__ = ('name', 'kind', 'formula', 'unit', 'symbols', 'inputs', 'depends_on', 'data_requirements',
+                 'error', '_code')
+
+    def __init__(self, name: str, kind: str, formula: Optional[str] = None, unit: Optional[str] = None):
+        self.name = name
+        self.kind = kind
+        self.formula = formula
+        self.unit = unit
+        self.error: Optional[str] = None
+        self._code = None
+        symbols: List[str] = []
+        if formula:
+            try:
+                symbols = formula_symbols(formula)
+                self._code = compile(ast.parse(formula, mode='eval'), f'<{name}>', 'eval')
+            except DerivationError as e:
+                self.error = str(e)
+                symbols = []
+        self.symbols: Dict[str, str] = {symbol: symbol for symbol in symbols}  # formula name -> node
+        self.inputs: List[str] = list(symbols)
+        self.depends_on: Dict[str, str] = {symbol: 'formula' for symbol in symbols}  # node -> edge kind
+        self.data_requirements: List[str] = []
+
+    def bind(self, resolve):
+        """Points the formula's names at the nodes `resolve` maps them to."""
+        self.symbols = {symbol: resolve(symbol) for symbol in self.symbols}
+        self.inputs = list(dict.fromkeys(self.symbols.values()))
+        self.depends_on = {name: 'formula' for name in self.inputs}
+
+    @property
+    def derived(self) -> bool:
+        return self._code is not None
+
+    def to_dict(self) -> dict:
+        result = {"name": self.name, "kind": self.kind, "formula": self.formula, "unit": self.unit,
+                  "derived": self.derived, "depends_on": dict(self.depends_on),
+                  "data_requirements": list(self.data_requirements)}
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+class DerivedQuantityGraph:
+    def __init__(self, ontology: Ontology, quantity_index: Optional[QuantityTypeIndex] = None):
+        self.quantity_index = quantity_index or QuantityTypeIndex(ontology)
+        self.nodes: Dict[str, Derivation] = {}
+        for entry in self.quantity_index.entries.values():
+            qt = entry.quantity_type
+            if qt.abstract and not qt.formula:
+                continue
+            self.nodes[entry.path] = Derivation(entry.path, 'quantity', qt.formula, entry.unit)
+        for name, price in ontology.price_types.items():
+            self.nodes.setdefault(name, Derivation(name, 'price'))
+        for name, unit in MEASURED_SYMBOLS.items():
+            self.nodes.setdefault(name, Derivation(name, 'measured', unit=unit))
+        # Formula names that are neither quantities nor known measurements are inputs too
+        for node in list(self.nodes.values()):
+            node.bind(self.resolve)
+            for name in node.inputs:
+                self.nodes.setdefault(name, Derivation(name, 'measured'))
+
+        def depend(node: Derivation, on: str, kind: str):
+            on = self.resolve(on)
+            if on == node.name:
+                return
+            if on in self.nodes:
+                node.depends_on.setdefault(on, kind)
+            elif on not in node.data_requirements:
+                node.data_requirements.append(on)
+
+        for entry in self.quantity_index.entries.values():
+            node = self.nodes.get(entry.path)
+            if node is None:
+                continue
+            for required in entry.quantity_type.requires or []:
+                depend(node, required, 'requires')
+            for dependent in entry.quantity_type.required_for or []:
+                dependent = self.resolve(dependent)
+                if dependent in self.nodes:
+                    depend(self.nodes[dependent], entry.path, 'required_for')
+        for name, price in ontology.price_types.items():
+            for source in price.derived_from or []:
+                depend(self.nodes[name], source, 'derived_from')
+
+        self.order: List[str] = self._topological_order()
+        self._position = {name: i for i, name in enumerate(self.order)}
+
+    def _topological_order(self) -> List[str]:
+        """Depth-first topological sort; raises CycleError naming the cycle."""
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = on the current path, 2 = done
+        for root in self.nodes:
+            if root in state:
+                continue
+            path = [root]
+            stack = [iter(self.nodes[root].depends_on)]
+            state[root] = 1
+            while stack:
+                dependency = next(stack[-1], None)
+                if dependency is None:
+                    stack.pop()
+                    done = path.pop()
+                    state[done] = 2
+                    order.append(done)
+                elif state.get(dependency) == 1:
+                    raise CycleError(path[path.index(dependency):] + [dependency])
+                elif dependency not in state:
+                    state[dependency] = 1
+                    path.append(dependency)
+                    stack.append(iter(self.nodes[dependency].depends_on))
+        return order
+
+    def resolve(self, name: str) -> str:
+        """The node a quantity name, variant path or alias refers to; other names map to themselves."""
+        entry = self.quantity_index.get(name)
+        return entry.path if entry is not None and entry.path in self.nodes else name
+
+    def __contains__(self, name: str) -> bool:
+        return self.resolve(name) in self.nodes
+
+    def dependencies(self, name: str) -> List[str]:
+        """Every node `name` depends on through any edge, in topological order."""
+        name = self.resolve(name)
+        seen = self._closure([name], lambda node: node.depends_on)
+        seen.discard(name)
+        return sorted(seen, key=self._position.__getitem__)
+
+    def _closure(self, names: Iterable[str], edges, stop: Iterable[str] = ()) -> Set[str]:
+        stop = set(stop)
+        seen: Set[str] = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            if name not in self.nodes:
+                raise DerivationError(f"Unknown quantity '{name}'")
+            seen.add(name)
+            if name not in stop:
+                pending.extend(edges(self.nodes[name]))
+        return seen
+
+    def plan(self, targets: Iterable[str], available: Iterable[str] = ()) -> dict:
+        """
+        The formula nodes to compute for `targets`, in order, and the inputs they need. Names in
+        `available` are taken as given and not derived, even if they have a formula.
+        """
+        available = {self.resolve(name) for name in available}
+        needed = self._closure([self.resolve(name) for name in targets], lambda node: node.inputs, stop=available)
+        steps = [n for n in sorted(needed, key=self._position.__getitem__)
+                 if n not in available and self.nodes[n].derived]
+        inputs = sorted(n for n in needed if n in available or not self.nodes[n].derived)
+        return {"steps": steps, "inputs": inputs, "missing": [n for n in inputs if n not in available]}
+
+    def evaluate(self, targets: Iterable[str], inputs: Dict[str, object],
+                 keep_intermediates: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Computes `targets` from input arrays (or scalars, which broadcast) in one pass over the
+        needed subgraph. Division by zero gives inf/nan rather than an error. Results are keyed by
+        the target names as given; intermediates, if kept, by node.
+        """
+        targets = list(targets)
+        given = {self.resolve(name): value for name, value in inputs.items()}
+        plan = self.plan(targets, given)
+        if plan["missing"]:
+            raise DerivationError(f"Missing inputs for {', '.join(targets)}: {', '.join(plan['missing'])}")
+        values: Dict[str, np.ndarray] = {name: np.asarray(given[name], dtype=np.float64) for name in plan["inputs"]}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for name in plan["steps"]:
+                node = self.nodes[name]
+                namespace = {symbol: values[input_name] for symbol, input_name in node.symbols.items()}
+                try:
+                    values[name] = np.asarray(eval(node._code, {"__builtins__": {}}, namespace), dtype=np.float64)
+                except ValueError as e:
+                    raise DerivationError(f"Cannot evaluate {name}: {e}")
+        if keep_intermediates:
+            return values
+        return {name: values[self.resolve(name)] for name in targets}
+
+    def to_dict(self) -> dict:
+        return {"order": list(self.order), "nodes": {name: self.nodes[name].to_dict() for name in self.order}}
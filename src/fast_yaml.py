@@ -0,0 +1,150 @@
+"""
+Fast YAML parsing for the ontology sources.
+
+Uses the libyaml C loader when PyYAML was built with it. On request (workers >= 2), large files are
+split into chunks between top-level sections, or between the entries of a large section, and
+parsed in a process pool, because the C loader
+holds the GIL and threads would not overlap. The pool uses the spawn start method, which re-imports
+the caller's main module in every worker, so it must only be used from code that runs under an
+`if __name__ == "__main__":` guard, never while a module is being imported.
+"""
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import yaml
+
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Files smaller than this are parsed in one piece; process start-up would cost more than it saves.
+PARALLEL_MIN_BYTES = 1 << 20
+
+# A top-level key with nothing after the colon, i.e. one whose value is a nested block
+_TOP_LEVEL_KEY = re.compile(r'^[^\s#\-][^:]*:\s*(#.*)?$')
+_MAPPING_KEY = re.compile(r'^[^\s#\-\[{][^:]*:(\s|$)')
+_NESTED_MAPPING_KEY = re.compile(r'^\s+[^\s#\-\[{"\'|>][^:]*:(\s|$)')
+_ANCHOR_OR_ALIAS = re.compile(r'(^|[\s\[{,])[&*][^\s]')
+
+
+def parse_yaml(text: str, loader=None):
+    return yaml.load(text, Loader=loader or YAML_LOADER)
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip(' '))
+
+
+def split_yaml_mapping(text: str, chunk_bytes: int) -> Optional[List[str]]:
+    """
+    Splits a YAML document whose root is a block mapping into chunks of about `chunk_bytes`.
+    Chunks start at a top-level key whose value is a block mapping (a bare `key:` line followed by
+    an indented `name:` line). A section larger than `chunk_bytes` is also split between its own
+    entries (lines at the section's first indentation); each continuation chunk repeats the
+    section's `key:` line, so it parses to a part of that section and merge_chunks joins the parts.
+    Other top-level entries stay with the chunk before them.
+
+    Returns None when the document cannot be split safely (anchors/aliases, flow or scalar root,
+    a block-mapping section given twice). Callers should still fall back to a whole-document parse
+    if a chunk fails to parse.
+    """
+    if _ANCHOR_OR_ALIAS.search(text) or text.lstrip().startswith(('---', '%', '{', '[')):
+        return None
+    lines = text.splitlines(keepends=True)
+    first = next((line for line in lines if line.strip() and not line.lstrip().startswith('#')), '')
+    if not _MAPPING_KEY.match(first):
+        return None
+
+    def content_after(i: int) -> str:
+        for line in lines[i + 1:]:
+            if line.strip() and not line.lstrip().startswith('#'):
+                return line
+        return ''
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    sections = set()
+    header: Optional[str] = None  # `key:` line of the block-mapping section being read
+    entry_indent = 0
+
+    for i, line in enumerate(lines):
+        if _TOP_LEVEL_KEY.match(line) and _NESTED_MAPPING_KEY.match(content_after(i)):
+            key = line.split(':', 1)[0].strip()
+            if key in sections:
+                return None
+            sections.add(key)
+            if size >= chunk_bytes:
+                chunks.append(''.join(current))
+                current, size = [], 0
+            header, entry_indent = line, _indent(content_after(i))
+        elif line.strip() and not line.startswith((' ', '#')):
+            header = None  # another top-level entry ends the section
+        elif (header is not None and size >= chunk_bytes and current[-1:] != [header]
+              and _indent(line) == entry_indent and _NESTED_MAPPING_KEY.match(line)):
+            chunks.append(''.join(current))
+            current, size = [header], len(header)
+        current.append(line)
+        size += len(line)
+    if current:
+        chunks.append(''.join(current))
+    return chunks
+
+
+def merge_chunks(parsed: List[Optional[dict]]) -> dict:
+    """
+    Merges parsed chunks. A section that appears in several chunks was split between its entries,
+    so its parts are joined in order.
+    """
+    result: Dict[str, object] = {}
+    for chunk in parsed:
+        if chunk is not None and not isinstance(chunk, dict):
+            raise ValueError("chunk did not parse to a mapping")
+        for key, value in (chunk or {}).items():
+            if isinstance(result.get(key), dict) and isinstance(value, dict):
+                result[key].update(value)
+            else:
+                result[key] = value
+    return result
+
+
+def _in_worker_process() -> bool:
+    # _inheriting is set while a spawned child re-imports the main module, before parent_process() is
+    # known; it is the flag multiprocessing itself checks before refusing to start processes there.
+    process = multiprocessing.current_process()
+    return multiprocessing.parent_process() is not None or getattr(process, '_inheriting', False)
+
+
+def load_yaml_files(paths: List[str], workers: int = 1, loader=None) -> List[dict]:
+    """
+    Parses YAML files, with the C loader unless `loader` is given. With `workers` >= 2 and some file
+    over PARALLEL_MIN_BYTES, large files are split into chunks and all chunks are parsed
+    concurrently in a process pool; a file whose chunks do not parse cleanly is parsed whole.
+    Inside a worker process (e.g. a module re-imported by spawn) parsing is always sequential.
+    """
+    texts = []
+    for path in paths:
+        with open(path, 'r') as f:
+            texts.append(f.read())
+
+    large = [len(text) >= PARALLEL_MIN_BYTES for text in texts]
+    if workers < 2 or not any(large) or _in_worker_process():
+        return [parse_yaml(text, loader) for text in texts]
+
+    plans = [
+        (split_yaml_mapping(text, max(len(text) // workers, 1)) if is_large else None) or [text]
+        for text, is_large in zip(texts, large)
+    ]
+    # spawn rather than fork: the loader may have other threads running (e.g. the rules JSON load)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = [[executor.submit(parse_yaml, chunk, loader) for chunk in chunks] for chunks in plans]
+        results = []
+        for text, file_futures in zip(texts, futures):
+            if len(file_futures) == 1:
+                results.append(file_futures[0].result())
+                continue
+            try:
+                results.append(merge_chunks([f.result() for f in file_futures]))
+            except (yaml.YAMLError, ValueError):
+                results.append(parse_yaml(text, loader))
+        return results
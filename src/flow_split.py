@@ -0,0 +1,96 @@
+import re
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .models import FacilityType, Ontology
+
+_WORD = re.compile(r'[A-Za-z_]+')
+_INDICATOR = re.compile(r'^\s*quantity\s*(<|<=|>|>=)\s*0(\.0*)?\s*$')
+
+
+class FlowSplitError(ValueError):
+    pass
+
+
+def stream_names(facility_type: FacilityType) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Returns the (positive, negative) stream names from a facility type's quantity_interpretation,
+    e.g. Storage -> ("discharge", "charge"), Generator -> ("generation", None).
+    The first word that is one of the facility's flows is used, otherwise the first word.
+    """
+    names = []
+    for sign in ('positive', 'negative'):
+        text = (facility_type.quantity_interpretation or {}).get(sign)
+        words = _WORD.findall(text or '')
+        flows = [w for w in words if w in facility_type.flows]
+        names.append(flows[0] if flows else (words[0] if words else None))
+    return names[0], names[1]
+
+
+def charge_is_negative(charge_indicator: str) -> bool:
+    """Parses an operation's charge_indicator (e.g. "quantity < 0") into the sign of charge."""
+    match = _INDICATOR.match(charge_indicator)
+    if not match:
+        raise FlowSplitError(f"Unsupported charge_indicator '{charge_indicator}'. Expected a comparison of quantity with 0.")
+    return match.group(1).startswith('<')
+
+
+class FlowSplitter:
+    """
+    Splits signed dispatch/SCADA quantities into separate flow streams.
+
+    Stream names and sign conventions come from FacilityType.quantity_interpretation (for Storage,
+    positive is discharge and negative is charge). An operation's special_cases.charge_indicator,
+    when present, overrides which side is charge. Each stream is one vectorized pass over the input
+    producing non-negative magnitudes, so a 2-D (intervals x facilities) array splits a whole fleet
+    at once. Pass `out` to reuse preallocated output buffers.
+    """
+
+    def __init__(self, ontology: Ontology):
+        self.ontology = ontology
+
+    def split(self, facility_type: str, quantities, operation: Optional[str] = None,
+              out: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        """
+        Args:
+            facility_type: Facility type name, e.g. "Storage".
+            quantities: Signed quantities, any shape. Float64 input is read without a copy.
+            operation: Operation whose special_cases.charge_indicator should be applied.
+            out: Optional preallocated arrays keyed by stream name.
+
+        Returns:
+            Stream name -> non-negative magnitudes, same shape as `quantities`.
+        """
+        if facility_type not in self.ontology.facility_types:
+            raise FlowSplitError(f"Facility type '{facility_type}' not found.")
+        ft = self.ontology.facility_types[facility_type]
+        positive, negative = stream_names(ft)
+
+        indicator = self._charge_indicator(operation)
+        if indicator is not None and 'charge' in (positive, negative):
+            other = negative if positive == 'charge' else positive
+            positive, negative = (other, 'charge') if charge_is_negative(indicator) else ('charge', other)
+
+        values = np.asarray(quantities, dtype=np.float64)
+        out = out or {}
+        streams = {}
+        if positive:
+            streams[positive] = np.maximum(values, 0.0, out=out.get(positive))
+        if negative:
+            buffer = np.minimum(values, 0.0, out=out.get(negative))
+            streams[negative] = np.negative(buffer, out=buffer)
+        if negative is None and np.any(values < 0):
+            raise FlowSplitError(
+                f"Facility type '{facility_type}' has no interpretation for negative quantities.")
+        return streams
+
+    def _charge_indicator(self, operation: Optional[str]) -> Optional[str]:
+        if operation is None:
+            return None
+        if operation not in self.ontology.operations:
+            raise FlowSplitError(f"Operation '{operation}' not found.")
+        for case in (self.ontology.operations[operation].special_cases or {}).values():
+            if isinstance(case, dict) and 'charge_indicator' in case:
+                return case['charge_indicator']
+        return None
@@ -0,0 +1,121 @@
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from .models import Ontology
+
+_SEPARATORS = re.compile(r'[^a-z0-9]+')
+_ABBREVIATION = re.compile(r'\(([A-Z][A-Za-z0-9]*)\)')
+
+
+def normalize(text: str) -> str:
+    """Lowercases and drops separators, so "Sent Out", "sent_out" and "SentOut" compare equal."""
+    return _SEPARATORS.sub('', text.lower())
+
+
+def trigrams(text: str) -> List[str]:
+    padded = f"  {normalize(text)} "
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+def concept_names(ontology: Ontology, include_tables: bool = True) -> Iterator[Tuple[str, str]]:
+    """
+    Yields (name, concept) for concept keys, display names, aliases, nested quantity variants,
+    market abbreviations and abbreviations given in display names, e.g. "Network Access Quantity (NAQ)".
+    Table names map to themselves unless include_tables is False.
+    """
+    def named(display_name, key):
+        yield display_name, key
+        for abbreviation in _ABBREVIATION.findall(display_name):
+            yield abbreviation, key
+
+    sections = [ontology.market_services, ontology.markets, ontology.facility_types,
+                ontology.facility_classes, ontology.capability_classes, ontology.technology_types]
+    for section in sections:
+        for key, item in section.items():
+            yield key, key
+            if getattr(item, 'name', None):
+                yield from named(item.name, key)
+            for alias in getattr(item, 'aliases', None) or []:
+                yield alias, key
+    for key, market in ontology.markets.items():
+        yield market.abbreviation, key
+
+    def walk(items):
+        for key, qt in items.items():
+            yield key, key
+            yield from named(qt.name, key)
+            for alias in qt.aliases or []:
+                yield alias, key
+            if qt.variants:
+                yield from walk(qt.variants)
+    yield from walk(ontology.quantity_types)
+
+    if include_tables:
+        for table in ontology.tables:
+            yield table, table
+
+
+class TrigramIndex:
+    """
+    Typo-tolerant name lookup.
+
+    Each name is split into padded character trigrams and stored in an inverted index of NumPy
+    posting arrays. A query gathers the postings of its own trigrams and counts shared trigrams per
+    name with one bincount, so only names sharing at least one trigram are scored (Dice
+    coefficient) and nothing is compared pairwise against the whole vocabulary.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str]]):
+        """entries: (name, target) pairs; target is what the name resolves to."""
+        self.names: List[str] = []
+        self.targets: List[str] = []
+        postings: Dict[str, List[int]] = {}
+        sizes: List[int] = []
+        seen = set()
+        for name, target in entries:
+            if not name or (name, target) in seen:
+                continue
+            seen.add((name, target))
+            name_id = len(self.names)
+            self.names.append(name)
+            self.targets.append(target)
+            grams = trigrams(name)
+            sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(name_id)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._sizes = np.array(sizes, dtype=np.int32)
+
+    @classmethod
+    def from_ontology(cls, ontology: Ontology) -> 'TrigramIndex':
+        return cls(concept_names(ontology))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.3) -> List[dict]:
+        """Returns up to `limit` distinct targets ranked by similarity to `query`."""
+        query_grams = trigrams(query)
+        grams = [g for g in query_grams if g in self._postings]
+        if not grams:
+            return []
+        shared = np.bincount(np.concatenate([self._postings[g] for g in grams]), minlength=len(self.names))
+        candidates = np.flatnonzero(shared)
+        scores = 2.0 * shared[candidates] / (len(query_grams) + self._sizes[candidates])
+        keep = scores >= min_score
+        candidates, scores = candidates[keep], scores[keep]
+        ranked = candidates[np.argsort(-scores, kind='stable')]
+        score_of = dict(zip(candidates.tolist(), scores.tolist()))
+
+        results, targets = [], set()
+        for name_id in ranked.tolist():
+            target = self.targets[name_id]
+            if target in targets:
+                continue
+            targets.add(target)
+            results.append({"name": self.names[name_id], "concept": target, "score": round(score_of[name_id], 3)})
+            if len(results) == limit:
+                break
+        return results
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+from .loader import UPPER_QUANTITY_TYPES
+
+ONTOLOGY_FILES = ["upper.yaml", "lower.yaml", "catalog.yaml", "rules.yaml"]
+
+# Sections of upper.yaml that hold named concepts (other than the top-level quantity types).
+UPPER_SECTIONS = ['relationships', 'unit_validation', 'operations', 'data_quality_rules']
+
+_NULL_SHA = "0" * 40
+
+ConceptKey = Tuple[str, str]
+
+
+def _fingerprint(value) -> str:
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def extract_concepts(filename: str, data) -> Dict[ConceptKey, str]:
+    """
+    Flattens one ontology YAML document into {(section, concept name): fingerprint}.
+    Sections follow the merged Ontology model, so quantity types from upper.yaml and
+    lower.yaml land in the same `quantity_types` section.
+    """
+    concepts: Dict[ConceptKey, str] = {}
+    if not isinstance(data, dict):
+        return concepts
+
+    def add_section(section, items):
+        if isinstance(items, dict):
+            for name, value in items.items():
+                concepts[(section, str(name))] = _fingerprint(value)
+
+    if filename == "upper.yaml":
+        if data.get('metadata'):
+            concepts[('metadata', 'metadata')] = _fingerprint(data['metadata'])
+        temporal = data.get('temporal') or {}
+        add_section('interval_types', temporal.get('interval_types'))
+        for rule in temporal.get('conversion_rules') or []:
+            name = f"{rule.get('source')}->{rule.get('target')}"
+            concepts[('conversion_rules', name)] = _fingerprint(rule)
+        for section in UPPER_SECTIONS:
+            add_section(section, data.get(section))
+        add_section('quantity_types', {k: v for k, v in data.items() if k in UPPER_QUANTITY_TYPES})
+    elif filename == "lower.yaml":
+        for section, items in data.items():
+            if section == 'domain_instances':
+                for instance in items or []:
+                    concepts[(section, str(instance.get('name')))] = _fingerprint(instance)
+            else:
+                add_section(section, items)
+    elif filename == "catalog.yaml":
+        add_section('tables', data.get('tables'))
+    elif filename == "rules.yaml":
+        for rule in data.get('rules') or []:
+            concepts[('rules', str(rule.get('id')))] = _fingerprint(rule)
+
+    return concepts
+
+
+class BlobReader:
+    """Streams blob contents from a single long-lived `git cat-file --batch` process."""
+
+    def __init__(self, repo_dir: str):
+        self._process = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=repo_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def read(self, sha: str) -> Optional[bytes]:
+        self._process.stdin.write(f"{sha}\n".encode('ascii'))
+        self._process.stdin.flush()
+        header = self._process.stdout.readline().decode('ascii').split()
+        if len(header) < 3 or header[1] == "missing":
+            return None
+        size = int(header[2])
+        content = self._process.stdout.read(size)
+        self._process.stdout.read(1)  # trailing newline
+        return content
+
+    def close(self):
+        if self._process.stdin:
+            self._process.stdin.close()
+        self._process.wait()
+
+
+class OntologyHistoryIndex:
+    """
+    Per-concept change history of the ontology, built from `git log` over the ontology directory.
+
+    The log is walked once, oldest first. Only blobs that changed in a commit are fetched
+    (through a single `git cat-file --batch` process) and parsed, and each distinct blob is
+    parsed at most once. `refresh()` indexes only commits made since the last walk, and walks
+    the whole log again if the last indexed commit is no longer in HEAD's history (e.g. after a
+    reset, rebase or checkout of another branch).
+    """
+
+    def __init__(self, repo_dir: str, ontology_path: str = "ontology"):
+        self.repo_dir = repo_dir
+        self.ontology_path = ontology_path.strip('/')
+        self._blob_cache: Dict[Tuple[str, str], Dict[ConceptKey, str]] = {}
+        self._reset()
+        self.refresh()
+
+    def _reset(self):
+        self.commits: List[Dict[str, str]] = []
+        self.events: Dict[str, List[Dict[str, str]]] = {}
+        self._last_commit: Optional[str] = None
+        self._file_concepts: Dict[str, Dict[ConceptKey, str]] = {f: {} for f in ONTOLOGY_FILES}
+
+    def _git_succeeds(self, *args: str) -> bool:
+        return subprocess.run(["git", *args], capture_output=True, cwd=self.repo_dir).returncode == 0
+
+    def _last_commit_in_head(self) -> bool:
+        """Whether the last indexed commit still exists and is an ancestor of HEAD."""
+        return (self._git_succeeds("cat-file", "-e", f"{self._last_commit}^{{commit}}")
+                and self._git_succeeds("merge-base", "--is-ancestor", self._last_commit, "HEAD"))
+
+    def refresh(self) -> int:
+        """
+        Indexes commits since the last walk. Returns the number of new commits indexed, or of all
+        commits if the index had to be rebuilt because history was rewritten.
+        """
+        if self._last_commit and not self._last_commit_in_head():
+            self._reset()
+        rev_range = f"{self._last_commit}..HEAD" if self._last_commit else "HEAD"
+        log = subprocess.run(
+            ["git", "log", "--reverse", "--first-parent", "-m", "--raw", "--no-abbrev", "--no-renames",
+             "--format=%x1e%H%x1f%ct%x1f%s", rev_range, "--", self.ontology_path],
+            capture_output=True,
+            text=True,
+            cwd=self.repo_dir,
+        )
+        if log.returncode != 0:
+            raise RuntimeError(f"git log failed: {log.stderr.strip()}")
+
+        entries = [e for e in log.stdout.split('\x1e') if e.strip()]
+        if not entries:
+            return 0
+
+        reader = BlobReader(self.repo_dir)
+        try:
+            for entry in entries:
+                self._index_commit(entry, reader)
+        finally:
+            reader.close()
+        return len(entries)
+
+    def _index_commit(self, entry: str, reader: BlobReader):
+        lines = entry.strip('\n').split('\n')
+        sha, timestamp, subject = lines[0].split('\x1f', 2)
+        commit = {"commit": sha, "timestamp": timestamp, "subject": subject}
+
+        before = self._merged_state()
+        for line in lines[1:]:
+            if not line.startswith(':'):
+                continue
+            meta, path = line.split('\t', 1)
+            filename = path[len(self.ontology_path) + 1:]
+            if filename not in self._file_concepts:
+                continue
+            new_sha = meta.split()[3]
+            self._file_concepts[filename] = self._parse_blob(filename, new_sha, reader)
+        after = self._merged_state()
+
+        for key in after.keys() | before.keys():
+            if key not in before:
+                change = "added"
+            elif key not in after:
+                change = "removed"
+            elif before[key] != after[key]:
+                change = "modified"
+            else:
+                continue
+            section, name = key
+            self.events.setdefault(name, []).append({**commit, "section": section, "change": change})
+
+        self.commits.append(commit)
+        self._last_commit = sha
+
+    def _parse_blob(self, filename: str, sha: str, reader: BlobReader) -> Dict[ConceptKey, str]:
+        if sha == _NULL_SHA:
+            return {}
+        cache_key = (filename, sha)
+        if cache_key not in self._blob_cache:
+            content = reader.read(sha)
+            try:
+                data = yaml.safe_load(content) if content is not None else None
+            except yaml.YAMLError:
+                # Keep the previous state of this file if a revision does not parse
+                return self._file_concepts[filename]
+            self._blob_cache[cache_key] = extract_concepts(filename, data)
+        return self._blob_cache[cache_key]
+
+    def _merged_state(self) -> Dict[ConceptKey, str]:
+        merged: Dict[ConceptKey, str] = {}
+        for filename in ONTOLOGY_FILES:
+            merged.update(self._file_concepts[filename])
+        return merged
+
+    def history(self, concept_name: str, section: Optional[str] = None) -> List[Dict[str, str]]:
+        """Returns change events for a concept, oldest first."""
+        events = self.events.get(concept_name, [])
+        if section:
+            events = [e for e in events if e["section"] == section]
+        return list(events)
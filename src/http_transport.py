@@ -0,0 +1,131 @@
+"""
+Long-running HTTP mode for the MCP server.
+
+Over stdio every agent session starts its own server process and loads the ontology again.
+In HTTP mode one process keeps the loaded ontology and its indexes warm and serves many clients
+over streamable HTTP (or SSE), with HTTP keep-alive and a cap on in-flight requests per client.
+
+The per-client cap applies to streamable HTTP only. Over SSE a message POST is answered with 202
+before the tool runs and the result arrives later on the event stream, so counting in-flight POSTs
+would not limit any work; SSE clients are served without a cap.
+"""
+import json
+from typing import Dict, Iterable, List, Optional
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.transport_security import TransportSecuritySettings
+
+HTTP_TRANSPORTS = ('streamable-http', 'sse')
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+DEFAULT_PER_CLIENT_LIMIT = 4
+DEFAULT_KEEP_ALIVE = 30
+
+SESSION_HEADER = b'mcp-session-id'
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+WILDCARD_HOSTS = ('0.0.0.0', '::', '')
+
+
+class ClientLimitMiddleware:
+    """
+    ASGI middleware capping concurrent POST requests (tool calls and other JSON-RPC messages) per
+    client of the streamable HTTP transport, where a POST stays open until its result is sent. Clients are identified by their MCP session id, or by address before a session exists.
+    Requests over the cap are answered at once with 429 and a JSON-RPC error rather than queued,
+    so one busy client cannot hold the server's attention. Long-lived GET event streams are not
+    counted.
+    """
+
+    def __init__(self, app, limit: int = DEFAULT_PER_CLIENT_LIMIT, retry_after: int = 1):
+        if limit < 1:
+            raise ValueError("per-client limit must be at least 1")
+        self.app = app
+        self.limit = limit
+        self.retry_after = retry_after
+        self.active: Dict[str, int] = {}
+        self.rejected = 0
+
+    @staticmethod
+    def client_key(scope) -> str:
+        for name, value in scope.get('headers', []):
+            if name == SESSION_HEADER:
+                return f"session:{value.decode('latin-1')}"
+        client = scope.get('client')
+        return f"address:{client[0]}" if client else "address:unknown"
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope.get('method') != 'POST':
+            await self.app(scope, receive, send)
+            return
+
+        key = self.client_key(scope)
+        if self.active.get(key, 0) >= self.limit:
+            self.rejected += 1
+            await self._reject(send)
+            return
+
+        self.active[key] = self.active.get(key, 0) + 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.active[key] -= 1
+            if not self.active[key]:
+                del self.active[key]
+
+    async def _reject(self, send):
+        body = json.dumps({
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {"code": -32000, "message": f"Too many concurrent requests (limit {self.limit} per client)"},
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [(b"content-type", b"application/json"), (b"retry-after", str(self.retry_after).encode()),
+                        (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def transport_security(host: str = DEFAULT_HOST, allowed_hosts: Iterable[str] = ()) -> TransportSecuritySettings:
+    """
+    DNS rebinding protection allowing the loopback names, the bound host (unless it is a wildcard
+    address) and `allowed_hosts`. Names given without a port are allowed on any port.
+    """
+    names = list(LOOPBACK_HOSTS) + ([host] if host not in WILDCARD_HOSTS else []) + list(allowed_hosts)
+    hosts: List[str] = []
+    origins: List[str] = []
+    for name in names:
+        if name.count(':') > 1 and not name.startswith('['):
+            name = f"[{name}]"  # bare IPv6 address
+        patterns = [name] if ':' in name.rsplit(']', 1)[-1] else [name, f"{name}:*"]
+        for pattern in patterns:
+            if pattern not in hosts:
+                hosts.append(pattern)
+                origins.extend([f"http://{pattern}", f"https://{pattern}"])
+    return TransportSecuritySettings(enable_dns_rebinding_protection=True, allowed_hosts=hosts,
+                                     allowed_origins=origins)
+
+
+def create_app(mcp: FastMCP, transport: str = 'streamable-http', host: str = DEFAULT_HOST,
+               per_client_limit: int = DEFAULT_PER_CLIENT_LIMIT,
+               allowed_hosts: Iterable[str] = ()):
+    """
+    Builds the ASGI app for an HTTP transport. Streamable HTTP is wrapped in the per-client limit;
+    SSE is not (see the module docstring). Host and Origin headers are checked against
+    `transport_security(host, allowed_hosts)`.
+    """
+    if transport not in HTTP_TRANSPORTS:
+        raise ValueError(f"Unknown HTTP transport '{transport}'. Use one of {list(HTTP_TRANSPORTS)}")
+    mcp.settings.transport_security = transport_security(host, allowed_hosts)
+    if transport == 'sse':
+        return mcp.sse_app()
+    return ClientLimitMiddleware(mcp.streamable_http_app(), per_client_limit)
+
+
+def serve(mcp: FastMCP, transport: str = 'streamable-http', host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+          per_client_limit: int = DEFAULT_PER_CLIENT_LIMIT, keep_alive: int = DEFAULT_KEEP_ALIVE,
+          log_level: Optional[str] = 'warning', allowed_hosts: Iterable[str] = ()):
+    """Serves the MCP server over HTTP until interrupted."""
+    import uvicorn
+    app = create_app(mcp, transport, host, per_client_limit, allowed_hosts)
+    uvicorn.run(app, host=host, port=port, timeout_keep_alive=keep_alive, log_level=log_level)
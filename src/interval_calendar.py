@@ -0,0 +1,151 @@
+import json
+import os
+from datetime import date
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from .models import IntervalType, Ontology
+
+# WEM Trading Days run from 08:00 to 08:00 (market time); timestamps are naive market time.
+DEFAULT_TRADING_DAY_START = "08:00"
+
+CALENDAR_FILE = "calendar.npy"
+META_FILE = "calendar.json"
+
+_DAY = np.timedelta64(1, 'D')
+
+
+class CalendarError(ValueError):
+    pass
+
+
+def _clock_offset(text: Optional[str]) -> np.timedelta64:
+    """Parses "HH:MM" into an offset from midnight."""
+    if not text:
+        return np.timedelta64(0, 's')
+    hours, minutes = text.split(':')
+    return np.timedelta64(int(hours) * 3600 + int(minutes) * 60, 's')
+
+
+def _duration(name: str, interval: IntervalType) -> np.timedelta64:
+    if interval.duration_minutes:
+        return np.timedelta64(interval.duration_minutes * 60, 's')
+    if interval.duration_seconds:
+        return np.timedelta64(interval.duration_seconds, 's')
+    raise CalendarError(f"Interval type '{name}' has no fixed duration ({interval.duration_unit or 'unknown'}).")
+
+
+def as_timestamps(values) -> np.ndarray:
+    """Converts datetimes, ISO strings or datetime64 values to a datetime64[s] array."""
+    return np.asarray(values, dtype='datetime64[s]')
+
+
+class IntervalCalendar:
+    """
+    Precomputed market calendar for vectorized timestamp lookups.
+
+    Per-day facts that cannot be derived arithmetically (the business-day flag and a running count
+    of business days) are stored in one record array per calendar day, which can be saved and
+    memory-mapped back. Interval indices, interval numbers within the Trading Day, trading dates
+    and settlement months are fixed-length arithmetic over the timestamp array, so every lookup is
+    a handful of vectorized operations plus at most one gather into the day table.
+    """
+
+    def __init__(self, ontology: Ontology, days: np.ndarray, trading_day_start: str = DEFAULT_TRADING_DAY_START):
+        self.ontology = ontology
+        self.days = days
+        self.start = days['date'][0] if len(days) else None
+        self.trading_day_start = trading_day_start
+        self._trading_offset = _clock_offset(trading_day_start)
+
+    @classmethod
+    def build(cls, ontology: Ontology, start: date, end: date, holidays: Iterable[date] = (),
+              trading_day_start: str = DEFAULT_TRADING_DAY_START) -> 'IntervalCalendar':
+        """Builds the day table for [start, end]. Business days are weekdays that are not holidays."""
+        dates = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + _DAY, dtype='datetime64[D]')
+        business = np.is_busday(dates, holidays=np.array(list(holidays), dtype='datetime64[D]'))
+        days = np.empty(len(dates), dtype=[('date', 'datetime64[D]'), ('is_business_day', bool),
+                                           ('business_day_ordinal', np.int32)])
+        days['date'] = dates
+        days['is_business_day'] = business
+        days['business_day_ordinal'] = np.cumsum(business) - business
+        return cls(ontology, days, trading_day_start)
+
+    def save(self, directory: str) -> str:
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, CALENDAR_FILE), self.days)
+        with open(os.path.join(directory, META_FILE), 'w') as f:
+            json.dump({"trading_day_start": self.trading_day_start}, f)
+        return directory
+
+    @classmethod
+    def load(cls, ontology: Ontology, directory: str, mmap: bool = True) -> 'IntervalCalendar':
+        """Loads a saved calendar; the day table is memory-mapped unless mmap is False."""
+        days = np.load(os.path.join(directory, CALENDAR_FILE), mmap_mode='r' if mmap else None)
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        return cls(ontology, days, meta["trading_day_start"])
+
+    def _interval(self, interval_type: str):
+        if interval_type not in self.ontology.interval_types:
+            raise CalendarError(f"Interval type '{interval_type}' not found.")
+        interval = self.ontology.interval_types[interval_type]
+        return _duration(interval_type, interval), _clock_offset(interval.alignment)
+
+    def _day_positions(self, dates: np.ndarray) -> np.ndarray:
+        positions = (dates - self.start).astype(np.int64)
+        if positions.size and (positions.min() < 0 or positions.max() >= len(self.days)):
+            raise CalendarError(f"Dates outside the calendar ({self.start} to {self.days['date'][-1]}).")
+        return positions
+
+    def interval_index(self, timestamps, interval_type: str = "DispatchInterval") -> np.ndarray:
+        """Index of the interval containing each timestamp, counted from the calendar start."""
+        duration, alignment = self._interval(interval_type)
+        origin = self.start.astype('datetime64[s]') + alignment
+        return (as_timestamps(timestamps) - origin) // duration
+
+    def interval_start(self, timestamps, interval_type: str = "DispatchInterval") -> np.ndarray:
+        duration, alignment = self._interval(interval_type)
+        origin = self.start.astype('datetime64[s]') + alignment
+        return origin + self.interval_index(timestamps, interval_type) * duration
+
+    def trading_date(self, timestamps) -> np.ndarray:
+        """Trading Day containing each timestamp, as datetime64[D]."""
+        return (as_timestamps(timestamps) - self._trading_offset).astype('datetime64[D]')
+
+    def interval_of_day(self, timestamps, interval_type: str = "TradingInterval") -> np.ndarray:
+        """1-based number of the interval within its Trading Day (e.g. Trading Interval 1-48)."""
+        duration, _ = self._interval(interval_type)
+        ts = as_timestamps(timestamps)
+        day_start = self.trading_date(ts).astype('datetime64[s]') + self._trading_offset
+        return (ts - day_start) // duration + 1
+
+    def settlement_month(self, timestamps) -> np.ndarray:
+        """Monthly SettlementPeriod of each timestamp's Trading Day, as datetime64[M]."""
+        return self.trading_date(timestamps).astype('datetime64[M]')
+
+    def is_business_day(self, dates) -> np.ndarray:
+        """Business-day flag for each date (or the calendar date of each timestamp)."""
+        positions = self._day_positions(np.asarray(dates, dtype='datetime64[D]'))
+        return self.days['is_business_day'][positions]
+
+    def business_days_between(self, start_dates, end_dates) -> np.ndarray:
+        """Number of business days in [start, end) for each pair of dates."""
+        starts = self._day_positions(np.asarray(start_dates, dtype='datetime64[D]'))
+        ends = self._day_positions(np.asarray(end_dates, dtype='datetime64[D]'))
+        ordinal = self.days['business_day_ordinal']
+        return ordinal[ends] - ordinal[starts]
+
+    def lookup(self, timestamps) -> Dict[str, np.ndarray]:
+        """All calendar attributes for an array of timestamps."""
+        ts = as_timestamps(timestamps)
+        trading_date = self.trading_date(ts)
+        return {
+            "dispatch_interval": self.interval_index(ts, "DispatchInterval"),
+            "trading_interval": self.interval_index(ts, "TradingInterval"),
+            "trading_interval_of_day": self.interval_of_day(ts, "TradingInterval"),
+            "trading_date": trading_date,
+            "settlement_month": trading_date.astype('datetime64[M]'),
+            "is_business_day": self.is_business_day(trading_date),
+        }
@@ -1,33 +1,73 @@
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional, Union
 from .models import Ontology
+from .compact import CompactOntology, compact_ontology
+from .metrics import timed_phase
+from .fast_yaml import YAML_LOADER, load_yaml_files
+
+# We assume the WEM_Rules repo is at f:/WEM_Rules based on the user's context
+DEFAULT_RULES_PATH = "f:/WEM_Rules/output/market_rules.rules.json"
+
+ONTOLOGY_FILES = ['upper.yaml', 'lower.yaml', 'catalog.yaml', 'rules.yaml']
+
+# Quantity types defined at the top level of upper.yaml
+UPPER_QUANTITY_TYPES = [
+    'NameplateCapacity', 'EnergyCapacity', 'DurationRating',
+    'CapacityFactor', 'AvailabilityFactor', 'RoundTripEfficiency',
+    'EquivalentFullCycles', 'SCADA'
+]
 
 class OntologyLoader:
-    def __init__(self, ontology_dir: str):
+    """
+    Loads the ontology YAML files and the WEM Rules JSON.
+
+    YAML is parsed with the libyaml C loader when available. With `parallel` (the default), the
+    rules JSON loads on a background thread while the YAML is parsed. With `yaml_workers` >= 2,
+    large YAML files are also split and parsed across a process pool; that is opt-in and must not be
+    used while a module is being imported (see fast_yaml.py). Pass parallel=False and
+    yaml_loader=yaml.SafeLoader for the original serial, pure-Python path.
+    """
+
+    def __init__(self, ontology_dir: str, rules_path: Optional[str] = None, parallel: bool = True,
+                 yaml_loader=None, compact: bool = False, yaml_workers: int = 1):
         self.ontology_dir = Path(ontology_dir)
+        self.rules_path = rules_path or DEFAULT_RULES_PATH
+        self.parallel = parallel
+        self.yaml_loader = yaml_loader or YAML_LOADER
+        self.yaml_workers = yaml_workers
         self.ontology = self._load_ontology()
+        if compact:
+            with timed_phase('compact'):
+                self.ontology = compact_ontology(self.ontology)
 
     def _load_yaml(self, filename: str) -> dict:
         with open(self.ontology_dir / filename, 'r') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=self.yaml_loader)
 
-    def _load_ontology(self) -> Ontology:
-        upper = self._load_yaml('upper.yaml')
-        lower = self._load_yaml('lower.yaml')
-        catalog = self._load_yaml('catalog.yaml')
-        rules = self._load_yaml('rules.yaml')
-
-        # Load WEM Rules
-        # We assume the WEM_Rules repo is at f:/WEM_Rules based on the user's context
-        # Ideally this would be configurable, but for this integration we hardcode the known path.
-        rules_path = "f:/WEM_Rules/output/market_rules.rules.json"
+    def _load_rules(self):
         from .rules_loader import WEMRulesLoader
-        rules_loader = WEMRulesLoader(rules_path)
-        wem_rules = rules_loader.load_rules()
+        with timed_phase('rules_load'):
+            return WEMRulesLoader(self.rules_path).load_rules()
+
+    def _load_ontology(self) -> Ontology:
+        paths = [str(self.ontology_dir / filename) for filename in ONTOLOGY_FILES]
+        if self.parallel:
+            with ThreadPoolExecutor(max_workers=1) as background:
+                rules_future = background.submit(self._load_rules)
+                with timed_phase('yaml_parse'):
+                    upper, lower, catalog, rules = load_yaml_files(paths, self.yaml_workers, self.yaml_loader)
+                wem_rules = rules_future.result()
+        else:
+            with timed_phase('yaml_parse'):
+                upper, lower, catalog, rules = (self._load_yaml(filename) for filename in ONTOLOGY_FILES)
+            wem_rules = self._load_rules()
 
         # Merge dictionaries
         data = {
             'metadata': upper.get('metadata'),
+            'units': upper.get('units', {}),
             'wem_rules': wem_rules,
             'interval_types': upper['temporal']['interval_types'],
             'conversion_rules': upper['temporal']['conversion_rules'],
@@ -41,9 +81,7 @@ class OntologyLoader:
             'price_types': lower['price_types'],
             'quantity_types': {**lower.get('quantity_types', {}), **{
                 k: v for k, v in upper.items() 
-                if k in ['NameplateCapacity', 'EnergyCapacity', 'DurationRating', 
-                        'CapacityFactor', 'AvailabilityFactor', 'RoundTripEfficiency', 
-                        'EquivalentFullCycles', 'SCADA']
+                if k in UPPER_QUANTITY_TYPES
             }},
             'tables': catalog['tables'],
             'rules': rules['rules'],
@@ -54,7 +92,8 @@ class OntologyLoader:
             'data_quality_rules': upper.get('data_quality_rules', {})
         }
         
-        return Ontology(**data)
+        with timed_phase('pydantic_build'):
+            return Ontology(**data)
 
-    def get_ontology(self) -> Ontology:
+    def get_ontology(self) -> Union[Ontology, CompactOntology]:
         return self.ontology
@@ -0,0 +1,200 @@
+import functools
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, List, Optional, Sequence
+
+from .profiler import profiler
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+PHASE_HISTORY = 20  # timings kept per load phase
+
+
+class ErrorResult(str):
+    """
+    A tool response reporting a failure. Tools return errors as text for the agent to read;
+    returning the text as an ErrorResult makes `instrument` count the call as an error.
+    """
+
+
+class Histogram:
+    """Fixed-bucket histogram. Observing a value is one binary search and two additions."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bucket bound containing the q-quantile (None for an empty histogram or +Inf)."""
+        if not self.count:
+            return None
+        target = q * self.count
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            if running >= target:
+                return bound
+        return None
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {str(b): c for b, c in zip(self.buckets + ("+Inf",), self.counts)},
+        }
+
+
+class ToolStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+
+
+class MetricsRegistry:
+    """
+    Per-tool call counts, errors, latency and response size histograms, plus the last
+    PHASE_HISTORY timings of each load phase.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tools: Dict[str, ToolStats] = {}
+        self.phases: Dict[str, Deque[float]] = {}
+
+    def record_call(self, tool: str, seconds: float, response_bytes: Optional[int], error: bool = False):
+        with self._lock:
+            stats = self.tools.get(tool)
+            if stats is None:
+                stats = self.tools[tool] = ToolStats()
+            stats.calls += 1
+            stats.latency.observe(seconds)
+            if error:
+                stats.errors += 1
+            if response_bytes is not None:
+                stats.response_bytes.observe(response_bytes)
+
+    def record_phase(self, phase: str, seconds: float):
+        with self._lock:
+            self.phases.setdefault(phase, deque(maxlen=PHASE_HISTORY)).append(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.tools = {}
+            self.phases = {}
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "tools": {
+                    name: {
+                        "calls": stats.calls,
+                        "errors": stats.errors,
+                        "latency_seconds": {
+                            **stats.latency.to_dict(),
+                            "p50_le": stats.latency.quantile(0.5),
+                            "p99_le": stats.latency.quantile(0.99),
+                        },
+                        "response_bytes": stats.response_bytes.to_dict(),
+                    }
+                    for name, stats in self.tools.items()
+                },
+                "load_phases_seconds": {phase: list(values) for phase, values in self.phases.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        """Renders all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP wem_tool_calls_total Tool invocations.",
+            "# TYPE wem_tool_calls_total counter",
+        ]
+        with self._lock:
+            tools = list(self.tools.items())
+            phases = {p: list(v) for p, v in self.phases.items()}
+        for name, stats in tools:
+            lines.append(f'wem_tool_calls_total{{tool="{name}"}} {stats.calls}')
+        lines += ["# HELP wem_tool_errors_total Tool invocations that raised or returned an error result.",
+                  "# TYPE wem_tool_errors_total counter"]
+        for name, stats in tools:
+            lines.append(f'wem_tool_errors_total{{tool="{name}"}} {stats.errors}')
+        lines += ["# HELP wem_tool_latency_seconds Tool latency.",
+                  "# TYPE wem_tool_latency_seconds histogram"]
+        for name, stats in tools:
+            lines += _prometheus_histogram("wem_tool_latency_seconds", f'tool="{name}"', stats.latency)
+        lines += ["# HELP wem_tool_response_bytes Tool response size.",
+                  "# TYPE wem_tool_response_bytes histogram"]
+        for name, stats in tools:
+            lines += _prometheus_histogram("wem_tool_response_bytes", f'tool="{name}"', stats.response_bytes)
+        lines += ["# HELP wem_load_phase_seconds Duration of the last run of each ontology load phase.",
+                  "# TYPE wem_load_phase_seconds gauge"]
+        for phase, values in phases.items():
+            lines.append(f'wem_load_phase_seconds{{phase="{phase}"}} {values[-1]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        with open(path, 'w') as f:
+            f.write(self.to_prometheus())
+
+
+def _prometheus_histogram(metric: str, labels: str, histogram: Histogram) -> List[str]:
+    lines = []
+    running = 0
+    for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+        running += count
+        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {running}')
+    lines.append(f'{metric}_sum{{{labels}}} {histogram.sum}')
+    lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+    return lines
+
+
+# Process-wide registry used by the server and loader.
+registry = MetricsRegistry()
+
+
+def instrument(fn: Callable) -> Callable:
+    """
+    Records latency, response size and errors of every call to `fn` in the registry,
+    and registers the call with the slow-call profiler when it is enabled. A call is an error
+    when it raises or returns an ErrorResult.
+    """
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        call_id = profiler.enter(name, args, kwargs) if profiler.enabled else None
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            registry.record_call(name, time.perf_counter() - start, None, error=True)
+            if call_id is not None:
+                profiler.exit(call_id, error=True)
+            raise
+        size = len(result.encode('utf-8')) if isinstance(result, str) else None
+        registry.record_call(name, time.perf_counter() - start, size, error=isinstance(result, ErrorResult))
+        if call_id is not None:
+            profiler.exit(call_id)
+        return result
+
+    return wrapper
+
+
+@contextmanager
+def timed_phase(phase: str):
+    """Records the duration of a block as a load phase."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.record_phase(phase, time.perf_counter() - start)
@@ -164,6 +164,7 @@ class WEMRule(BaseModel):
 
 class Ontology(BaseModel):
     metadata: Optional[OntologyMetadata] = None
+    units: Dict[str, str] = {}
     wem_rules: Dict[str, WEMRule] = {}
     interval_types: Dict[str, IntervalType]
     conversion_rules: List[ConversionRule]
@@ -0,0 +1,161 @@
+import math
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .models import Ontology
+
+OPERATION = "determine_network_access_quantity"
+
+# Prioritisation tiers from operations.determine_network_access_quantity.logic.prioritisation
+TIER_EXISTING = 1
+TIER_NAFF = 2
+TIER_NEW_ENTRANT = 3
+
+_COVERAGE = re.compile(r'>=\s*(\d+(?:\.\d+)?)\s*%')
+
+
+class NAQError(ValueError):
+    pass
+
+
+class NAQFacility:
+    """A facility competing for network access: CertifiedReserveCapacity (MW), tier and capability class."""
+
+    def __init__(self, code: str, certified_capacity: float, tier: int = TIER_NEW_ENTRANT,
+                 capability_class: Optional[str] = None):
+        self.code = code
+        self.certified_capacity = certified_capacity
+        self.tier = tier
+        self.capability_class = capability_class
+
+
+class NAQResult:
+    def __init__(self, allocations: Dict[str, float], coverage: float, groups: List[dict]):
+        self.allocations = allocations
+        self.coverage = coverage
+        self.groups = groups
+
+    def to_dict(self) -> dict:
+        return {"network_access_quantity": self.allocations, "coverage": self.coverage, "groups": self.groups}
+
+
+class NAQEngine:
+    """
+    Allocates Network Access Quantity by priority tier under network limits across dispatch scenarios.
+
+    The network is described by RCM limit advice: a sensitivity matrix (constraints x facilities)
+    and constraint limits per scenario (scenarios x constraints). Dispatch_Scenarios give each
+    facility's output per MW of NAQ in each peak scenario (scenarios x facilities), e.g. 1.0 for
+    firm capacity and a capacity factor for intermittent plant.
+
+    Facilities are allocated in priority groups: tier 1 (existing/committed), tier 2 (NAFF), then
+    tier 3 new entrants ordered by capability class priority (Class 1 > 2 > 3). Each group receives
+    the largest common fraction of its CertifiedReserveCapacity that keeps the allocation feasible
+    in at least the required share of scenarios, so facilities of equal priority share pro rata.
+    Scenario evaluation runs in chunks across a thread pool.
+    """
+
+    def __init__(self, ontology: Ontology, coverage: Optional[float] = None, workers: Optional[int] = None):
+        self.ontology = ontology
+        self.required_coverage = coverage if coverage is not None else self._operation_coverage()
+        self.workers = workers or os.cpu_count() or 1
+        self.class_priority = {name: c.priority for name, c in ontology.capability_classes.items()}
+
+    def _operation_coverage(self) -> float:
+        op = self.ontology.operations.get(OPERATION)
+        text = str((op.logic or {}).get('coverage', '')) if op else ''
+        match = _COVERAGE.search(text)
+        return float(match.group(1)) / 100 if match else 0.95
+
+    def priority_key(self, facility: NAQFacility) -> tuple:
+        if facility.tier == TIER_NEW_ENTRANT:
+            lowest = max(self.class_priority.values(), default=0) + 1
+            return (facility.tier, self.class_priority.get(facility.capability_class, lowest))
+        return (facility.tier, 0)
+
+    def _map_scenarios(self, fn, *arrays: np.ndarray) -> np.ndarray:
+        """Applies fn to chunks of the scenario (first) axis of each array, in parallel."""
+        n = arrays[0].shape[0]
+        chunks = min(self.workers, max(1, n // 256))
+        if chunks <= 1:
+            return fn(*arrays)
+        bounds = np.linspace(0, n, chunks + 1, dtype=int)
+        with ThreadPoolExecutor(max_workers=chunks) as pool:
+            parts = pool.map(lambda i: fn(*(a[bounds[i]:bounds[i + 1]] for a in arrays)), range(chunks))
+            return np.concatenate(list(parts))
+
+    def coverage(self, allocation: np.ndarray, sensitivities: np.ndarray, dispatch: np.ndarray,
+                 limits: np.ndarray) -> float:
+        """Share of scenarios in which the allocation (MW per facility) respects every constraint."""
+        def feasible(d, l):
+            return ((d * allocation) @ sensitivities.T <= l + 1e-9).all(axis=1)
+        return float(self._map_scenarios(feasible, dispatch, limits).mean())
+
+    def allocate(self, facilities: List[NAQFacility], sensitivities, dispatch, limits) -> NAQResult:
+        """
+        Args:
+            facilities: Facilities in the same order as the facility axes below.
+            sensitivities: (constraints x facilities) MW of constraint flow per MW dispatched.
+            dispatch: (scenarios x facilities) dispatch per MW of NAQ in each scenario.
+            limits: (scenarios x constraints) constraint limits in each scenario.
+        """
+        sensitivities = np.asarray(sensitivities, dtype=np.float64)
+        dispatch = np.asarray(dispatch, dtype=np.float64)
+        limits = np.asarray(limits, dtype=np.float64)
+        n_facilities = len(facilities)
+        n_scenarios = dispatch.shape[0]
+        if sensitivities.shape[1] != n_facilities or dispatch.shape[1] != n_facilities:
+            raise NAQError("sensitivities and dispatch must have one column per facility.")
+        if limits.shape != (n_scenarios, sensitivities.shape[0]):
+            raise NAQError("limits must be (scenarios x constraints).")
+        if n_scenarios == 0:
+            raise NAQError("At least one dispatch scenario is required.")
+
+        capacity = np.array([f.certified_capacity for f in facilities], dtype=np.float64)
+        allocation = np.zeros(n_facilities)
+        headroom = limits.copy()
+        covered = (headroom >= 0).all(axis=1)
+        # Scenarios that may be left uncovered in total
+        allowed = n_scenarios - math.ceil(self.required_coverage * n_scenarios - 1e-9)
+
+        order: Dict[tuple, List[int]] = {}
+        for i, facility in enumerate(facilities):
+            order.setdefault(self.priority_key(facility), []).append(i)
+
+        groups = []
+        for key in sorted(order):
+            members = np.array(order[key])
+            # Constraint flow per scenario if every member ran at full CertifiedReserveCapacity
+            def group_flow(d):
+                return (d[:, members] * capacity[members]) @ sensitivities[:, members].T
+            flow = self._map_scenarios(group_flow, dispatch)
+
+            # Largest feasible fraction of the group's capacity in each scenario
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = np.where(flow > 0, headroom / flow, np.inf)
+            scale = np.clip(ratio.min(axis=1), 0.0, 1.0)
+            scale[~covered] = -np.inf
+
+            # The largest fraction feasible in all but `allowed` scenarios
+            fraction = max(float(np.partition(scale, allowed)[allowed]), 0.0)
+
+            allocation[members] = capacity[members] * fraction
+            headroom -= flow * fraction
+            covered &= (headroom >= -1e-9).all(axis=1)
+            tier, class_priority = key
+            groups.append({
+                "tier": tier,
+                "class_priority": class_priority or None,
+                "facilities": [facilities[i].code for i in members],
+                "fraction": fraction,
+            })
+
+        return NAQResult(
+            {f.code: float(allocation[i]) for i, f in enumerate(facilities)},
+            float(covered.mean()),
+            groups,
+        )
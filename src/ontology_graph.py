@@ -0,0 +1,135 @@
+"""
+Cross-references between ontology concepts, resolved once into direct links.
+
+Sections store references as plain strings (a market service's `pricing_interval`, a market's
+`procures` list, ...). `OntologyGraph` resolves every one of them when it is built: each item
+becomes a `Node` whose `links` point straight at the target nodes, each target knows what refers to
+it, and references that name nothing in the ontology are collected in `dangling` instead of being
+skipped silently at the point of use.
+"""
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .models import Ontology
+
+# (section, field, target sections tried in order); list fields give one reference per element
+REFERENCE_FIELDS: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ('market_services', 'dispatch_interval', ('interval_types',)),
+    ('market_services', 'pricing_interval', ('interval_types',)),
+    ('market_services', 'settlement_interval', ('interval_types',)),
+    ('market_services', 'compatible_with', ('market_services',)),
+    ('facility_types', 'default_class', ('facility_classes',)),
+    ('facility_types', 'default_technology', ('technology_types',)),
+    ('markets', 'procures', ('market_services',)),
+    ('markets', 'related_tables', ('tables',)),
+    ('price_types', 'granularity', ('interval_types',)),
+    ('price_types', 'derived_from', ('price_types', 'quantity_types')),
+)
+
+GRAPH_SECTIONS = ('interval_types', 'market_services', 'markets', 'facility_types', 'facility_classes',
+                  'technology_types', 'price_types', 'quantity_types', 'tables')
+
+
+class Node:
+    """An ontology item with its resolved outgoing links and incoming references."""
+    __slots__ = ('section', 'name', 'item', 'links', 'referrers')
+
+    def __init__(self, section: str, name: str, item):
+        self.section = section
+        self.name = name
+        self.item = item
+        self.links: Dict[str, List['Node']] = {}
+        self.referrers: List[Tuple['Node', str]] = []
+
+    def link(self, field: str) -> Optional['Node']:
+        """The target of a single-valued reference, or None if unset or dangling."""
+        targets = self.links.get(field)
+        return targets[0] if targets else None
+
+    def linked(self, field: str) -> List['Node']:
+        """The resolved targets of a reference field, in declaration order."""
+        return self.links.get(field, [])
+
+    def __repr__(self):
+        return f"Node({self.section}.{self.name})"
+
+
+class DanglingReference:
+    __slots__ = ('section', 'name', 'field', 'value', 'expected')
+
+    def __init__(self, section: str, name: str, field: str, value: str, expected: Tuple[str, ...]):
+        self.section = section
+        self.name = name
+        self.field = field
+        self.value = value
+        self.expected = expected
+
+    def to_dict(self) -> dict:
+        return {"section": self.section, "name": self.name, "field": self.field,
+                "value": self.value, "expected_in": list(self.expected)}
+
+
+def _values(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+class OntologyGraph:
+    """Nodes for every item in GRAPH_SECTIONS, linked along REFERENCE_FIELDS."""
+
+    def __init__(self, ontology: Ontology):
+        self.ontology = ontology
+        self.nodes: Dict[Tuple[str, str], Node] = {}
+        self._by_item: Dict[int, Node] = {}
+        self.dangling: List[DanglingReference] = []
+
+        for section in GRAPH_SECTIONS:
+            for name, item in self._section_items(section):
+                node = Node(section, name, item)
+                self.nodes.setdefault((section, name), node)
+                self._by_item[id(item)] = node
+
+        for section, field, targets in REFERENCE_FIELDS:
+            for name, item in getattr(ontology, section).items():
+                source = self.nodes[(section, name)]
+                resolved = source.links.setdefault(field, [])
+                for value in _values(getattr(item, field, None)):
+                    target = next((self.nodes[(t, value)] for t in targets if (t, value) in self.nodes), None)
+                    if target is None:
+                        self.dangling.append(DanglingReference(section, name, field, value, targets))
+                        continue
+                    resolved.append(target)
+                    target.referrers.append((source, field))
+
+    def _section_items(self, section: str) -> Iterator[Tuple[str, object]]:
+        if section != 'quantity_types':
+            yield from getattr(self.ontology, section).items()
+            return
+
+        # Quantity variants are concepts in their own right and can be referenced by name
+        def walk(items):
+            for name, qt in items.items():
+                yield name, qt
+                if qt.variants:
+                    yield from walk(qt.variants)
+        yield from walk(self.ontology.quantity_types)
+
+    def node(self, section: str, name: str) -> Optional[Node]:
+        return self.nodes.get((section, name))
+
+    def node_of(self, item) -> Optional[Node]:
+        """The node wrapping an ontology item, e.g. one returned by a concept lookup."""
+        return self._by_item.get(id(item))
+
+    def dangling_for(self, section: str, name: str) -> List[DanglingReference]:
+        return [ref for ref in self.dangling if ref.section == section and ref.name == name]
+
+    def dangling_report(self) -> dict:
+        """Dangling references grouped by the value that failed to resolve."""
+        by_value: Dict[str, List[dict]] = {}
+        for ref in self.dangling:
+            by_value.setdefault(ref.value, []).append(ref.to_dict())
+        links = sum(len(targets) for node in self.nodes.values() for targets in node.links.values())
+        return {"resolved": links, "dangling": len(self.dangling), "by_value": by_value}
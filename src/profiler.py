@@ -0,0 +1,150 @@
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+REDACTED = "[REDACTED]"
+SENSITIVE_KEYS = ("token", "password", "passwd", "secret", "api_key", "apikey", "auth", "credential")
+MAX_ARGUMENT_CHARS = 200
+MAX_STACK_DEPTH = 40
+
+
+def redact(value: Any) -> Any:
+    """Redacts sensitive-looking keys and truncates long strings in tool arguments."""
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if any(s in str(k).lower() for s in SENSITIVE_KEYS) else redact(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(v) for v in value]
+    if isinstance(value, str) and len(value) > MAX_ARGUMENT_CHARS:
+        return value[:MAX_ARGUMENT_CHARS] + f"... ({len(value)} chars)"
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)[:MAX_ARGUMENT_CHARS]
+
+
+def _collapse_stack(frame) -> str:
+    """Renders a frame's stack root-first as 'file:function:line;...'."""
+    parts = []
+    while frame is not None and len(parts) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+class _ActiveCall:
+    __slots__ = ("tool", "arguments", "thread_id", "start", "started_at", "samples")
+
+    def __init__(self, tool: str, arguments: Dict[str, Any]):
+        self.tool = tool
+        self.arguments = arguments
+        self.thread_id = threading.get_ident()
+        self.start = time.perf_counter()
+        self.started_at = time.time()
+        self.samples: Dict[str, int] = {}
+
+
+class SlowCallProfiler:
+    """
+    Opt-in stack-sampling profiler for slow tool calls.
+
+    While enabled, a single background thread wakes every `sample_interval_ms` and samples the
+    stack of any in-flight call that has run longer than `threshold_ms`. Calls under the threshold
+    are never sampled and only pay for registering and unregistering themselves. Calls that finish
+    over the threshold are kept, with redacted arguments, in a ring buffer of the last `buffer_size`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._active: Dict[int, _ActiveCall] = {}
+        self._sampler: Optional[threading.Thread] = None
+        self.enabled = False
+        self.threshold_ms = 0.0
+        self.sample_interval_ms = 5.0
+        self.profiles = deque(maxlen=20)
+
+    def configure(self, threshold_ms: Optional[float], buffer_size: int = 20, sample_interval_ms: float = 5.0):
+        """Enables profiling of calls slower than `threshold_ms`; None disables it."""
+        with self._lock:
+            self.threshold_ms = threshold_ms or 0.0
+            self.sample_interval_ms = sample_interval_ms
+            self.profiles = deque(self.profiles, maxlen=buffer_size)
+            self.enabled = threshold_ms is not None
+        if self.enabled and (self._sampler is None or not self._sampler.is_alive()):
+            self._sampler = threading.Thread(target=self._sample_loop, name="slow-call-sampler", daemon=True)
+            self._sampler.start()
+
+    def configure_from_env(self):
+        """Reads WEM_SLOW_CALL_THRESHOLD_MS, WEM_SLOW_CALL_BUFFER and WEM_PROFILE_SAMPLE_INTERVAL_MS."""
+        threshold = os.environ.get("WEM_SLOW_CALL_THRESHOLD_MS")
+        if threshold:
+            self.configure(
+                float(threshold),
+                buffer_size=int(os.environ.get("WEM_SLOW_CALL_BUFFER", "20")),
+                sample_interval_ms=float(os.environ.get("WEM_PROFILE_SAMPLE_INTERVAL_MS", "5")),
+            )
+
+    def enter(self, tool: str, args: tuple, kwargs: dict) -> int:
+        call_id = next(self._ids)
+        arguments = dict(kwargs)
+        if args:
+            arguments["args"] = list(args)
+        with self._lock:
+            self._active[call_id] = _ActiveCall(tool, arguments)
+        return call_id
+
+    def exit(self, call_id: int, error: bool = False):
+        with self._lock:
+            call = self._active.pop(call_id, None)
+        if call is None:
+            return
+        duration_ms = (time.perf_counter() - call.start) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        top_stacks = sorted(call.samples.items(), key=lambda item: item[1], reverse=True)
+        profile = {
+            "tool": call.tool,
+            "started_at": call.started_at,
+            "duration_ms": duration_ms,
+            "error": error,
+            "arguments": redact(call.arguments),
+            "sample_interval_ms": self.sample_interval_ms,
+            "samples": sum(call.samples.values()),
+            "stacks": [{"stack": stack, "count": count} for stack, count in top_stacks],
+        }
+        with self._lock:
+            self.profiles.append(profile)
+
+    def recent(self, limit: Optional[int] = None) -> List[dict]:
+        """Returns captured profiles, most recent first."""
+        with self._lock:
+            profiles = list(reversed(self.profiles))
+        return profiles[:limit] if limit else profiles
+
+    def _sample_loop(self):
+        while self.enabled:
+            time.sleep(self.sample_interval_ms / 1000)
+            now = time.perf_counter()
+            threshold = self.threshold_ms / 1000
+            with self._lock:
+                slow = [c for c in self._active.values() if now - c.start >= threshold]
+            if not slow:
+                continue
+            frames = sys._current_frames()
+            for call in slow:
+                frame = frames.get(call.thread_id)
+                if frame is not None:
+                    stack = _collapse_stack(frame)
+                    call.samples[stack] = call.samples.get(stack, 0) + 1
+
+
+# Process-wide profiler used by metrics.instrument. Disabled unless configured.
+profiler = SlowCallProfiler()
+profiler.configure_from_env()
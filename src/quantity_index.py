@@ -0,0 +1,103 @@
+from typing import Dict, List, Optional
+
+from .models import Ontology, QuantityType
+
+# Fields a variant takes from its nearest ancestor when it does not declare them itself.
+INHERITED_FIELDS = ('unit', 'category', 'valid_range', 'requires', 'source')
+
+
+class IndexedQuantityType:
+    """A quantity type or nested variant with its path, parent and inherited fields resolved."""
+
+    __slots__ = ('name', 'path', 'parent', 'depth', 'quantity_type', 'resolved', 'inherited_fields')
+
+    def __init__(self, name: str, path: str, parent: Optional['IndexedQuantityType'], quantity_type: QuantityType):
+        self.name = name
+        self.path = path
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent else 0
+        self.quantity_type = quantity_type
+        self.inherited_fields: List[str] = []
+        self.resolved: Dict[str, object] = {}
+        for field in INHERITED_FIELDS:
+            value = getattr(quantity_type, field)
+            if value is None and parent is not None and parent.resolved.get(field) is not None:
+                value = parent.resolved[field]
+                self.inherited_fields.append(field)
+            self.resolved[field] = value
+
+    @property
+    def unit(self) -> Optional[str]:
+        return self.resolved['unit']
+
+    @property
+    def valid_range(self) -> Optional[List[float]]:
+        return self.resolved['valid_range']
+
+    def to_dict(self) -> dict:
+        """The quantity type's definition with inherited fields filled in."""
+        definition = self.quantity_type.dict()
+        definition.update({k: v for k, v in self.resolved.items() if v is not None})
+        definition['path'] = self.path
+        definition['parent'] = self.parent.name if self.parent else None
+        if self.inherited_fields:
+            definition['inherited_fields'] = list(self.inherited_fields)
+        return definition
+
+
+class QuantityTypeIndex:
+    """
+    Flattens quantity_types and their nested variants, once, into a single lookup table.
+
+    Every entry is addressable by its name (e.g. GeneratorCapacityFactor), its dotted path
+    (e.g. CapacityFactor.GeneratorCapacityFactor) or one of its aliases, so resolving a variant is
+    one dict lookup. Entries keep a pointer to their parent and inherit unset fields from it.
+    """
+
+    def __init__(self, ontology: Ontology):
+        self.entries: Dict[str, IndexedQuantityType] = {}  # path -> entry, parents before children
+        self._lookup: Dict[str, IndexedQuantityType] = {}
+
+        def walk(items: Dict[str, QuantityType], parent: Optional[IndexedQuantityType]):
+            for name, qt in items.items():
+                path = f"{parent.path}.{name}" if parent else name
+                entry = IndexedQuantityType(name, path, parent, qt)
+                self.entries[path] = entry
+                if qt.variants:
+                    walk(qt.variants, entry)
+
+        walk(ontology.quantity_types, None)
+
+        # Paths win over names, names over aliases; the first (shallowest) claim on a key is kept.
+        for entry in self.entries.values():
+            self._lookup[entry.path] = entry
+        for entry in self.entries.values():
+            self._lookup.setdefault(entry.name, entry)
+        for entry in self.entries.values():
+            for alias in entry.quantity_type.aliases or []:
+                self._lookup.setdefault(alias, entry)
+
+    def get(self, name: str) -> Optional[IndexedQuantityType]:
+        """Resolves a quantity type name, dotted variant path or alias."""
+        return self._lookup.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._lookup
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def children(self, name: str) -> List[IndexedQuantityType]:
+        entry = self.get(name)
+        if entry is None:
+            return []
+        return [e for e in self.entries.values() if e.parent is entry]
+
+    def ancestors(self, name: str) -> List[IndexedQuantityType]:
+        """Returns the parent chain of a quantity type, nearest first."""
+        entry = self.get(name)
+        chain = []
+        while entry is not None and entry.parent is not None:
+            entry = entry.parent
+            chain.append(entry)
+        return chain
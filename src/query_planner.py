@@ -0,0 +1,239 @@
+import re
+from typing import Any, Dict, List, Optional, Set
+from .models import Ontology, OperationDefinition
+from .catalog import DataCatalog
+
+_IDENTIFIER = re.compile(r'"[^"]*"|\'[^\']*\'|\b[A-Za-z_][A-Za-z0-9_]*\b')
+
+# Words in operation formulas and filters that are SQL, not column names.
+SQL_WORDS = {
+    'AND', 'OR', 'NOT', 'IN', 'IS', 'NULL', 'LIKE', 'BETWEEN', 'CASE', 'WHEN', 'THEN', 'ELSE', 'END',
+    'SUM', 'AVG', 'MIN', 'MAX', 'COUNT', 'ABS', 'COALESCE', 'NULLIF', 'DISTINCT', 'AS', 'TRUE', 'FALSE',
+}
+
+# Parameters that bound the time range rather than filtering a column by equality.
+TIME_RANGE_PARAMETERS = {'start_time': '>=', 'end_time': '<'}
+
+
+class PlanningError(ValueError):
+    pass
+
+
+def quote_identifier(name: str) -> str:
+    """Quotes an SQL identifier, e.g. Total Sent Out Generation (MWh) -> "Total Sent Out Generation (MWh)"."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+class QueryPlan:
+    def __init__(self, sql: str, parameters: List[Any], tables: List[str], warnings: Optional[List[str]] = None):
+        self.sql = sql
+        self.parameters = parameters
+        self.tables = tables
+        self.warnings = list(warnings or [])
+
+    def to_dict(self) -> dict:
+        return {"sql": self.sql, "parameters": self.parameters, "tables": self.tables, "warnings": self.warnings}
+
+
+class _TableScan:
+    """One catalog table participating in a plan, with the columns and filters pushed down to it."""
+
+    def __init__(self, table: str, columns: Dict[str, str], unique_keys: List[Set[str]]):
+        self.table = table
+        self.columns = columns  # logical -> physical
+        self.unique_keys = unique_keys  # sets of logical column names
+        self.alias = ""
+        self.needed: List[str] = []
+        self.predicates: List[str] = []
+        self.parameters: List[Any] = []
+
+    def need(self, column: str):
+        if column not in self.needed:
+            self.needed.append(column)
+
+    def grain(self) -> int:
+        return max((len(k) for k in self.unique_keys), default=0)
+
+
+class QueryPlanner:
+    """
+    Compiles an OperationDefinition into a single SQL query over the physical tables in the catalog.
+
+    - `required_inputs` ("table.column") select the tables to scan.
+    - Filters and column parameters are pushed down into the scan of the table they reference;
+      each scan projects only the columns the query needs.
+    - The table with the finest declared unique grain drives the query. Tables whose unique key is
+      covered by the join keys (at most one row per driving row) are joined before the rest.
+    - Every identifier is double-quoted, so physical names such as "Total Sent Out Generation (MWh)" work.
+    """
+
+    def __init__(self, ontology: Ontology):
+        self.ontology = ontology
+        self.catalog = DataCatalog(ontology)
+
+    def plan(self, operation: str, params: Optional[Dict[str, Any]] = None,
+             bindings: Optional[Dict[str, str]] = None) -> QueryPlan:
+        """
+        Args:
+            operation: Name of an operation in the ontology.
+            params: Values for columns (equality filters) or start_time/end_time (timestamp range).
+            bindings: Maps names used by the operation that are not columns (e.g. time_period)
+                to a logical column (e.g. {"time_period": "timestamp"}).
+        """
+        if operation not in self.ontology.operations:
+            raise PlanningError(f"Operation '{operation}' not found.")
+        op_def = self.ontology.operations[operation]
+        params = params or {}
+        bindings = bindings or {}
+        warnings = []
+
+        scans = self._scans_for_inputs(op_def)
+        join_keys = [c['field'] for c in (op_def.join_conditions or [])]
+        driver, joined = self._order_joins(scans, join_keys)
+        for i, scan in enumerate([driver] + joined):
+            scan.alias = f"t{i}"
+
+        def resolve(name: str) -> _TableScan:
+            column = bindings.get(name, name)
+            owners = [s for s in scans if column in s.columns]
+            if not owners:
+                raise PlanningError(
+                    f"'{name}' is not a column of {[s.table for s in scans]}. Provide a binding for it.")
+            if column in join_keys or len(owners) == 1:
+                return driver if driver in owners else owners[0]
+            raise PlanningError(f"Column '{name}' is ambiguous between {[s.table for s in owners]}.")
+
+        # Join keys are needed on every side of the join
+        for key in join_keys:
+            for scan in scans:
+                if key not in scan.columns:
+                    raise PlanningError(f"Join key '{key}' is not a column of '{scan.table}'.")
+                scan.need(key)
+
+        # Push filters down to the single table they reference
+        for condition in op_def.filters or []:
+            names = self._identifiers(condition)
+            owners = {resolve(n).table for n in names}
+            if len(owners) != 1:
+                raise PlanningError(f"Filter '{condition}' must reference exactly one table.")
+            scan = resolve(names[0])
+            scan.predicates.append(self._rewrite(condition, lambda n: quote_identifier(scan.columns[bindings.get(n, n)])))
+
+        for name, value in params.items():
+            if name in TIME_RANGE_PARAMETERS:
+                owners = [s for s in scans if 'timestamp' in s.columns]
+                column, operator = 'timestamp', TIME_RANGE_PARAMETERS[name]
+            else:
+                owners = [s for s in scans if name in s.columns]
+                column, operator = name, '='
+            if not owners:
+                warnings.append(f"Parameter '{name}' ignored: not a column of the operation's tables.")
+                continue
+            # Join keys are equal on every side of the join, so the predicate applies to every scan
+            if column not in join_keys:
+                owners = [driver if driver in owners else owners[0]]
+            for scan in owners:
+                scan.predicates.append(f"{quote_identifier(scan.columns[column])} {operator} ?")
+                scan.parameters.append(value)
+                scan.need(column)
+
+        # Output columns
+        aggregation = op_def.aggregation or {}
+        group_by = aggregation.get('group_by', [])
+        select = []
+        group_exprs = []
+        for name in group_by:
+            scan = resolve(name)
+            column = bindings.get(name, name)
+            scan.need(column)
+            expr = f"{scan.alias}.{quote_identifier(scan.columns[column])}"
+            select.append(f"{expr} AS {quote_identifier(name)}")
+            group_exprs.append(expr)
+
+        formula = aggregation.get('formula')
+        if formula:
+            def qualify(name):
+                scan = resolve(name)
+                column = bindings.get(name, name)
+                scan.need(column)
+                return f"{scan.alias}.{quote_identifier(scan.columns[column])}"
+            select.append(f"{self._rewrite(formula, qualify)} AS {quote_identifier('value')}")
+        else:
+            for scan in scans:
+                for column in scan.needed:
+                    select.append(f"{scan.alias}.{quote_identifier(scan.columns[column])} AS {quote_identifier(column)}")
+
+        # Render: one CTE per table scan, then the join
+        ctes = []
+        parameters: List[Any] = []
+        for scan in [driver] + joined:
+            projection = ", ".join(quote_identifier(scan.columns[c]) for c in scan.needed)
+            cte = f"{scan.alias} AS (SELECT {projection} FROM {quote_identifier(scan.table)}"
+            if scan.predicates:
+                cte += " WHERE " + " AND ".join(scan.predicates)
+            ctes.append(cte + ")")
+            parameters.extend(scan.parameters)
+
+        sql = "WITH " + ",\n     ".join(ctes)
+        sql += "\nSELECT " + ", ".join(select)
+        sql += f"\nFROM {driver.alias}"
+        for scan in joined:
+            on = " AND ".join(
+                f"{driver.alias}.{quote_identifier(driver.columns[k])} = {scan.alias}.{quote_identifier(scan.columns[k])}"
+                for k in join_keys
+            )
+            sql += f"\nJOIN {scan.alias} ON {on}" if on else f"\nCROSS JOIN {scan.alias}"
+        if formula and group_exprs:
+            sql += "\nGROUP BY " + ", ".join(group_exprs)
+
+        return QueryPlan(sql, parameters, [s.table for s in [driver] + joined], warnings)
+
+    def _scans_for_inputs(self, op_def: OperationDefinition) -> List[_TableScan]:
+        scans: Dict[str, _TableScan] = {}
+        unsupported = []
+        for required in op_def.required_inputs:
+            table, _, column = required.partition('.')
+            columns = self.catalog.get_columns(table)
+            if not column or columns is None or column not in columns:
+                unsupported.append(required)
+                continue
+            if table not in scans:
+                physical_to_logical = {p: l for l, p in columns.items()}
+                unique_keys = [
+                    {physical_to_logical.get(c, c) for c in constraint['unique']}
+                    for constraint in self.catalog.tables[table].constraints if 'unique' in constraint
+                ]
+                scans[table] = _TableScan(table, columns, unique_keys)
+            scans[table].need(column)
+        if unsupported:
+            raise PlanningError(f"Inputs not available in the data catalog: {unsupported}")
+        return list(scans.values())
+
+    @staticmethod
+    def _order_joins(scans: List[_TableScan], join_keys: List[str]):
+        # The finest-grained table drives; lookups (unique key covered by the join) come next.
+        ordered = sorted(scans, key=lambda s: -s.grain())
+        driver, rest = ordered[0], ordered[1:]
+        keys = set(join_keys)
+        lookups = [s for s in rest if any(k <= keys for k in s.unique_keys)]
+        others = [s for s in rest if s not in lookups]
+        return driver, lookups + others
+
+    @staticmethod
+    def _identifiers(expression: str) -> List[str]:
+        names = []
+        for token in _IDENTIFIER.findall(expression):
+            if token[0] in '"\'' or token.upper() in SQL_WORDS:
+                continue
+            if token not in names:
+                names.append(token)
+        return names
+
+    @staticmethod
+    def _rewrite(expression: str, replace) -> str:
+        def substitute(match):
+            token = match.group(0)
+            if token[0] in '"\'' or token.upper() in SQL_WORDS:
+                return token
+            return replace(token)
+        return _IDENTIFIER.sub(substitute, expression)
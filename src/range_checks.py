@@ -0,0 +1,104 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .models import Ontology
+from .quantity_index import IndexedQuantityType, QuantityTypeIndex
+from .units import UnitSystem
+
+
+class RangeCheckError(ValueError):
+    pass
+
+
+def as_float_array(values) -> np.ndarray:
+    """
+    Returns a float64 view of a NumPy array, or converts Arrow arrays / sequences.
+    Arrow nulls become NaN. float64 NumPy input is used as-is, without a copy.
+    """
+    if isinstance(values, np.ndarray):
+        return values if values.dtype == np.float64 else values.astype(np.float64)
+    if hasattr(values, 'to_numpy'):
+        try:
+            values = values.to_numpy(zero_copy_only=False)  # pyarrow Array / ChunkedArray
+        except TypeError:
+            values = values.to_numpy()
+    return np.asarray(values, dtype=np.float64)
+
+
+class RangeCheckResult:
+    def __init__(self, quantity_type: str, valid_range: Tuple[float, float], unit: str,
+                 below: np.ndarray, above: np.ndarray, missing: np.ndarray):
+        self.quantity_type = quantity_type
+        self.valid_range = valid_range
+        self.unit = unit
+        self.below = below
+        self.above = above
+        self.missing = missing
+
+    @property
+    def violations(self) -> np.ndarray:
+        return self.below | self.above
+
+    def summary(self) -> Dict[str, object]:
+        below = int(np.count_nonzero(self.below))
+        above = int(np.count_nonzero(self.above))
+        return {
+            "quantity_type": self.quantity_type,
+            "valid_range": list(self.valid_range),
+            "unit": self.unit,
+            "total": int(self.below.size),
+            "below": below,
+            "above": above,
+            "missing": int(np.count_nonzero(self.missing)),
+            "violations": below + above,
+        }
+
+
+class RangeChecker:
+    """
+    Vectorized enforcement of QuantityType.valid_range over measurement arrays.
+
+    Quantity types are resolved by name, alias or variant name. When values arrive in a different
+    (compatible) unit, the two range bounds are converted instead of the values, so the check is
+    a pair of comparisons over the input array with no conversion copy.
+    """
+
+    def __init__(self, ontology: Ontology, units: Optional[UnitSystem] = None,
+                 quantity_index: Optional[QuantityTypeIndex] = None):
+        self.ontology = ontology
+        self.units = units or UnitSystem(ontology)
+        self.quantity_index = quantity_index or QuantityTypeIndex(ontology)
+
+    def resolve(self, name: str) -> IndexedQuantityType:
+        entry = self.quantity_index.get(name)
+        if entry is None:
+            raise RangeCheckError(f"Quantity type '{name}' not found (checked names, variants and aliases).")
+        return entry
+
+    def check(self, quantity_type: str, values, unit: Optional[str] = None) -> RangeCheckResult:
+        """
+        Flags values outside the quantity type's valid_range.
+
+        Args:
+            quantity_type: Quantity type name, alias, variant name or dotted variant path.
+            values: NumPy array, Arrow array or sequence of numbers.
+            unit: Unit of `values`, if different from the quantity type's unit.
+        """
+        entry = self.resolve(quantity_type)
+        name = entry.name
+        if not entry.valid_range or len(entry.valid_range) != 2:
+            raise RangeCheckError(f"Quantity type '{name}' does not declare a valid_range.")
+
+        # Ranges on quantity types without a unit (e.g. capacity factors) are ratios
+        declared_unit = entry.unit or "dimensionless"
+        low, high = entry.valid_range
+        if unit and unit != declared_unit:
+            factor = self.units.factor(declared_unit, unit)
+            low, high = low * factor, high * factor
+
+        array = as_float_array(values)
+        below = np.less(array, low)
+        above = np.greater(array, high)
+        missing = np.isnan(array)
+        return RangeCheckResult(name, (low, high), unit or declared_unit, below, above, missing)
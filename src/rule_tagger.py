@@ -0,0 +1,126 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from .fuzzy_index import concept_names
+from .models import Ontology, WEMRule
+
+_TOKEN = re.compile(r'[A-Za-z0-9]+')
+_PARENTHETICAL = re.compile(r'\([^)]*\)')
+
+# Rule fields tagged at load time. Entities are joined with ENTITY_SEPARATOR before tagging.
+TAGGED_FIELDS = ('title', 'content', 'entities')
+ENTITY_SEPARATOR = '; '
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """Splits text into lowercased alphanumeric tokens with their (start, end) offsets."""
+    return [(m.group(0).lower(), m.start(), m.end()) for m in _TOKEN.finditer(text)]
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher over word tokens.
+
+    Patterns are token sequences, so matches always fall on word boundaries ("Load" does not match
+    inside "Loading"). Matching is one pass over the tokens of a text whatever the number of patterns.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, ...]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self.patterns: List[Tuple[str, ...]] = []
+
+        for pattern in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for token in pattern:
+                if token not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][token] = len(self._goto) - 1
+                state = self._goto[state][token]
+            self._output[state].append(len(self.patterns))
+            self.patterns.append(pattern)
+
+        # Breadth-first failure links; each state also emits the patterns of its failure state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0) if state else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def matches(self, tokens: List[Tuple[str, int, int]]) -> Iterator[Tuple[int, int, int]]:
+        """Yields (pattern id, first token index, last token index) for every match."""
+        state = 0
+        for i, (token, _, _) in enumerate(tokens):
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(token, 0)
+            for pattern_id in self._output[state]:
+                yield pattern_id, i - len(self.patterns[pattern_id]) + 1, i
+
+
+class RuleTagIndex:
+    """
+    Concept mentions in WEM Rule text, found once at load time.
+
+    A single Aho-Corasick automaton is built from every concept key, display name, alias and
+    abbreviation; each rule's title, content and entities are then scanned once. Hits keep their
+    character offsets for highlighting, and the reverse concept -> rules map replaces per-concept
+    substring scans of the whole corpus.
+    """
+
+    def __init__(self, ontology: Ontology):
+        self.rules = ontology.wem_rules
+        concepts_by_pattern: Dict[Tuple[str, ...], Set[str]] = {}
+        for name, concept in concept_names(ontology, include_tables=False):
+            # "Network Access Quantity (NAQ)" is matched as "Network Access Quantity"; NAQ is its own name
+            pattern = tuple(token for token, _, _ in tokenize(_PARENTHETICAL.sub(' ', name)))
+            if pattern:
+                concepts_by_pattern.setdefault(pattern, set()).add(concept)
+        self._matcher = AhoCorasick(concepts_by_pattern)
+        self._concepts = [sorted(concepts_by_pattern[p]) for p in self._matcher.patterns]
+
+        self.hits: Dict[str, List[dict]] = {}
+        self._rules_by_concept: Dict[str, List[str]] = {}
+        for rule_id, rule in self.rules.items():
+            hits = self.tag_rule(rule)
+            self.hits[rule_id] = hits
+            for concept in dict.fromkeys(hit["concept"] for hit in hits):
+                self._rules_by_concept.setdefault(concept, []).append(rule_id)
+
+    def tag(self, text: str) -> List[dict]:
+        """Returns concept hits in `text` as {"concept", "start", "end", "text"}."""
+        tokens = tokenize(text)
+        hits = []
+        for pattern_id, first, last in self._matcher.matches(tokens):
+            start, end = tokens[first][1], tokens[last][2]
+            for concept in self._concepts[pattern_id]:
+                hits.append({"concept": concept, "start": start, "end": end, "text": text[start:end]})
+        return hits
+
+    def tag_rule(self, rule: WEMRule) -> List[dict]:
+        hits = []
+        for field in TAGGED_FIELDS:
+            value = getattr(rule, field)
+            text = ENTITY_SEPARATOR.join(value) if field == 'entities' else value
+            for hit in self.tag(text or ''):
+                hit["field"] = field
+                hits.append(hit)
+        return hits
+
+    def rules_for_concept(self, concept_name: str) -> List[str]:
+        """Ids of rules that mention a concept by key, name, alias or abbreviation, in rule order."""
+        return self._rules_by_concept.get(concept_name, [])
+
+    def concepts_for_rule(self, rule_id: str) -> List[str]:
+        return list(dict.fromkeys(hit["concept"] for hit in self.hits.get(rule_id, [])))
@@ -1,9 +1,13 @@
 
 import json
 import os
+import sys
 from typing import Dict, List
+from pydantic import TypeAdapter
 from .models import WEMRule
 
+_RULES_ADAPTER = TypeAdapter(List[WEMRule])
+
 class WEMRulesLoader:
     def __init__(self, rules_path: str):
         self.rules_path = rules_path
@@ -13,33 +17,32 @@ class WEMRulesLoader:
         Load WEM Rules from the JSON file.
         """
         if not os.path.exists(self.rules_path):
-            print(f"Warning: WEM Rules file not found at {self.rules_path}")
+            print(f"Warning: WEM Rules file not found at {self.rules_path}", file=sys.stderr)
             return {}
 
         try:
             with open(self.rules_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            rules = {}
-            for item in data:
-                # Validate and create WEMRule object
-                # We use .get() to handle potential missing fields gracefully, 
-                # though the model defines defaults for lists.
-                rule = WEMRule(
-                    id=item.get("id"),
-                    title=item.get("title", ""),
-                    content=item.get("content", ""),
-                    section=item.get("section", ""),
-                    conditions=item.get("conditions", []),
-                    actions=item.get("actions", []),
-                    entities=item.get("entities", []),
-                    effective_date=item.get("effective_date"),
-                    types=item.get("types", [])
-                )
-                rules[rule.id] = rule
+            # Fill defaults for missing fields, then validate every rule in one bulk call
+            items = [
+                {
+                    "id": item.get("id"),
+                    "title": item.get("title", ""),
+                    "content": item.get("content", ""),
+                    "section": item.get("section", ""),
+                    "conditions": item.get("conditions", []),
+                    "actions": item.get("actions", []),
+                    "entities": item.get("entities", []),
+                    "effective_date": item.get("effective_date"),
+                    "types": item.get("types", []),
+                }
+                for item in data
+            ]
+            rules = {rule.id: rule for rule in _RULES_ADAPTER.validate_python(items)}
             
             return rules
             
         except Exception as e:
-            print(f"Error loading WEM Rules: {e}")
+            print(f"Error loading WEM Rules: {e}", file=sys.stderr)
             return {}
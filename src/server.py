@@ -3,19 +3,67 @@ from .loader import OntologyLoader
 from .validator import Validator
 from .catalog import DataCatalog
 from .catalog import DataCatalog
+from .temporal_index import RuleTemporalIndex, parse_effective_date
+from .clause_index import ClauseIndex
+from .quantity_index import QuantityTypeIndex
+from .fuzzy_index import TrigramIndex
+from .rule_tagger import RuleTagIndex
+from .similarity import SimilarityEngine
+from .ontology_graph import OntologyGraph
+from .derived_quantities import DerivedQuantityGraph
+from .compact import CompactOntology, compact_ontology
+from .metrics import ErrorResult, instrument, registry, timed_phase
+from .profiler import profiler
 import os
-from typing import List
+import sys
+from contextlib import contextmanager
+from typing import Dict, List, Optional
 
 # Initialize components
 ontology_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'ontology')
-loader = OntologyLoader(ontology_dir)
-ontology = loader.get_ontology()
-validator = Validator(ontology)
-catalog = DataCatalog(ontology)
+loader = OntologyLoader(ontology_dir, compact=True)
+
+ontology: CompactOntology
+
+def _init_components(new_ontology):
+    """(Re)builds the ontology and every component derived from it. A pydantic Ontology is compacted first."""
+    global ontology, graph, validator, catalog, rule_index, clause_index, quantity_index, name_index, rule_tags, similarity
+    global derived_graph
+    ontology = new_ontology if isinstance(new_ontology, CompactOntology) else compact_ontology(new_ontology)
+    with timed_phase('index_build'):
+        graph = OntologyGraph(ontology)
+        validator = Validator(ontology, graph)
+        catalog = DataCatalog(ontology)
+        rule_index = RuleTemporalIndex(ontology.wem_rules)
+        clause_index = ClauseIndex(ontology)
+        quantity_index = QuantityTypeIndex(ontology)
+        derived_graph = DerivedQuantityGraph(ontology, quantity_index)
+        name_index = TrigramIndex.from_ontology(ontology)
+        rule_tags = RuleTagIndex(ontology)
+        similarity = SimilarityEngine(ontology)
+    for key, detail in validator.units.inconsistent_formulas().items():
+        print(f"Warning: {key} formula is dimensionally inconsistent: {detail}", file=sys.stderr)
+
+
+@contextmanager
+def override_sections(**sections):
+    """
+    Rebuilds the components with some ontology sections replaced, e.g. `wem_rules=...`, and
+    restores the previous ontology on exit. Yields the overridden ontology.
+    """
+    original = ontology
+    _init_components(original.model_copy(update=sections))
+    try:
+        yield ontology
+    finally:
+        _init_components(original)
+
+_init_components(loader.get_ontology())
 
 mcp = FastMCP("wem-metadata-ontology")
 
 @mcp.tool()
+@instrument
 def get_ontology_version() -> str:
     """
     Returns the current version of the WEM Ontology.
@@ -26,6 +74,7 @@ def get_ontology_version() -> str:
     return "Version information not available."
 
 @mcp.tool()
+@instrument
 def compare_versions(base_ref: str, target_ref: str = "HEAD") -> str:
     """
     Compares two versions of the ontology using git.
@@ -81,13 +130,13 @@ def compare_versions(base_ref: str, target_ref: str = "HEAD") -> str:
             
             for f in files:
                 if not fetch_file(base_ref, f, os.path.join(base_dir, f)):
-                    return f"Error: Could not fetch {f} from {base_ref}"
+                    return ErrorResult(f"Error: Could not fetch {f} from {base_ref}")
             
             try:
                 base_loader = OntologyLoader(base_dir)
                 base_ontology = base_loader.get_ontology()
             except Exception as e:
-                return f"Error loading base ontology from {base_ref}: {e}"
+                return ErrorResult(f"Error loading base ontology from {base_ref}: {e}")
 
             # Load Target Version (if not HEAD, fetch it; if HEAD, use current)
             if target_ref == "HEAD":
@@ -97,12 +146,12 @@ def compare_versions(base_ref: str, target_ref: str = "HEAD") -> str:
                 os.makedirs(target_dir)
                 for f in files:
                     if not fetch_file(target_ref, f, os.path.join(target_dir, f)):
-                        return f"Error: Could not fetch {f} from {target_ref}"
+                        return ErrorResult(f"Error: Could not fetch {f} from {target_ref}")
                 try:
                     target_loader = OntologyLoader(target_dir)
                     target_ontology = target_loader.get_ontology()
                 except Exception as e:
-                    return f"Error loading target ontology from {target_ref}: {e}"
+                    return ErrorResult(f"Error loading target ontology from {target_ref}: {e}")
             
             # Compare
             diff = {
@@ -130,9 +179,42 @@ def compare_versions(base_ref: str, target_ref: str = "HEAD") -> str:
             return json.dumps(diff, indent=2)
             
     except Exception as e:
-        return f"Comparison failed: {str(e)}"
+        return ErrorResult(f"Comparison failed: {str(e)}")
+
+_history_index = None
+
+def _get_history_index():
+    """Builds the git history index on first use, then indexes only new commits."""
+    global _history_index
+    from .history_index import OntologyHistoryIndex
+    if _history_index is None:
+        _history_index = OntologyHistoryIndex(os.path.dirname(ontology_dir))
+    else:
+        _history_index.refresh()
+    return _history_index
 
 @mcp.tool()
+@instrument
+def get_concept_history(concept_name: str, section: Optional[str] = None) -> str:
+    """
+    Returns the git change history of a concept (e.g. when CapacityFactor's definition changed).
+    
+    Args:
+        concept_name: The concept name as it appears in the ontology files.
+        section: Optional ontology section to disambiguate (e.g. "quantity_types").
+        
+    Returns:
+        JSON list of change events (commit, timestamp, subject, section, change), oldest first.
+    """
+    import json
+    try:
+        index = _get_history_index()
+    except Exception as e:
+        return ErrorResult(f"History lookup failed: {str(e)}")
+    return json.dumps(index.history(concept_name, section), indent=2)
+
+@mcp.tool()
+@instrument
 def validate_operation(operation: str, parameters: dict) -> str:
     """
     Validates if an operation with given parameters is semantically valid according to the WEM Ontology.
@@ -144,6 +226,7 @@ def validate_operation(operation: str, parameters: dict) -> str:
         return f"Invalid Operation:\nViolations: {result.violations}\nAlternatives: {result.alternatives}"
 
 @mcp.tool()
+@instrument
 def get_conversion_rule(source_interval: str, target_interval: str) -> str:
     """
     Returns the conversion rule between two interval types.
@@ -151,9 +234,10 @@ def get_conversion_rule(source_interval: str, target_interval: str) -> str:
     for rule in ontology.conversion_rules:
         if rule.source == source_interval and rule.target == target_interval:
             return str(rule.dict())
-    return "No conversion rule found."
+    return ErrorResult("No conversion rule found.")
 
 @mcp.tool()
+@instrument
 def get_table_mapping(concept: str) -> str:
     """
     Returns the physical table mapping for a given ontology concept.
@@ -162,103 +246,315 @@ def get_table_mapping(concept: str) -> str:
     if table:
         columns = catalog.get_columns(table)
         return f"Table: {table}\nColumns: {columns}"
-    return "No table mapping found."
+    return ErrorResult("No table mapping found.")
+
 
 
+def _parse_as_of(as_of: Optional[str]):
+    """Parses an as_of argument. Returns (date or None, error message or None)."""
+    if not as_of:
+        return None, None
+    as_of_date = parse_effective_date(as_of)
+    if as_of_date is None:
+        return None, ErrorResult(f"Invalid as_of date '{as_of}'. Expected ISO format (YYYY-MM-DD).")
+    return as_of_date, None
 
 @mcp.tool()
-def search_wem_rules(query: str) -> str:
+@instrument
+def search_wem_rules(query: str, as_of: Optional[str] = None) -> str:
     """
     Search WEM Rules by title or content.
     Returns a list of matching rules.
+    
+    Args:
+        query: Text to search for in rule titles and content.
+        as_of: Optional ISO date (YYYY-MM-DD). If given, only the version of each
+            clause in force on that date is returned.
     """
     import json
+    as_of_date, error = _parse_as_of(as_of)
+    if error:
+        return error
+
     matches = []
     query_lower = query.lower()
     
     for rule_id, rule in ontology.wem_rules.items():
         if query_lower in rule.title.lower() or query_lower in rule.content.lower():
+            if as_of_date and not rule_index.is_in_force(rule_id, as_of_date):
+                continue
             matches.append(rule.dict())
             
     return json.dumps(matches, indent=2)
 
-def _get_related_rules(concept_name: str) -> List[dict]:
+def _get_related_rule_ids(concept_name: str, as_of=None) -> List[str]:
+    """
+    Helper to find ids of rules related to a concept. If as_of is given, only rules in force on that date.
+    Rules under the concept's referenced clauses are used when available; otherwise rules whose
+    title, content or entities mention the concept (tagged at load time).
+    """
+    rule_ids = clause_index.rules_for_concept(concept_name) or rule_tags.rules_for_concept(concept_name)
+    return [
+        rule_id for rule_id in rule_ids
+        if not as_of or rule_index.is_in_force(rule_id, as_of)
+    ]
+
+def _get_related_rules(concept_name: str, as_of=None) -> List[dict]:
     """Helper to find rules related to a concept."""
-    related = []
-    concept_lower = concept_name.lower()
+    return [ontology.wem_rules[rule_id].dict() for rule_id in _get_related_rule_ids(concept_name, as_of)]
+
+@mcp.tool()
+@instrument
+def get_rule_concepts(rule_id: str) -> str:
+    """
+    Returns the ontology concepts mentioned in a WEM Rule, with character offsets into the
+    rule's title, content or entities for highlighting.
     
-    for rule_id, rule in ontology.wem_rules.items():
-        # Check entities
-        if any(concept_lower in entity.lower() for entity in rule.entities):
-            related.append(rule.dict())
-            continue
-            
-        # Check content
-        if concept_lower in rule.content.lower():
-            related.append(rule.dict())
-            
-    return related
+    Args:
+        rule_id: The WEM Rule id.
+    """
+    import json
+    if rule_id not in ontology.wem_rules:
+        return ErrorResult(f"WEM Rule '{rule_id}' not found.")
+    return json.dumps({
+        "rule_id": rule_id,
+        "concepts": rule_tags.concepts_for_rule(rule_id),
+        "mentions": rule_tags.hits[rule_id],
+    }, indent=2)
 
 @mcp.tool()
-def get_concept_definition(concept_name: str) -> str:
+@instrument
+def find_similar_rules(query: str, limit: int = 10) -> str:
     """
-    Returns the full definition of a concept, including WEM Rules, Wikidata links, and properties.
-    Search order: Market Services, Facility Types, Facility Classes, Technology Types, Quantities.
+    Finds the WEM Rules most similar to a rule or to free text ("more like this"), ranked by
+    TF-IDF cosine similarity of rule titles and content.
+    
+    Args:
+        query: A WEM Rule id, or free text such as a concept description.
+        limit: Maximum number of rules to return.
+    """
+    import json
+    index = similarity.rules
+    if query in index:
+        matches = index.similar_to_document(query, limit)
+    else:
+        matches = index.similar_to_text(query, limit)
+    return json.dumps([
+        {"id": rule_id, "title": ontology.wem_rules[rule_id].title, "score": round(score, 4)}
+        for rule_id, score in matches
+    ], indent=2)
+
+@mcp.tool()
+@instrument
+def find_similar_concepts(query: str, limit: int = 10) -> str:
+    """
+    Finds the concepts most similar to a concept or to free text, ranked by TF-IDF cosine
+    similarity of concept names, descriptions and definitions.
+    
+    Args:
+        query: A concept name, alias or table name, or free text.
+        limit: Maximum number of concepts to return.
     """
     import json
+    index = similarity.concepts
+    resolved_name, _, _ = _find_concept(query)
+    if resolved_name in index:
+        matches = index.similar_to_document(resolved_name, limit)
+    else:
+        matches = index.similar_to_text(query, limit)
+    return json.dumps([{"concept": name, "score": round(score, 4)} for name, score in matches], indent=2)
+
+@mcp.tool()
+@instrument
+def get_clause_references(clause: str, as_of: Optional[str] = None) -> str:
+    """
+    Returns the concepts and WEM Rules under a rule clause, including all sub-clauses.
+    e.g. "Clause 3.9" returns concepts and rules for 3.9, 3.9.2, 3.9.7, ...
     
+    Args:
+        clause: A clause reference such as "Clause 3.9.2" or "Chapter 4".
+        as_of: Optional ISO date (YYYY-MM-DD) to limit rules to those in force on that date.
+    """
+    import json
+    as_of_date, error = _parse_as_of(as_of)
+    if error:
+        return error
+
+    rule_ids = [
+        rule_id for rule_id in clause_index.rules_for_clause(clause)
+        if not as_of_date or rule_index.is_in_force(rule_id, as_of_date)
+    ]
+    result = {
+        "concepts": [
+            {"section": section, "name": name}
+            for section, name in clause_index.concepts_for_clause(clause)
+        ],
+        "wem_rules": rule_ids
+    }
+    return json.dumps(result, indent=2)
+
+def _find_concept(concept_name: str):
+    """
+    Resolves a concept name, table name or alias to its ontology item.
+    Returns (canonical concept name, item, indexed quantity type or None), or (None, None, None)
+    if not found. The indexed entry is the one the lookup resolved to, so duplicate variant names
+    under different parents keep their own definition.
+    """
     # Helper to search by alias
     def find_by_alias(dictionaries):
         for d in dictionaries:
             for name, item in d.items():
                 if hasattr(item, 'aliases') and item.aliases and concept_name in item.aliases:
-                    return item
-        return None
+                    return name, item, quantity_index.get(name) if d is ontology.quantity_types else None
+        return None, None, None
 
-    item = None
-    
     # 1. Direct Lookup
-    if concept_name in ontology.market_services:
-        item = ontology.market_services[concept_name]
-    elif concept_name in ontology.markets:
-        item = ontology.markets[concept_name]
-    elif concept_name in ontology.facility_types:
-        item = ontology.facility_types[concept_name]
-    elif concept_name in ontology.facility_classes:
-        item = ontology.facility_classes[concept_name]
-    elif concept_name in ontology.technology_types:
-        item = ontology.technology_types[concept_name]
-    elif concept_name in ontology.quantity_types:
-        item = ontology.quantity_types[concept_name]
-    
+    for d in [
+        ontology.market_services,
+        ontology.markets,
+        ontology.facility_types,
+        ontology.facility_classes,
+        ontology.technology_types,
+        ontology.quantity_types
+    ]:
+        if concept_name in d:
+            entry = quantity_index.get(concept_name) if d is ontology.quantity_types else None
+            return concept_name, d[concept_name], entry
+
     # 2. Table Name Lookup
-    elif concept_name in ontology.tables:
+    if concept_name in ontology.tables:
         mapped_concept = ontology.tables[concept_name].concept
-        return get_concept_definition(mapped_concept)
-
-    # 3. Alias Lookup
-    if not item:
-        item = find_by_alias([
-            ontology.market_services,
-            ontology.facility_types,
-            ontology.facility_classes,
-            ontology.technology_types,
-            ontology.quantity_types
-        ])
+        return _find_concept(mapped_concept)
+
+    # 3. Quantity variants, dotted variant paths and quantity aliases
+    entry = quantity_index.get(concept_name)
+    if entry:
+        return entry.name, entry.quantity_type, entry
+
+    # 4. Alias Lookup
+    return find_by_alias([
+        ontology.market_services,
+        ontology.facility_types,
+        ontology.facility_classes,
+        ontology.technology_types,
+        ontology.quantity_types
+    ])
+
+@mcp.tool()
+@instrument
+def get_concept_definition(concept_name: str, as_of: Optional[str] = None) -> str:
+    """
+    Returns the full definition of a concept, including WEM Rules, Wikidata links, and properties.
+    Search order: Market Services, Facility Types, Facility Classes, Technology Types, Quantities.
+    If as_of (YYYY-MM-DD) is given, related WEM Rules are limited to those in force on that date.
+    """
+    import json
+    as_of_date, error = _parse_as_of(as_of)
+    if error:
+        return error
+
+    resolved_name, item, entry = _find_concept(concept_name)
 
     if item:
         # Enrich with related rules
-        definition = item.dict()
-        related_rules = _get_related_rules(concept_name)
+        definition = entry.to_dict() if entry else item.dict()
+        node = graph.node_of(item)
+        dangling = graph.dangling_for(node.section, node.name) if node else []
+        if dangling:
+            definition['unresolved_references'] = [ref.to_dict() for ref in dangling]
+        related_rules = _get_related_rules(resolved_name, as_of_date)
         if related_rules:
             definition['related_wem_rules'] = [r['id'] for r in related_rules]
             definition['related_wem_rules_details'] = related_rules[:3] # Limit details to top 3
             
         return json.dumps(definition, indent=2)
 
-    return f"Concept '{concept_name}' not found in ontology (checked names, tables, and aliases)."
+    message = f"Concept '{concept_name}' not found in ontology (checked names, tables, and aliases)."
+    suggestions = _suggest_concepts(concept_name)
+    if suggestions:
+        message += f" Did you mean: {', '.join(suggestions)}?"
+    return ErrorResult(message)
+
+def _suggest_concepts(concept_name: str, limit: int = 5) -> List[str]:
+    """Helper returning close matches for a name that did not resolve, best first."""
+    return [match["concept"] for match in name_index.search(concept_name, limit=limit)]
+
+def _get_conversion_paths(concept_name: str, item) -> List[dict]:
+    """Helper to find conversion rules touching the intervals a concept is defined on."""
+    intervals = set()
+    if concept_name in ontology.interval_types:
+        intervals.add(concept_name)
+    node = graph.node_of(item)
+    if node:
+        for field in ['dispatch_interval', 'pricing_interval', 'settlement_interval', 'granularity']:
+            intervals.update(target.name for target in node.linked(field))
+    return [
+        rule.dict() for rule in ontology.conversion_rules
+        if rule.source in intervals or rule.target in intervals
+    ]
 
 @mcp.tool()
+@instrument
+def resolve_concepts(names: List[str], as_of: Optional[str] = None) -> str:
+    """
+    Resolves many concepts in one call. Each name may be a concept name, alias or table name.
+    For each name returns its definition, physical table mapping and interval conversion rules.
+    Related WEM Rule details are returned once in a shared `wem_rules` map and referenced by id.
+    Names that do not resolve are listed in `not_found`, with close matches under `suggestions`.
+    
+    Args:
+        names: Concept names, aliases or table names.
+        as_of: Optional ISO date (YYYY-MM-DD) to limit related rules to those in force on that date.
+    """
+    import json
+    as_of_date, error = _parse_as_of(as_of)
+    if error:
+        return error
+
+    result = {"concepts": {}, "not_found": [], "suggestions": {}, "wem_rules": {}}
+    related_cache = {}
+
+    for name in names:
+        if name in result["concepts"] or name in result["not_found"]:
+            continue
+
+        resolved_name, item, entry = _find_concept(name)
+        if not item:
+            result["not_found"].append(name)
+            suggestions = _suggest_concepts(name)
+            if suggestions:
+                result["suggestions"][name] = suggestions
+            continue
+
+        definition = entry.to_dict() if entry else item.dict()
+        if resolved_name not in related_cache:
+            related_cache[resolved_name] = _get_related_rule_ids(resolved_name, as_of_date)
+        related_ids = related_cache[resolved_name]
+        if related_ids:
+            definition['related_wem_rules'] = related_ids
+            for rule_id in related_ids[:3]: # Limit details to top 3 per concept
+                if rule_id not in result["wem_rules"]:
+                    result["wem_rules"][rule_id] = ontology.wem_rules[rule_id].dict()
+
+        if name in ontology.tables:
+            table = name
+        else:
+            table = catalog.get_table_for_concept(resolved_name)
+        table_mapping = None
+        if table:
+            table_mapping = {"table": table, "columns": catalog.get_columns(table)}
+
+        result["concepts"][name] = {
+            "resolved_as": resolved_name,
+            "definition": definition,
+            "table_mapping": table_mapping,
+            "conversion_rules": _get_conversion_paths(resolved_name, item)
+        }
+
+    return json.dumps(result, indent=2)
+
+@mcp.tool()
+@instrument
 def list_concepts() -> str:
     """
     Returns a hierarchical view of the ontology concepts.
@@ -284,6 +580,153 @@ def list_concepts() -> str:
     return json.dumps(structure, indent=2)
 
 @mcp.tool()
+@instrument
+def plan_operation_sql(operation: str, parameters: Optional[dict] = None, bindings: Optional[dict] = None) -> str:
+    """
+    Compiles a standard operation into a single SQL query over the physical tables in the data catalog.
+    Filters are pushed down to the tables they reference and identifiers are quoted.
+    
+    Args:
+        operation: Operation name (see get_operation_definition).
+        parameters: Column values (e.g. {"facility": "GEN1"}) or start_time/end_time, bound as `?` placeholders.
+        bindings: Maps non-column names used by the operation to a column (e.g. {"time_period": "timestamp"}).
+        
+    Returns:
+        JSON with the SQL text, its positional parameters, the tables scanned (in join order) and warnings.
+    """
+    import json
+    from .query_planner import QueryPlanner, PlanningError
+    try:
+        plan = QueryPlanner(ontology).plan(operation, parameters, bindings)
+    except PlanningError as e:
+        return ErrorResult(f"Cannot plan operation: {str(e)}")
+    return json.dumps(plan.to_dict(), indent=2)
+
+@mcp.tool()
+@instrument
+def get_unit_report() -> str:
+    """
+    Returns the ontology's units with their dimensions, any units that could not be parsed,
+    and the dimensional consistency check of every formula (consistent, inconsistent, derived or unresolved).
+    """
+    import json
+    return json.dumps({
+        "units": validator.units.describe(),
+        "unknown_units": validator.units.unknown_units,
+        "formulas": validator.units.formula_report
+    }, indent=2)
+
+@mcp.tool()
+@instrument
+def check_value_range(quantity_type: str, values: List[float], unit: Optional[str] = None) -> str:
+    """
+    Checks values against a quantity type's valid_range (e.g. CapacityFactor variants, RoundTripEfficiency).
+    The quantity type may be given by name, alias or variant name.
+    
+    Args:
+        quantity_type: Quantity type to check against.
+        values: The values to check.
+        unit: Unit of the values if different from the quantity type's (e.g. "%").
+        
+    Returns:
+        JSON summary counts and the indices of up to 100 violating values.
+    """
+    import json
+    import numpy as np
+    from .range_checks import RangeChecker, RangeCheckError
+    from .units import UnitError
+    try:
+        result = RangeChecker(ontology, validator.units, quantity_index).check(quantity_type, values, unit)
+    except (RangeCheckError, UnitError) as e:
+        return ErrorResult(f"Cannot check values: {str(e)}")
+    summary = result.summary()
+    summary["violation_indices"] = np.flatnonzero(result.violations)[:100].tolist()
+    return json.dumps(summary, indent=2)
+
+@mcp.tool()
+@instrument
+def evaluate_derived_quantities(targets: List[str], inputs: Dict[str, List[float]]) -> str:
+    """
+    Computes derived quantities (e.g. DurationRating, EquivalentFullCycles, GeneratorCapacityFactor)
+    from their formulas for a whole fleet at once. Only the formulas the targets need are evaluated.
+    
+    Args:
+        targets: Quantities to compute, by name, alias or variant name.
+        inputs: Input arrays by name, one value per facility (e.g. {"EnergyCapacity": [100, 200],
+            "NameplateCapacity": [50, 100]}). A single value applies to every facility.
+        
+    Returns:
+        JSON with each target's values and the evaluation order, or the inputs that are missing.
+    """
+    import json
+    import numpy as np
+    from .derived_quantities import DerivationError
+    try:
+        plan = derived_graph.plan(targets, inputs)
+        values = derived_graph.evaluate(targets, inputs)
+    except DerivationError as e:
+        return ErrorResult(f"Cannot evaluate: {str(e)}")
+    return json.dumps({
+        "values": {name: np.where(np.isfinite(v), v, None).tolist() for name, v in values.items()},
+        "steps": plan["steps"],
+        "inputs_used": plan["inputs"],
+    }, indent=2)
+
+@mcp.tool()
+@instrument
+def get_server_metrics(format: str = "json") -> str:
+    """
+    Returns server diagnostics: per-tool call counts, errors, latency and response size histograms,
+    and ontology load phase timings.
+    
+    Args:
+        format: "json" (default) or "prometheus" for the Prometheus text exposition format.
+    """
+    import json
+    if format == "prometheus":
+        return registry.to_prometheus()
+    return json.dumps(registry.to_dict(), indent=2)
+
+@mcp.tool()
+@instrument
+def get_reference_report() -> str:
+    """
+    Returns the cross-references between concepts that do not resolve, e.g. a market service whose
+    pricing_interval is not a defined interval type, grouped by the unresolved name.
+    """
+    import json
+    return json.dumps(graph.dangling_report(), indent=2)
+
+@mcp.tool()
+@instrument
+def get_memory_report() -> str:
+    """
+    Returns the approximate memory used by each section of the loaded ontology, in bytes,
+    and whether the compact (read-only, interned) representation is in use.
+    """
+    import json
+    from .compact import memory_report
+    return json.dumps({"compact": isinstance(ontology, CompactOntology), "sections": memory_report(ontology)},
+                      indent=2)
+
+@mcp.tool()
+@instrument
+def get_slow_call_profiles(limit: int = 10) -> str:
+    """
+    Returns stack-sampled profiles of recent tool calls slower than the configured threshold,
+    most recent first, with their (redacted) arguments.
+    Profiling is enabled by setting WEM_SLOW_CALL_THRESHOLD_MS.
+    """
+    import json
+    if not profiler.enabled:
+        return "Slow-call profiling is disabled. Set WEM_SLOW_CALL_THRESHOLD_MS to enable it."
+    return json.dumps({
+        "threshold_ms": profiler.threshold_ms,
+        "profiles": profiler.recent(limit)
+    }, indent=2)
+
+@mcp.tool()
+@instrument
 def get_guidelines() -> str:
     """
     Returns guiding notes for AI agents on how to use this ontology correctly.
@@ -300,17 +743,48 @@ def get_guidelines() -> str:
     4. **Lookup Flexibility**: You can look up concepts by **Concept Name**, **Table Name** (e.g., `sent_out_data`), or **Alias**.
     5. **Use Tools**:
         - `get_concept_definition(name)`: Get full definition and rules.
+        - `resolve_concepts(names)`: Resolve many concepts, tables and aliases in one call.
         - `get_operation_definition(name)`: Get standard calculation patterns.
         - `validate_operation(op, params)`: Pre-validate your logic.
     """
 @mcp.tool()
+@instrument
 def get_operation_definition(operation_name: str) -> str:
     """
     Returns the definition of a standard operation, including required inputs and validation rules.
     """
     if operation_name in ontology.operations:
         return str(ontology.operations[operation_name].dict())
-    return f"Operation '{operation_name}' not found. Available operations: {list(ontology.operations.keys())}"
+    return ErrorResult(f"Operation '{operation_name}' not found. Available operations: {list(ontology.operations.keys())}")
+
+def main(argv=None):
+    import argparse
+    from .http_transport import (DEFAULT_HOST, DEFAULT_KEEP_ALIVE, DEFAULT_PER_CLIENT_LIMIT, DEFAULT_PORT,
+                                 HTTP_TRANSPORTS, serve)
+    parser = argparse.ArgumentParser(description="WEM metadata ontology MCP server")
+    parser.add_argument("--transport", choices=("stdio",) + HTTP_TRANSPORTS,
+                        default=os.environ.get("WEM_TRANSPORT", "stdio"),
+                        help="stdio (one process per session) or a long-running HTTP transport")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--per-client-limit", type=int, default=DEFAULT_PER_CLIENT_LIMIT,
+                        help="Concurrent requests allowed per client session (streamable-http only)")
+    parser.add_argument("--keep-alive", type=int, default=DEFAULT_KEEP_ALIVE,
+                        help="Seconds an idle HTTP connection is kept open")
+    parser.add_argument("--allowed-host", action="append", default=[], dest="allowed_hosts",
+                        help="Host name clients may use to reach the HTTP server, e.g. ontology.example.com "
+                             "or ontology.example.com:8000 (repeatable; loopback names and --host are always allowed)")
+    args = parser.parse_args(argv)
+
+    metrics_file = os.environ.get("WEM_METRICS_FILE")
+    if metrics_file:
+        import atexit
+        atexit.register(registry.write_prometheus, metrics_file)
+    if args.transport == "stdio":
+        mcp.run()
+    else:
+        serve(mcp, args.transport, args.host, args.port, args.per_client_limit, args.keep_alive,
+              allowed_hosts=args.allowed_hosts)
 
 if __name__ == "__main__":
-    mcp.run()
+    main()
@@ -0,0 +1,163 @@
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .models import Ontology
+
+_WORD = re.compile(r'[a-z0-9]+')
+_CAMEL = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+
+# Common words carrying no signal in rule text
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has in is it its may must of on or that the this to which with".split())
+
+
+def analyze(text: str) -> List[str]:
+    """Splits CamelCase, lowercases and drops stop words: "ContingencyRaise service" -> [contingency, raise, service]."""
+    return [w for w in _WORD.findall(_CAMEL.sub(' ', text or '').lower()) if w not in STOP_WORDS and len(w) > 1]
+
+
+class CSRMatrix:
+    """Compressed sparse row matrix in the scipy.sparse layout (indptr, indices, data)."""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, shape: Tuple[int, int]):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    def row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def transpose(self) -> 'CSRMatrix':
+        """Returns the transpose, also as CSR (i.e. this matrix in CSC layout)."""
+        n_rows, n_cols = self.shape
+        rows = np.repeat(np.arange(n_rows, dtype=np.int32), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind='stable')
+        indptr = np.zeros(n_cols + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=n_cols), out=indptr[1:])
+        return CSRMatrix(indptr, rows[order], self.data[order], (n_cols, n_rows))
+
+    def dot_sparse(self, indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Computes this.T @ v for a sparse vector v over this matrix's rows; use on the transposed matrix."""
+        if len(indices) == 0:
+            return np.zeros(self.shape[1])
+        starts, ends = self.indptr[indices], self.indptr[indices + 1]
+        lengths = ends - starts
+        positions = np.repeat(starts - np.cumsum(np.r_[0, lengths[:-1]]), lengths) + np.arange(lengths.sum())
+        weights = self.data[positions] * np.repeat(values, lengths)
+        return np.bincount(self.indices[positions], weights=weights, minlength=self.shape[1])
+
+
+class TfidfIndex:
+    """
+    L2-normalised TF-IDF vectors (sublinear tf, smoothed idf) for a set of documents.
+
+    Documents are stored as a CSR matrix (one row per document) plus its transpose, so the
+    similarity of a query to every document is one gather over the query terms' postings and one
+    bincount, and top-k is an argpartition over the scores.
+    """
+
+    def __init__(self, documents: Dict[str, str]):
+        self.ids: List[str] = list(documents)
+        self._positions = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        self.vocabulary: Dict[str, int] = {}
+
+        indptr = [0]
+        indices: List[int] = []
+        counts: List[int] = []
+        for doc_id in self.ids:
+            terms: Dict[int, int] = {}
+            for word in analyze(documents[doc_id]):
+                term = self.vocabulary.setdefault(word, len(self.vocabulary))
+                terms[term] = terms.get(term, 0) + 1
+            indices.extend(terms)
+            counts.extend(terms.values())
+            indptr.append(len(indices))
+
+        n_docs, n_terms = len(self.ids), len(self.vocabulary)
+        indptr = np.array(indptr, dtype=np.int64)
+        indices = np.array(indices, dtype=np.int32)
+        df = np.bincount(indices, minlength=n_terms)
+        self.idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+        data = (1.0 + np.log(np.array(counts, dtype=np.float64))) * self.idf[indices]
+        rows = np.repeat(np.arange(n_docs), np.diff(indptr))
+        norms = np.sqrt(np.bincount(rows, weights=data ** 2, minlength=n_docs))
+        data /= norms[rows]
+
+        self.matrix = CSRMatrix(indptr, indices, data, (n_docs, n_terms))
+        self._by_term = self.matrix.transpose()
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._positions
+
+    def vectorize(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """TF-IDF vector of free text as (term indices, weights); unknown words are ignored."""
+        terms: Dict[int, int] = {}
+        for word in analyze(text):
+            if word in self.vocabulary:
+                term = self.vocabulary[word]
+                terms[term] = terms.get(term, 0) + 1
+        indices = np.array(list(terms), dtype=np.int64)
+        values = (1.0 + np.log(np.array(list(terms.values()), dtype=np.float64))) * self.idf[indices]
+        norm = math.sqrt(float(values @ values)) if len(values) else 1.0
+        return indices, values / norm
+
+    def similar(self, indices: np.ndarray, values: np.ndarray, k: int = 10,
+                exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Top-k documents by cosine similarity to a TF-IDF vector."""
+        scores = self._by_term.dot_sparse(np.asarray(indices, dtype=np.int64), values)
+        if exclude in self._positions:
+            scores[self._positions[exclude]] = 0.0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(self.ids[i], float(scores[i])) for i in ranked]
+
+    def similar_to_text(self, text: str, k: int = 10) -> List[Tuple[str, float]]:
+        return self.similar(*self.vectorize(text), k=k)
+
+    def similar_to_document(self, doc_id: str, k: int = 10) -> List[Tuple[str, float]]:
+        indices, values = self.matrix.row(self._positions[doc_id])
+        return self.similar(indices, values, k=k, exclude=doc_id)
+
+
+def concept_documents(ontology: Ontology) -> Dict[str, str]:
+    """Text describing each concept: its key, display name, description, definition and interpretation."""
+    documents: Dict[str, str] = {}
+    sections = [ontology.market_services, ontology.markets, ontology.facility_types,
+                ontology.facility_classes, ontology.capability_classes, ontology.technology_types]
+
+    def add(key, item):
+        parts = [key] + [str(getattr(item, field, None) or '')
+                         for field in ('name', 'description', 'definition', 'interpretation', 'function', 'category')]
+        documents.setdefault(key, ' '.join(p for p in parts if p))
+
+    for section in sections:
+        for key, item in section.items():
+            add(key, item)
+
+    def walk(items):
+        for key, qt in items.items():
+            add(key, qt)
+            if qt.variants:
+                walk(qt.variants)
+    walk(ontology.quantity_types)
+    return documents
+
+
+class SimilarityEngine:
+    """TF-IDF indexes over WEM Rules (title and content) and concept descriptions."""
+
+    def __init__(self, ontology: Ontology):
+        self.ontology = ontology
+        self.rules = TfidfIndex({rule_id: f"{rule.title} {rule.content}" for rule_id, rule in ontology.wem_rules.items()})
+        self.concepts = TfidfIndex(concept_documents(ontology))
@@ -0,0 +1,90 @@
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from .models import WEMRule
+
+# Undated rules are treated as having always been in force.
+UNDATED = date.min
+
+# Separates a rule's clause number from its version tag, e.g. "3.9.2@2023".
+VERSION_SEPARATOR = '@'
+
+
+def parse_effective_date(value: Optional[str]) -> Optional[date]:
+    """
+    Parse an ISO date (or datetime) string into a date.
+    Returns None if the value is empty or not a valid ISO date.
+    """
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value).strip()[:10])
+    except ValueError:
+        return None
+
+
+def clause_key(rule: WEMRule) -> str:
+    """
+    The clause a rule version belongs to: its id without the version tag.
+    e.g. "3.9.2@2023" -> "3.9.2". The section is not used, since it groups many distinct clauses.
+    """
+    return rule.id.split(VERSION_SEPARATOR, 1)[0]
+
+
+class RuleTemporalIndex:
+    """
+    Sorted index of WEM Rule versions by effective date, per clause.
+
+    Each clause keeps its versions ordered by effective date so the version
+    in force on a given date is found by binary search.
+    """
+
+    def __init__(self, wem_rules: Dict[str, WEMRule]):
+        self._dates: Dict[str, List[date]] = {}
+        self._rule_ids: Dict[str, List[str]] = {}
+        self._clause_of: Dict[str, str] = {}
+
+        versions: Dict[str, List[Tuple[date, str]]] = {}
+        for rule_id, rule in wem_rules.items():
+            key = clause_key(rule)
+            effective = parse_effective_date(rule.effective_date) or UNDATED
+            versions.setdefault(key, []).append((effective, rule_id))
+            self._clause_of[rule_id] = key
+
+        for key, entries in versions.items():
+            entries.sort()
+            self._dates[key] = [d for d, _ in entries]
+            self._rule_ids[key] = [r for _, r in entries]
+
+    def clauses(self) -> List[str]:
+        return list(self._rule_ids.keys())
+
+    def versions(self, clause: str) -> List[str]:
+        """Rule ids for a clause, oldest first."""
+        return list(self._rule_ids.get(clause, []))
+
+    def governing_rule_id(self, clause: str, as_of: date) -> Optional[str]:
+        """Returns the id of the version of `clause` in force on `as_of`, if any."""
+        dates = self._dates.get(clause)
+        if not dates:
+            return None
+        pos = bisect_right(dates, as_of)
+        if pos == 0:
+            return None
+        return self._rule_ids[clause][pos - 1]
+
+    def is_in_force(self, rule_id: str, as_of: date) -> bool:
+        """True if `rule_id` is the governing version of its clause on `as_of`."""
+        clause = self._clause_of.get(rule_id)
+        if clause is None:
+            return False
+        return self.governing_rule_id(clause, as_of) == rule_id
+
+    def rules_in_force(self, as_of: date) -> List[str]:
+        """Returns the governing rule id of every clause on `as_of`."""
+        in_force = []
+        for clause in self._rule_ids:
+            rule_id = self.governing_rule_id(clause, as_of)
+            if rule_id:
+                in_force.append(rule_id)
+        return in_force
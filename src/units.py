@@ -0,0 +1,318 @@
+import ast
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .models import Ontology
+
+# Base dimensions. Every unit is an integer exponent vector over these plus a scale
+# relative to the base units MWh, hour, AUD and one interval.
+DIMENSIONS = ('energy', 'time', 'currency', 'count')
+
+Dims = Tuple[int, ...]
+
+_ENERGY = (1, 0, 0, 0)
+_TIME = (0, 1, 0, 0)
+_POWER = (1, -1, 0, 0)
+_CURRENCY = (0, 0, 1, 0)
+_COUNT = (0, 0, 0, 1)
+_NONE = (0, 0, 0, 0)
+
+# Atomic unit symbols -> (dimensions, scale to base units)
+ATOMS: Dict[str, Tuple[Dims, float]] = {
+    'Wh': (_ENERGY, 1e-6), 'kWh': (_ENERGY, 1e-3), 'MWh': (_ENERGY, 1.0), 'GWh': (_ENERGY, 1e3),
+    'W': (_POWER, 1e-6), 'kW': (_POWER, 1e-3), 'MW': (_POWER, 1.0), 'GW': (_POWER, 1e3),
+    's': (_TIME, 1 / 3600), 'sec': (_TIME, 1 / 3600), 'second': (_TIME, 1 / 3600), 'seconds': (_TIME, 1 / 3600),
+    'min': (_TIME, 1 / 60), 'minute': (_TIME, 1 / 60), 'minutes': (_TIME, 1 / 60),
+    'h': (_TIME, 1.0), 'hr': (_TIME, 1.0), 'hour': (_TIME, 1.0), 'hours': (_TIME, 1.0), 'Time': (_TIME, 1.0),
+    'day': (_TIME, 24.0), 'days': (_TIME, 24.0),
+    'AUD': (_CURRENCY, 1.0), '$': (_CURRENCY, 1.0),
+    'Interval': (_COUNT, 1.0), 'Intervals': (_COUNT, 1.0),
+    'dimensionless': (_NONE, 1.0), 'ratio': (_NONE, 1.0), '1': (_NONE, 1.0), '%': (_NONE, 0.01),
+}
+
+# Measured inputs referenced by formulas that are not themselves quantity types.
+MEASURED_SYMBOLS: Dict[str, str] = {
+    'ActualGeneration': 'MWh',
+    'ActualDischarge': 'MWh',
+    'ActualCharge': 'MWh',
+    'Hours': 'h',
+    'OutageHours': 'h',
+    'TimePeriod': 'h',
+}
+
+
+class UnitError(ValueError):
+    pass
+
+
+def _add(a: Dims, b: Dims, sign: int = 1) -> Dims:
+    return tuple(x + sign * y for x, y in zip(a, b))
+
+
+def _split_atoms(token: str) -> Optional[List[str]]:
+    """Splits a token such as 'MWs' into known atoms ['MW', 's']."""
+    if token in ATOMS:
+        return [token]
+    for i in range(len(token) - 1, 0, -1):
+        if token[:i] in ATOMS:
+            rest = _split_atoms(token[i:])
+            if rest:
+                return [token[:i]] + rest
+    return None
+
+
+def parse_unit(text: str) -> Tuple[Dims, float]:
+    """
+    Parses a unit expression into (dimension vector, scale), e.g.
+    "AUD/MWh" -> ((-1, 0, 1, 0), 1.0), "MW·h" -> ((1, 0, 0, 0), 1.0), "minutes" -> ((0, 1, 0, 0), 1/60).
+    """
+    normalized = text.strip().replace('·', '*').replace(' ', '')
+    if not normalized:
+        return _NONE, 1.0
+    dims, scale = _NONE, 1.0
+    sign = 1
+    token = ''
+    for char in normalized + '*':
+        if char in '*/':
+            if not token:
+                raise UnitError(f"Cannot parse unit '{text}'")
+            exponent = 1
+            if '^' in token:
+                token, power = token.split('^', 1)
+                try:
+                    exponent = int(power)
+                except ValueError:
+                    raise UnitError(f"Exponent '{power}' in '{text}' is not an integer")
+            atoms = _split_atoms(token)
+            if atoms is None:
+                raise UnitError(f"Unknown unit '{token}' in '{text}'")
+            for atom in atoms:
+                atom_dims, atom_scale = ATOMS[atom]
+                dims = _add(dims, tuple(d * exponent for d in atom_dims), sign)
+                scale *= atom_scale ** (exponent * sign)
+            token = ''
+            sign = -1 if char == '/' else 1
+        else:
+            token += char
+    return dims, scale
+
+
+def format_dims(dims: Dims) -> str:
+    if not any(dims):
+        return 'dimensionless'
+    return '·'.join(f"{name}^{power}" if power != 1 else name for name, power in zip(DIMENSIONS, dims) if power)
+
+
+class UnitSystem:
+    """
+    Interned units with precomputed conversion factors, built from an ontology.
+
+    Each distinct unit string gets an integer id, a row in an integer dimension matrix and a scale.
+    The conversion table between every pair of interned units is computed once as a matrix
+    (NaN where dimensions differ), so converting an array is one lookup and one multiply.
+
+    Only the ontology's units are interned, when the system is built. Units arriving with requests
+    are parsed on the fly and never registered, so lookups do not grow or rebuild the table.
+    """
+
+    def __init__(self, ontology: Optional[Ontology] = None):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._dims: List[Dims] = []
+        self._scales: List[float] = []
+        self.unknown_units: Dict[str, str] = {}
+        self._factors: Optional[np.ndarray] = None
+        self.formula_report: Dict[str, dict] = {}
+
+        if ontology is not None:
+            for unit in ontology.units.values():
+                self._try_intern(unit, 'units')
+            for name, qt in self._quantity_types(ontology).items():
+                if qt.unit:
+                    self._try_intern(qt.unit, f"quantity_types.{name}")
+            for rule_name, rule in ontology.unit_validation.items():
+                for input_def in rule.inputs.values():
+                    self._try_intern(input_def['unit'], f"unit_validation.{rule_name}")
+                if 'unit' in rule.output:
+                    self._try_intern(rule.output['unit'], f"unit_validation.{rule_name}")
+            self._build_factors()
+            self.formula_report = self._check_formulas(ontology)
+
+    @staticmethod
+    def _quantity_types(ontology: Ontology) -> dict:
+        found = {}
+
+        def walk(items):
+            for name, qt in items.items():
+                found[name] = qt
+                if qt.variants:
+                    walk(qt.variants)
+
+        walk(ontology.quantity_types)
+        return found
+
+    @staticmethod
+    def _quantity_units(ontology: Ontology) -> Dict[str, Optional[str]]:
+        """Unit of every quantity type, inherited from the nearest ancestor that declares one."""
+        found = {}
+
+        def walk(items, inherited):
+            for name, qt in items.items():
+                found[name] = qt.unit or inherited
+                if qt.variants:
+                    walk(qt.variants, found[name])
+
+        walk(ontology.quantity_types, None)
+        return found
+
+    def _try_intern(self, unit: str, source: str):
+        try:
+            self.intern(unit)
+        except UnitError as e:
+            self.unknown_units[unit] = f"{source}: {e}"
+
+    def intern(self, unit: str) -> int:
+        """Returns the integer id of a unit, parsing and registering it on first use. Build time only."""
+        unit_id = self._ids.get(unit)
+        if unit_id is not None:
+            return unit_id
+        dims, scale = parse_unit(unit)
+        unit_id = len(self._names)
+        self._ids[unit] = unit_id
+        self._names.append(unit)
+        self._dims.append(dims)
+        self._scales.append(scale)
+        self._factors = None
+        return unit_id
+
+    def _build_factors(self):
+        dims = np.array(self._dims, dtype=np.int8).reshape(len(self._dims), len(DIMENSIONS))
+        scales = np.array(self._scales, dtype=np.float64)
+        compatible = (dims[:, None, :] == dims[None, :, :]).all(axis=2)
+        self._factors = np.where(compatible, scales[:, None] / scales[None, :], np.nan)
+
+    def describe(self) -> Dict[str, dict]:
+        """Returns every interned unit with its dimensions and scale to base units."""
+        return {
+            name: {"dimensions": format_dims(dims), "scale": scale}
+            for name, dims, scale in zip(self._names, self._dims, self._scales)
+        }
+
+    def _resolve(self, unit: str) -> Tuple[Dims, float]:
+        """Dimensions and scale of an interned unit, or of any other unit parsed without registering it."""
+        unit_id = self._ids.get(unit)
+        if unit_id is None:
+            return parse_unit(unit)
+        return self._dims[unit_id], self._scales[unit_id]
+
+    def dims(self, unit: str) -> Dims:
+        return self._resolve(unit)[0]
+
+    def compatible(self, source: str, target: str) -> bool:
+        return self.dims(source) == self.dims(target)
+
+    def factor(self, source: str, target: str) -> float:
+        """Multiplier converting values in `source` units to `target` units."""
+        source_id, target_id = self._ids.get(source), self._ids.get(target)
+        if source_id is not None and target_id is not None and self._factors is not None:
+            factor = self._factors[source_id, target_id]
+            if not np.isnan(factor):
+                return float(factor)
+        (source_dims, source_scale), (target_dims, target_scale) = self._resolve(source), self._resolve(target)
+        if source_dims != target_dims:
+            raise UnitError(f"Cannot convert {source} ({format_dims(source_dims)}) "
+                            f"to {target} ({format_dims(target_dims)})")
+        return source_scale / target_scale
+
+    def convert(self, values, source: str, target: str) -> np.ndarray:
+        """Converts an array of values between units in one vectorized multiply."""
+        factor = self.factor(source, target)
+        values = np.asarray(values, dtype=np.float64)
+        return values if factor == 1.0 else values * factor
+
+    def formula_dims(self, formula: str, symbols: Dict[str, str]) -> Dims:
+        """
+        Computes the dimensions of an arithmetic formula whose names have units in `symbols`.
+        Raises UnitError for unknown names or for adding quantities of different dimensions.
+        """
+        def walk(node) -> Dims:
+            if isinstance(node, ast.Expression):
+                return walk(node.body)
+            if isinstance(node, ast.Name):
+                if node.id not in symbols:
+                    raise UnitError(f"Unknown symbol '{node.id}'")
+                return self.dims(symbols[node.id])
+            if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+                return _NONE
+            if isinstance(node, ast.UnaryOp):
+                return walk(node.operand)
+            if isinstance(node, ast.BinOp):
+                left, right = walk(node.left), walk(node.right)
+                if isinstance(node.op, (ast.Add, ast.Sub)):
+                    if left != right:
+                        raise UnitError(f"Cannot add {format_dims(left)} and {format_dims(right)}")
+                    return left
+                if isinstance(node.op, ast.Mult):
+                    return _add(left, right)
+                if isinstance(node.op, ast.Div):
+                    return _add(left, right, -1)
+                if isinstance(node.op, ast.Pow) and isinstance(node.right, ast.Constant):
+                    power = node.right.value
+                    integral = isinstance(power, int) or (isinstance(power, float) and power.is_integer())
+                    if isinstance(power, bool) or not integral:
+                        raise UnitError(f"Exponent {power!r} in formula '{formula}' is not an integer")
+                    return tuple(d * int(power) for d in left)
+            raise UnitError(f"Unsupported expression in formula '{formula}'")
+
+        try:
+            tree = ast.parse(formula, mode='eval')
+        except SyntaxError:
+            raise UnitError(f"Cannot parse formula '{formula}'")
+        return walk(tree)
+
+    def inconsistent_formulas(self) -> Dict[str, str]:
+        """Formulas whose dimensions do not match their declared unit, with the reason."""
+        return {key: entry["detail"] for key, entry in self.formula_report.items()
+                if entry["status"] == "inconsistent"}
+
+    def _check_formulas(self, ontology: Ontology) -> Dict[str, dict]:
+        """Checks every formula with declared units for dimensional consistency."""
+        report = {}
+        quantity_types = self._quantity_types(ontology)
+        quantity_symbols = {**MEASURED_SYMBOLS, **{n: qt.unit for n, qt in quantity_types.items() if qt.unit}}
+
+        def check(key: str, formula: str, symbols: Dict[str, str], expected_unit: Optional[str]):
+            entry = {"formula": formula, "expected_unit": expected_unit}
+            try:
+                dims = self.formula_dims(formula, symbols)
+            except UnitError as e:
+                entry.update(status="unresolved", detail=str(e))
+                report[key] = entry
+                return
+            entry["derived_dimensions"] = format_dims(dims)
+            if expected_unit is None:
+                entry["status"] = "derived"
+            elif expected_unit in self.unknown_units:
+                entry.update(status="unresolved", detail=f"Unknown unit '{expected_unit}'")
+            elif self.dims(expected_unit) == dims:
+                entry["status"] = "consistent"
+            else:
+                expected_dims = format_dims(self.dims(expected_unit))
+                detail = f"Formula gives {format_dims(dims)}, unit {expected_unit}"
+                if expected_dims != expected_unit:
+                    detail += f" is {expected_dims}"
+                entry.update(status="inconsistent", detail=detail)
+            report[key] = entry
+
+        # A quantity type without a unit of its own takes its parent's; with none at all it is a
+        # dimensionless ratio, as RangeChecker also assumes.
+        for name, unit in self._quantity_units(ontology).items():
+            formula = quantity_types[name].formula
+            if formula:
+                check(f"quantity_types.{name}", formula, quantity_symbols, unit or 'dimensionless')
+        for rule_name, rule in ontology.unit_validation.items():
+            if rule.formula:
+                symbols = {input_name: d['unit'] for input_name, d in rule.inputs.items()}
+                check(f"unit_validation.{rule_name}", rule.formula, symbols, rule.output.get('unit'))
+        return report
@@ -1,5 +1,8 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .models import ValidationRule, Ontology
+from .compatibility import CompatibilityMatrix
+from .ontology_graph import OntologyGraph
+from .units import UnitSystem, UnitError
 
 class ValidationResult:
     def __init__(self, is_valid: bool, violations: List[str] = [], alternatives: List[str] = []):
@@ -8,8 +11,11 @@ class ValidationResult:
         self.alternatives = alternatives
 
 class Validator:
-    def __init__(self, ontology: Ontology):
+    def __init__(self, ontology: Ontology, graph: Optional[OntologyGraph] = None):
         self.ontology = ontology
+        self.units = UnitSystem(ontology)
+        self.graph = graph or OntologyGraph(ontology)
+        self.compatibility = CompatibilityMatrix(ontology, self.graph)
 
     def validate_operation(self, operation: str, params: Dict[str, Any]) -> ValidationResult:
         violations = []
@@ -43,7 +49,11 @@ class Validator:
         if 'source_interval' in params and 'target_interval' in params:
             source = params['source_interval']
             target = params['target_interval']
-            if source != target:
+            unknown = [i for i in (source, target) if not self.graph.node('interval_types', i)]
+            for interval in unknown:
+                violations.append(f"Unknown Interval: '{interval}' is not defined in the ontology")
+                alternatives.append(f"Use one of {list(self.ontology.interval_types)}")
+            if source != target and not unknown:
                 # Check if conversion rule exists
                 rule = next((r for r in self.ontology.conversion_rules if r.source == source and r.target == target), None)
                 if not rule:
@@ -64,27 +74,40 @@ class Validator:
                     for input_name, input_def in rule.inputs.items():
                         if input_name in params['units']:
                             provided_unit = params['units'][input_name]
-                            if provided_unit != input_def['unit']:
-                                violations.append(f"Unit Mismatch: Expected {input_def['unit']} for {input_name}, got {provided_unit}")
-                                alternatives.append(f"Convert {input_name} to {input_def['unit']}")
+                            expected_unit = input_def['unit']
+                            if provided_unit == expected_unit:
+                                continue
+                            # Equivalent spellings (e.g. "MW·h" for "MWh") convert with a factor of 1
+                            try:
+                                factor = self.units.factor(provided_unit, expected_unit)
+                            except UnitError:
+                                violations.append(f"Unit Mismatch: Expected {expected_unit} for {input_name}, got {provided_unit}")
+                                alternatives.append(f"Convert {input_name} to {expected_unit}")
+                                continue
+                            if factor != 1.0:
+                                violations.append(f"Unit Mismatch: Expected {expected_unit} for {input_name}, got {provided_unit}")
+                                alternatives.append(f"Convert {input_name} to {expected_unit} (multiply by {factor:g})")
 
         # 4. Market Service Compatibility
         if 'market_services' in params and isinstance(params['market_services'], list):
             services = params['market_services']
-            if len(services) > 1:
-                base_service = services[0]
-                if base_service in self.ontology.market_services:
-                    base_def = self.ontology.market_services[base_service]
-                    for other_service in services[1:]:
-                        if base_def.compatible_with is not None and other_service not in base_def.compatible_with:
-                            violations.append(f"Incompatible Services: {base_service} cannot be aggregated with {other_service}")
-                            alternatives.append("Calculate separately")
+            for service in services:
+                if not self.graph.node('market_services', service):
+                    violations.append(f"Unknown Market Service: '{service}' is not defined in the ontology")
+                    alternatives.append(f"Use one of {list(self.ontology.market_services)}")
+            for service, other_service in self.compatibility.conflicts(services):
+                violations.append(f"Incompatible Services: {service} cannot be aggregated with {other_service}")
+                alternatives.append("Calculate separately")
 
         # 5. Facility Type Constraints
         if 'facility_type' in params:
             ftype = params['facility_type']
-            if ftype in self.ontology.facility_types:
-                ft_def = self.ontology.facility_types[ftype]
+            ft_node = self.graph.node('facility_types', ftype)
+            if not ft_node:
+                violations.append(f"Unknown Facility Type: '{ftype}' is not defined in the ontology")
+                alternatives.append(f"Use one of {list(self.ontology.facility_types)}")
+            else:
+                ft_def = ft_node.item
                 
                 # Check calculation requirements
                 if ft_def.calculation_requirements:
@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+import tempfile
+import json
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run_benchmarks import run_suite, compare_to_baseline, config_mismatches, main
+from benchmarks import cold_load, http_load, load_test
+
+class TestBenchmarks(unittest.TestCase):
+    def test_suite_runs_at_small_scale(self):
+        """Verify every benchmark runs and reports latency statistics."""
+        results = run_suite(n_concepts=20, n_rules=50, iterations=5)
+        for name in ["loader", "get_concept_definition", "search_wem_rules", "validate_operation",
+                     "catalog_get_table_for_concept", "catalog_get_columns", "compare_versions"]:
+            self.assertIn(name, results)
+            self.assertGreater(results[name]["ops_per_sec"], 0)
+            self.assertLessEqual(results[name]["p50_ms"], results[name]["p99_ms"])
+            self.assertGreaterEqual(results[name]["peak_alloc_mb"], 0)
+        # Memory is traced per benchmark, so loading the ontology allocates far more than a lookup
+        self.assertGreater(results["loader"]["peak_alloc_mb"], results["catalog_get_columns"]["peak_alloc_mb"])
+
+    def test_cold_load_variants_agree(self):
+        """Verify every cold-load variant runs and builds the same ontology."""
+        results = cold_load.run(n_concepts=20, n_rules=50, repeats=1)
+        for name in cold_load.VARIANTS:
+            self.assertGreater(results[name], 0)
+
+    def test_http_load_against_warm_server(self):
+        """Verify concurrent sessions complete against one HTTP server."""
+        results = http_load.run(sessions=3, concurrency=2, calls_per_session=3, transports=("streamable-http",))
+        stats = results["streamable-http"]
+        self.assertEqual(stats["tool_calls"], 9)
+        self.assertGreater(stats["sessions_per_sec"], 0)
+
+    def test_load_test_in_process(self):
+        """Verify the load generator reports throughput, per-tool latency and memory."""
+        mix = load_test.parse_mix("get_concept_definition=3,get_table_mapping=1")
+        self.assertAlmostEqual(mix["get_concept_definition"], 0.75)
+        sessions = load_test.generate_sessions(4, 5, mix, load_test.workload_names(), seed=1)
+        report = load_test.run("in-process", sessions, concurrency=2, sample_interval=0.01)
+        self.assertEqual(report["calls"], 20)
+        # The workload includes a few unknown concept names and looks up tables by table name as well
+        # as by concept; the misses are reported as errors
+        self.assertLessEqual(set(report["errors"]), {"get_concept_definition", "get_table_mapping"})
+        self.assertLessEqual(set(report["tools"]), set(mix))
+        self.assertEqual(sum(report["overall"]["histogram"].values()), 20)
+        self.assertGreater(report["calls_per_sec"], 0)
+
+    def test_load_test_counts_error_results(self):
+        """Verify tools returning an error message are reported as errors, not successes."""
+        sessions = [[{"tool": "get_concept_definition", "arguments": {"concept_name": "NoSuchConcept"}},
+                     {"tool": "get_concept_definition", "arguments": {"concept_name": "RTM"}}]]
+        report = load_test.run("in-process", sessions, concurrency=1, sample_interval=0.01)
+        self.assertEqual(report["errors"], {"get_concept_definition": 1})
+
+    def test_load_test_trace_round_trip(self):
+        """Verify recorded sessions replay in the same order."""
+        sessions = load_test.generate_sessions(3, 4, load_test.DEFAULT_MIX, load_test.workload_names())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.jsonl")
+            load_test.save_trace(path, sessions)
+            replayed = load_test.load_trace(path)
+        self.assertEqual([[(c["tool"], c["arguments"]) for c in s] for s in replayed],
+                         [[(c["tool"], c["arguments"]) for c in s] for s in sessions])
+        with self.assertRaises(ValueError):
+            load_test.parse_mix("drop_tables=1")
+
+    def test_baseline_regression_detection(self):
+        """Verify regressions beyond the tolerance are reported."""
+        baseline = {"loader": {"p50_ms": 10.0, "p95_ms": 20.0, "peak_alloc_mb": 100.0}}
+        ok = {"loader": {"p50_ms": 11.0, "p95_ms": 21.0, "peak_alloc_mb": 100.0}}
+        slow = {"loader": {"p50_ms": 15.0, "p95_ms": 21.0, "peak_alloc_mb": 100.0}}
+        hungry = {"loader": {"p50_ms": 10.0, "p95_ms": 20.0, "peak_alloc_mb": 150.0}}
+        self.assertEqual(compare_to_baseline(ok, baseline, 0.25), [])
+        self.assertEqual(len(compare_to_baseline(slow, baseline, 0.25)), 1)
+        self.assertEqual(len(compare_to_baseline(hungry, baseline, 0.25)), 1)
+
+    def test_baseline_with_other_config_is_not_compared(self):
+        """Verify a baseline recorded with different settings is refused rather than compared."""
+        config = {"concepts": 20, "rules": 50, "iterations": 5, "seed": 0}
+        self.assertEqual(config_mismatches(config, dict(config)), [])
+        self.assertEqual(config_mismatches(config, {**config, "rules": 10000}), ["rules=50 vs baseline 10000"])
+        self.assertTrue(config_mismatches(config, None))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            self.assertEqual(main(["--concepts", "20", "--rules", "50", "--iterations", "5",
+                                   "--baseline", path, "--save-baseline"]), 0)
+            self.assertEqual(main(["--concepts", "20", "--rules", "60", "--iterations", "5",
+                                   "--baseline", path]), 2)
+
+    def test_committed_baseline_records_its_config(self):
+        """Verify the committed baseline carries the configuration it was recorded with."""
+        from benchmarks.run_benchmarks import DEFAULT_BASELINE
+        with open(DEFAULT_BASELINE) as f:
+            baseline = json.load(f)
+        self.assertEqual(set(baseline["config"]), {"concepts", "rules", "iterations", "seed"})
+        self.assertIn("loader", baseline["results"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+import json
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import WEMRule
+from src.clause_index import ClauseIndex, parse_clause_reference, parse_clause_references
+from src import server
+
+RULES = {
+    "r1": WEMRule(id="r1", title="Regulation", content="Regulation Service.", section="3.9.2"),
+    "r2": WEMRule(id="r2", title="RoCoF", content="RoCoF Control Service.", section="Clause 3.9.7"),
+    "r3": WEMRule(id="r3", title="Other", content="Unrelated.", section="3.90.1"),
+    "r4": WEMRule(id="r4", title="Class 1", content="Capability Class 1.", section="4.11.4(a)"),
+}
+
+class TestClauseIndex(unittest.TestCase):
+    def setUp(self):
+        self.ontology = server.ontology.model_copy(update={"wem_rules": RULES})
+        self.index = ClauseIndex(self.ontology)
+
+    def test_parse_clause_reference(self):
+        """Verify clause references are normalized into keys."""
+        self.assertEqual(parse_clause_reference("Clause 3.9.2"), ("3", "9", "2"))
+        self.assertEqual(parse_clause_reference("Clause 2.29.1A(b)"), ("2", "29", "1A", "b"))
+        self.assertEqual(parse_clause_reference("Chapter 11 (Glossary)"), ("11",))
+        self.assertEqual(parse_clause_references("Clauses 3.9.2, 3.9.7"), [("3", "9", "2"), ("3", "9", "7")])
+        self.assertIsNone(parse_clause_reference("Glossary"))
+
+    def test_prefix_lookup(self):
+        """Verify a clause prefix returns concepts and rules for all sub-clauses."""
+        names = [name for _, name in self.index.concepts_for_clause("Clause 3.9")]
+        for expected in ["ESS", "Energy", "RegulationRaise", "RegulationLower", "RoCoF"]:
+            self.assertIn(expected, names)
+        self.assertNotIn("PeakReserveCapacity", names)
+
+        # 3.90.1 must not be treated as a sub-clause of 3.9
+        self.assertEqual(sorted(self.index.rules_for_clause("Clause 3.9")), ["r1", "r2"])
+
+    def test_concept_to_rules(self):
+        """Verify concepts resolve to rules in their clause subtree."""
+        self.assertEqual(self.index.clauses_for_concept("Class1"), ["4.11.4(a)"])
+        self.assertEqual(self.index.rules_for_concept("Class1"), ["r4"])
+        self.assertEqual(self.index.rules_for_concept("RoCoF"), ["r2"])
+        self.assertEqual(sorted(self.index.rules_for_concept("ESS")), ["r1", "r2"])
+
+    def test_server_tools(self):
+        """Verify the server links rules through the clause index."""
+        with server.override_sections(wem_rules=RULES):
+            definition = json.loads(server.get_concept_definition("RegulationRaise"))
+            result = json.loads(server.get_clause_references("Clause 3.9"))
+        self.assertEqual(definition["related_wem_rules"], ["r1"])
+        self.assertIn({"section": "markets", "name": "ESS"}, result["concepts"])
+        self.assertEqual(sorted(result["wem_rules"]), ["r1", "r2"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.loader import OntologyLoader
+from src.columnar_export import build_tables, dictionary_ids, export_ontology, load_dictionaries
+
+class TestColumnarExport(unittest.TestCase):
+    def setUp(self):
+        ontology_dir = os.path.join(os.path.dirname(__file__), '../ontology')
+        self.ontology = OntologyLoader(ontology_dir).get_ontology()
+        self.tables = build_tables(self.ontology)
+
+    def _decode(self, dictionary, ids):
+        d = self.tables['dictionaries']
+        values = dict(zip(d['id'][d['dictionary'] == dictionary], d['value'][d['dictionary'] == dictionary]))
+        return [values.get(i) for i in ids]
+
+    def test_market_services(self):
+        """Verify market services are exported with dictionary-encoded intervals and categories."""
+        services = self.tables['market_services']
+        energy = list(services['name']).index("Energy")
+        self.assertEqual(self._decode('category', [services['category_id'][energy]]), ["Energy"])
+        self.assertEqual(self._decode('interval', [services['settlement_interval_id'][energy]]), ["TradingInterval"])
+        rocof = list(services['name']).index("RoCoF")
+        self.assertEqual(services['settlement_interval_id'][rocof], -1)
+
+    def test_quantity_types_with_variants(self):
+        """Verify valid ranges, units and variant parents are exported."""
+        qts = self.tables['quantity_types']
+        names = list(qts['name'])
+        gen_cf = names.index("GeneratorCapacityFactor")
+        self.assertEqual(qts['parent_id'][gen_cf], names.index("CapacityFactor"))
+        self.assertEqual((qts['valid_min'][gen_cf], qts['valid_max'][gen_cf]), (0.0, 1.05))
+        self.assertTrue(np.isnan(qts['valid_min'][names.index("Injection")]))
+        self.assertEqual(self._decode('unit', [qts['unit_id'][names.index("Injection")]]), ["MWh"])
+
+    def test_table_columns_and_flows(self):
+        """Verify physical column mappings and facility flows are exported."""
+        columns = self.tables['table_columns']
+        mask = (columns['table_name'] == "sent_out_data") & (columns['column'] == "quantity")
+        self.assertEqual(columns['physical_column'][mask][0], "Total Sent Out Generation (MWh)")
+
+        flows = self.tables['facility_type_flows']
+        storage = list(self.tables['facility_types']['name']).index("Storage")
+        storage_flows = self._decode('flow', flows['flow_id'][flows['facility_type_id'] == storage])
+        self.assertEqual(sorted(storage_flows), ["charge", "discharge"])
+
+    def test_ids_are_stable(self):
+        """Verify ids do not depend on YAML ordering."""
+        reordered = self.ontology.model_copy(update={
+            "market_services": dict(reversed(list(self.ontology.market_services.items())))
+        })
+        again = build_tables(reordered)
+        for column in ['market_service_id', 'category_id', 'pricing_interval_id']:
+            np.testing.assert_array_equal(again['market_services'][column], self.tables['market_services'][column])
+
+    def test_new_values_do_not_renumber_ids(self):
+        """Verify a value added since an earlier export gets a new id and existing ids are kept."""
+        services = dict(self.ontology.market_services)
+        services["AAA"] = services["Energy"].model_copy(update={"category": "AAA"})
+        grown = build_tables(self.ontology.model_copy(update={"market_services": services}),
+                             dictionary_ids(self.tables))
+        before, after = dictionary_ids(self.tables)['category'], dictionary_ids(grown)['category']
+        self.assertEqual({v: after[v] for v in before}, before)
+        self.assertEqual(after["AAA"], max(before.values()) + 1)
+
+        # A value that is no longer used keeps its id, so it is not reused for something else
+        shrunk = build_tables(self.ontology.model_copy(update={"market_services": {}}), dictionary_ids(grown))
+        self.assertEqual(dictionary_ids(shrunk)['category'], after)
+
+    def test_export_reuses_earlier_dictionaries(self):
+        """Verify exporting into a directory with an earlier export keeps its dictionary ids."""
+        services = dict(self.ontology.market_services)
+        services["AAA"] = services["Energy"].model_copy(update={"category": "AAA"})
+        with tempfile.TemporaryDirectory() as output_dir:
+            export_ontology(self.ontology, output_dir, format="numpy")
+            first = load_dictionaries(output_dir)
+            export_ontology(self.ontology.model_copy(update={"market_services": services}), output_dir)
+            second = load_dictionaries(output_dir)
+        self.assertEqual({v: second['category'][v] for v in first['category']}, first['category'])
+        self.assertIn("AAA", second['category'])
+
+    def test_numpy_export_is_memory_mappable(self):
+        """Verify record arrays round-trip through memory-mapped loads."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            export_ontology(self.ontology, output_dir, format="numpy")
+            records = np.load(os.path.join(output_dir, "quantity_types.npy"), mmap_mode='r')
+            self.assertEqual(len(records), len(self.tables['quantity_types']['name']))
+            self.assertIn("CapacityFactor", list(records['name']))
+
+    def test_parquet_export(self):
+        """Verify Parquet export when pyarrow is available."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow not installed")
+        with tempfile.TemporaryDirectory() as output_dir:
+            export_ontology(self.ontology, output_dir, format="parquet")
+            table = pq.read_table(os.path.join(output_dir, "market_services.parquet"))
+            self.assertIn("category_id", table.column_names)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+import json
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.loader import OntologyLoader
+from src.models import Ontology, WEMRule
+from src.compact import CompactOntology, CompactRecord, compact, compact_ontology, memory_report
+from src import server
+
+ONTOLOGY_DIR = os.path.join(os.path.dirname(__file__), '../ontology')
+
+
+class TestCompactOntology(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.ontology = OntologyLoader(ONTOLOGY_DIR).get_ontology()
+        cls.compacted = compact_ontology(cls.ontology)
+
+    def test_sections_round_trip(self):
+        """Verify every section's dict() is unchanged by compaction."""
+        for field in Ontology.model_fields:
+            original, compacted = getattr(self.ontology, field), getattr(self.compacted, field)
+            if isinstance(original, dict):
+                self.assertEqual(list(original), list(compacted), field)
+                for key, item in original.items():
+                    expected = item.dict() if hasattr(item, 'dict') else item
+                    actual = compacted[key].dict() if hasattr(compacted[key], 'dict') else compacted[key]
+                    self.assertEqual(expected, actual, f"{field}.{key}")
+
+    def test_records_are_read_only(self):
+        """Verify compact records reject assignment and keep the model's attributes."""
+        service = self.compacted.market_services["RegulationRaise"]
+        self.assertIsInstance(service, CompactRecord)
+        self.assertFalse(hasattr(service, '__dict__'))
+        self.assertIsInstance(service.compatible_with, tuple)
+        with self.assertRaises(AttributeError):
+            service.category = "changed"
+        changed = service.copy(update={"category": "changed"})
+        self.assertEqual(changed.category, "changed")
+        self.assertNotEqual(service.category, "changed")
+
+    def test_compact_ontology_type(self):
+        """Verify the compact ontology is its own read-only type that dumps to plain data."""
+        self.assertIsInstance(self.compacted, CompactOntology)
+        self.assertNotIsInstance(self.compacted, Ontology)
+        with self.assertRaises(AttributeError):
+            self.compacted.wem_rules = {}
+        data = self.compacted.model_dump()
+        json.dumps(data)
+        self.assertEqual(data["market_services"], self.ontology.model_dump()["market_services"])
+        self.assertEqual(self.compacted.to_model().model_dump_json(), self.ontology.model_dump_json())
+
+        rule = WEMRule(id="R1", title="Rule", content="Text", section="2.1.1")
+        updated = self.compacted.model_copy(update={"wem_rules": {"R1": rule}})
+        self.assertIsInstance(updated.wem_rules["R1"], CompactRecord)
+        self.assertIs(updated.market_services, self.compacted.market_services)
+        with self.assertRaises(ValueError):
+            self.compacted.model_copy(update={"no_such_section": {}})
+
+    def test_strings_are_interned(self):
+        """Verify equal strings in different records share one object."""
+        rules = [
+            WEMRule(id=f"R{i}", title=f"Rule {i}", content="Text", section="Chapter 2",
+                    entities=["Market Participant"], effective_date="2023-10-01")
+            for i in range(2)
+        ]
+        first, second = compact(rules)
+        self.assertIs(first.entities[0], second.entities[0])
+        self.assertIs(first.section, second.section)
+
+    def test_memory_report(self):
+        """Verify the report covers every section and compaction reduces the rule section."""
+        rules = {
+            f"R{i}": WEMRule(id=f"R{i}", title=f"Rule {i}", content="Shared rule text " * 10,
+                             section="Chapter 2", entities=["Market Participant", "AEMO"],
+                             effective_date="2023-10-01")
+            for i in range(500)
+        }
+        before = memory_report(self.ontology.model_copy(update={"wem_rules": rules}))
+        after = memory_report(compact_ontology(self.ontology.model_copy(update={"wem_rules": rules})))
+        self.assertEqual(set(before) - {"total"}, set(Ontology.model_fields))
+        self.assertEqual(after["wem_rules"]["items"], 500)
+        self.assertLess(after["wem_rules"]["bytes"], before["wem_rules"]["bytes"])
+
+    def test_server_tools(self):
+        """Verify the server runs on the compact representation and reports its memory use."""
+        report = json.loads(server.get_memory_report())
+        self.assertTrue(report["compact"])
+        self.assertIn("quantity_types", report["sections"])
+        self.assertGreater(report["sections"]["total"]["bytes"], 0)
+        definition = json.loads(server.get_concept_definition("GeneratorCapacityFactor"))
+        self.assertEqual(definition["path"], "CapacityFactor.GeneratorCapacityFactor")
+
+
+if __name__ == '__main__':
+    unittest.main()
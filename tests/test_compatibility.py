@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.loader import OntologyLoader
+from src.compatibility import CompatibilityMatrix
+from src.validator import Validator
+
+
+class TestCompatibilityMatrix(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        ontology_dir = os.path.join(os.path.dirname(__file__), '../ontology')
+        cls.ontology = OntologyLoader(ontology_dir).get_ontology()
+        cls.matrix = CompatibilityMatrix(cls.ontology)
+
+    def test_symmetric(self):
+        """Verify compatibility is the same in both directions."""
+        for a in self.matrix.services:
+            for b in self.matrix.services:
+                self.assertEqual(self.matrix.compatible(a, b), self.matrix.compatible(b, a), (a, b))
+
+    def test_category_rules(self):
+        """Verify within_category and with_energy rules are folded in."""
+        self.assertTrue(self.matrix.compatible("RegulationRaise", "ContingencyLower"))
+        self.assertFalse(self.matrix.compatible("Energy", "RoCoF"))
+        self.assertFalse(self.matrix.compatible("RegulationRaise", "PeakReserveCapacity"))
+        self.assertTrue(self.matrix.compatible("PeakReserveCapacity", "FlexibleReserveCapacity"))
+
+    def test_compatible_with_none_defers_to_the_other_side(self):
+        """Verify a service without a compatible_with list is restricted by its partner's explicit list."""
+        services = dict(self.ontology.market_services)
+        services["Spot"] = services["Energy"].model_copy(update={"category": "Spot", "compatible_with": None})
+        services["Forward"] = services["Energy"].model_copy(update={"category": "Forward", "compatible_with": None})
+        matrix = CompatibilityMatrix(self.ontology.model_copy(update={"market_services": services}))
+        self.assertTrue(matrix.compatible("Spot", "Forward"))
+        self.assertFalse(matrix.compatible("Spot", "PeakReserveCapacity"))
+        self.assertFalse(matrix.compatible("Spot", "Energy"))
+
+    def test_category_rule_overrides_lists(self):
+        """Verify within_category: allowed permits a pair that neither compatible_with list names."""
+        services = dict(self.ontology.market_services)
+        services["ContingencyRaise"] = services["ContingencyRaise"].model_copy(update={"compatible_with": []})
+        matrix = CompatibilityMatrix(self.ontology.model_copy(update={"market_services": services}))
+        self.assertTrue(matrix.compatible("ContingencyRaise", "RegulationRaise"))
+        self.assertFalse(matrix.compatible("ContingencyRaise", "PeakReserveCapacity"))
+
+    def test_all_conflicting_pairs(self):
+        """Verify conflicts between services other than the first are reported."""
+        conflicts = self.matrix.conflicts(["RegulationRaise", "RoCoF", "PeakReserveCapacity", "Energy"])
+        self.assertIn(("RoCoF", "PeakReserveCapacity"), conflicts)
+        self.assertIn(("Energy", "RoCoF"), conflicts)
+        self.assertNotIn(("RegulationRaise", "RoCoF"), conflicts)
+        self.assertEqual(len(conflicts), 5)
+        self.assertEqual(self.matrix.conflicts(["RegulationRaise", "RegulationLower"]), [])
+
+    def test_validator_reports_every_pair(self):
+        """Verify the validator reports each conflicting pair."""
+        result = Validator(self.ontology).validate_operation("aggregation", {
+            "market_services": ["RegulationRaise", "RegulationLower", "PeakReserveCapacity"]
+        })
+        self.assertFalse(result.is_valid)
+        self.assertEqual(len(result.violations), 2)
+        self.assertTrue(all("Incompatible Services" in v for v in result.violations))
+
+
+if __name__ == '__main__':
+    unittest.main()
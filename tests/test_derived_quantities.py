@@ -0,0 +1,116 @@
+import unittest
+import sys
+import os
+import json
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.loader import OntologyLoader
+from src.models import QuantityType
+from src.derived_quantities import CycleError, DerivationError, DerivedQuantityGraph, formula_symbols
+from src import server
+
+
+class TestDerivedQuantityGraph(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        ontology_dir = os.path.join(os.path.dirname(__file__), '../ontology')
+        cls.ontology = OntologyLoader(ontology_dir).get_ontology()
+        cls.graph = DerivedQuantityGraph(cls.ontology)
+
+    def _with_quantities(self, **formulas):
+        quantity_types = dict(self.ontology.quantity_types)
+        for name, formula in formulas.items():
+            quantity_types[name] = QuantityType(name=name, formula=formula)
+        return self.ontology.model_copy(update={"quantity_types": quantity_types})
+
+    def test_edges_and_order(self):
+        """Verify formula, requires, required_for and derived_from edges, in topological order."""
+        duration = self.graph.nodes["DurationRating"]
+        self.assertEqual(duration.depends_on, {"EnergyCapacity": "formula", "NameplateCapacity": "formula"})
+        self.assertEqual(self.graph.nodes["CapacityFactor.GeneratorCapacityFactor"].depends_on["SCADA"], "requires")
+        self.assertEqual(self.graph.dependencies("DispatchWeightedPrice"), ["DispatchPrice"])
+        self.assertIn("generator_outages", self.graph.nodes["AvailabilityFactor"].data_requirements)
+        position = {name: i for i, name in enumerate(self.graph.order)}
+        for node in self.graph.nodes.values():
+            for dependency in node.depends_on:
+                self.assertLess(position[dependency], position[node.name])
+
+    def test_cycle_detected_at_build(self):
+        """Verify a dependency cycle is rejected when the graph is built."""
+        with self.assertRaises(CycleError) as ctx:
+            DerivedQuantityGraph(self._with_quantities(A="B * 2", B="C + 1", C="A / 3"))
+        self.assertEqual(ctx.exception.cycle[0], ctx.exception.cycle[-1])
+        with self.assertRaises(DerivationError):
+            formula_symbols("__import__('os')")
+
+    def test_non_arithmetic_formula_is_not_derivable(self):
+        """Verify a formula that is not plain arithmetic is reported on its node instead of failing the build."""
+        graph = DerivedQuantityGraph(self._with_quantities(Peak="max(DispatchPrice)", Doubled="EnergyCapacity * 2"))
+        peak = graph.nodes["Peak"]
+        self.assertFalse(peak.derived)
+        self.assertIn("Unsupported expression", graph.to_dict()["nodes"]["Peak"]["error"])
+        self.assertEqual(graph.plan(["Peak"])["missing"], ["Peak"])
+        np.testing.assert_allclose(graph.evaluate(["Doubled"], {"EnergyCapacity": [2.0]})["Doubled"], [4.0])
+
+    def test_duplicate_variant_names(self):
+        """Verify variants with the same name under different parents are separate nodes."""
+        quantity_types = dict(self.ontology.quantity_types)
+        quantity_types["A"] = QuantityType(name="A", abstract=True, variants={
+            "X": QuantityType(name="X", formula="EnergyCapacity * 2")})
+        quantity_types["B"] = QuantityType(name="B", abstract=True, variants={
+            "X": QuantityType(name="X", formula="EnergyCapacity * 3")})
+        graph = DerivedQuantityGraph(self.ontology.model_copy(update={"quantity_types": quantity_types}))
+        self.assertIn("A.X", graph.nodes)
+        self.assertIn("B.X", graph.nodes)
+        values = graph.evaluate(["A.X", "B.X"], {"EnergyCapacity": [1.0]})
+        np.testing.assert_allclose(values["A.X"], [2.0])
+        np.testing.assert_allclose(values["B.X"], [3.0])
+
+    def test_vectorized_evaluation(self):
+        """Verify targets are computed for a whole fleet from input arrays."""
+        n = 10000
+        rng = np.random.default_rng(0)
+        energy = rng.uniform(10, 400, n)
+        power = rng.uniform(5, 100, n)
+        discharge = rng.uniform(0, 5000, n)
+        values = self.graph.evaluate(["DurationRating", "EquivalentFullCycles"], {
+            "EnergyCapacity": energy, "NameplateCapacity": power, "ActualDischarge": discharge})
+        np.testing.assert_allclose(values["DurationRating"], energy / power)
+        np.testing.assert_allclose(values["EquivalentFullCycles"], discharge / energy)
+
+    def test_only_needed_subgraph_is_computed(self):
+        """Verify intermediates are computed once and unrelated formulas are skipped."""
+        graph = DerivedQuantityGraph(self._with_quantities(
+            Doubled="EnergyCapacity * 2", Total="Doubled + Doubled", Unrelated="NameplateCapacity * 3"))
+        plan = graph.plan(["Total"], ["EnergyCapacity"])
+        self.assertEqual(plan["steps"], ["Doubled", "Total"])
+        values = graph.evaluate(["Total"], {"EnergyCapacity": [1.0, 2.0]}, keep_intermediates=True)
+        self.assertEqual(set(values), {"EnergyCapacity", "Doubled", "Total"})
+        np.testing.assert_allclose(values["Total"], [4.0, 8.0])
+        # A supplied intermediate is used as given
+        values = graph.evaluate(["Total"], {"Doubled": [10.0]})
+        np.testing.assert_allclose(values["Total"], [20.0])
+
+    def test_missing_inputs(self):
+        """Verify missing inputs are named."""
+        with self.assertRaises(DerivationError) as ctx:
+            self.graph.evaluate(["DurationRating"], {"EnergyCapacity": [1.0]})
+        self.assertIn("NameplateCapacity", str(ctx.exception))
+
+    def test_server_tool(self):
+        """Verify the server tool resolves names and reports non-finite values as null."""
+        result = json.loads(server.evaluate_derived_quantities(
+            ["GeneratorCapacityFactor"],
+            {"ActualGeneration": [438.0, 0.0], "NameplateCapacity": [100.0, 0.0], "Hours": [8.76]}))
+        self.assertAlmostEqual(result["values"]["GeneratorCapacityFactor"][0], 0.5)
+        self.assertIsNone(result["values"]["GeneratorCapacityFactor"][1])
+        message = server.evaluate_derived_quantities(["DurationRating"], {})
+        self.assertIn("Missing inputs", message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import sys
+import os
+import subprocess
+import tempfile
+import textwrap
+from unittest import mock
+
+import yaml
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import fast_yaml
+from src.fast_yaml import split_yaml_mapping, merge_chunks, parse_yaml, load_yaml_files
+from src.loader import OntologyLoader, ONTOLOGY_FILES
+
+ONTOLOGY_DIR = os.path.join(os.path.dirname(__file__), '../ontology')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestFastYaml(unittest.TestCase):
+    def test_chunks_reassemble(self):
+        """Verify chunked parsing of every ontology file equals a whole-file parse."""
+        for filename in ONTOLOGY_FILES:
+            with open(os.path.join(ONTOLOGY_DIR, filename)) as f:
+                text = f.read()
+            chunks = split_yaml_mapping(text, 500)
+            self.assertIsNotNone(chunks, filename)
+            self.assertEqual(merge_chunks([parse_yaml(c) for c in chunks]), yaml.safe_load(text), filename)
+
+    def test_dumped_sequences_are_not_split(self):
+        """Verify sequences written at the section's indentation stay whole."""
+        text = yaml.dump({"rules": [{"id": i, "check": "x"} for i in range(50)], "other": {"a": 1, "b": 2}})
+        self.assertEqual(merge_chunks([parse_yaml(c) for c in split_yaml_mapping(text, 10)]), yaml.safe_load(text))
+
+    def test_nested_keys_in_scalars_are_not_boundaries(self):
+        """Verify key-like lines inside block scalars and flow mappings never start a chunk."""
+        text = textwrap.dedent("""\
+            first:
+              a: 1
+            notes: |
+              looks_like: a key
+              second: also text
+            flow: {x: 1,
+              y: 2}
+            version: 3
+            second:
+              b: 2
+            third:
+              description: >
+                folded: text
+            """)
+        chunks = split_yaml_mapping(text, 1)
+        self.assertEqual([c.split(':', 1)[0] for c in chunks], ["first", "second", "third"])
+        self.assertEqual(merge_chunks([parse_yaml(c) for c in chunks]), yaml.safe_load(text))
+
+    def test_large_section_is_split_between_entries(self):
+        """Verify one large section is split at its own entries and its parts are merged back."""
+        text = yaml.dump({"version": 1,
+                          "quantity_types": {f"Q{i}": {"name": f"Q {i}", "unit": "MW"} for i in range(200)},
+                          "other": {"a": 1}})
+        chunks = split_yaml_mapping(text, len(text) // 4)
+        self.assertGreaterEqual(len(chunks), 4)
+        self.assertLess(max(len(c) for c in chunks), len(text) // 2)
+        self.assertEqual(merge_chunks([parse_yaml(c) for c in chunks]), yaml.safe_load(text))
+
+    def test_repeated_sections_are_not_split(self):
+        """Verify a document that gives a section twice is parsed whole rather than merged."""
+        self.assertIsNone(split_yaml_mapping("a:\n  k: 1\nb:\n  k: 2\na:\n  j: 3\n", 1))
+
+    def test_unparseable_chunks_fall_back_to_whole_file(self):
+        """Verify a file is parsed whole when its chunks do not parse on their own."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "doc.yaml")
+            with open(path, "w") as f:
+                f.write("a:\n  k: 1\nb:\n  k: 2\n")
+            bad_split = lambda text, chunk_bytes: ["a:\n  k: [1\n", "b:\n  k: 2\n"]
+            with mock.patch.object(fast_yaml, "PARALLEL_MIN_BYTES", 1), \
+                    mock.patch.object(fast_yaml, "split_yaml_mapping", bad_split):
+                self.assertEqual(load_yaml_files([path], workers=2), [{"a": {"k": 1}, "b": {"k": 2}}])
+
+    def test_unsafe_documents_are_not_split(self):
+        """Verify anchors and non-mapping roots fall back to whole-file parsing."""
+        self.assertIsNone(split_yaml_mapping("a: &x {k: 1}\nb: *x\n", 1))
+        self.assertIsNone(split_yaml_mapping("- 1\n- 2\n", 1))
+
+    def test_process_pool_matches_serial(self):
+        """Verify parallel parsing across processes gives the same result as serial parsing."""
+        paths = [os.path.join(ONTOLOGY_DIR, f) for f in ONTOLOGY_FILES]
+        with mock.patch.object(fast_yaml, "PARALLEL_MIN_BYTES", 1):
+            parallel = load_yaml_files(paths, workers=2)
+        self.assertEqual(parallel, load_yaml_files(paths))
+
+    def test_loader_paths_agree(self):
+        """Verify the default loader and the original serial pure-Python path build the same ontology."""
+        fast = OntologyLoader(ONTOLOGY_DIR).get_ontology()
+        slow = OntologyLoader(ONTOLOGY_DIR, parallel=False, yaml_loader=yaml.SafeLoader).get_ontology()
+        self.assertEqual(fast, slow)
+
+    def test_module_loading_at_import_runs_with_python_m(self):
+        """Verify a `python -m` module that loads a large ontology at import does not break."""
+        from benchmarks.synthetic import generate_ontology_dir
+        with tempfile.TemporaryDirectory() as tmp:
+            ontology_dir = generate_ontology_dir(os.path.join(tmp, "ontology"), 6000, 0)
+            self.assertGreater(os.path.getsize(os.path.join(ontology_dir, "lower.yaml")), fast_yaml.PARALLEL_MIN_BYTES)
+            with open(os.path.join(tmp, "loads_at_import.py"), "w") as f:
+                f.write(textwrap.dedent(f"""\
+                    import sys
+                    sys.path.insert(0, {ROOT!r})
+                    from src.loader import OntologyLoader
+                    default = OntologyLoader({ontology_dir!r}, rules_path="missing.json").get_ontology()
+                    pooled = OntologyLoader({ontology_dir!r}, rules_path="missing.json", yaml_workers=2).get_ontology()
+                    assert default == pooled
+                    print(len(default.quantity_types))
+                    """))
+            result = subprocess.run([sys.executable, "-m", "loads_at_import"], cwd=tmp,
+                                    capture_output=True, text=True, timeout=300)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertGreater(int(result.stdout.split()[-1]), 1000)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.loader import OntologyLoader
+from src.flow_split import FlowSplitter, FlowSplitError, charge_is_negative, stream_names
+
+class TestFlowSplit(unittest.TestCase):
+    def setUp(self):
+        ontology_dir = os.path.join(os.path.dirname(__file__), '../ontology')
+        self.ontology = OntologyLoader(ontology_dir).get_ontology()
+        self.splitter = FlowSplitter(self.ontology)
+
+    def test_stream_names(self):
+        """Verify stream names come from quantity_interpretation."""
+        self.assertEqual(stream_names(self.ontology.facility_types["Storage"]), ("discharge", "charge"))
+        self.assertEqual(stream_names(self.ontology.facility_types["Generator"]), ("generation", None))
+
+    def test_storage_fleet_split(self):
+        """Verify a 2-D fleet array splits into non-negative charge and discharge streams."""
+        quantities = np.array([[10.0, -5.0], [0.0, -2.5], [3.0, 4.0]])
+        streams = self.splitter.split("Storage", quantities, operation="calculate_dispatch_weighted_price")
+        np.testing.assert_array_equal(streams["discharge"], [[10, 0], [0, 0], [3, 4]])
+        np.testing.assert_array_equal(streams["charge"], [[0, 5], [0, 2.5], [0, 0]])
+        np.testing.assert_array_equal(streams["discharge"] - streams["charge"], quantities)
+
+    def test_preallocated_buffers(self):
+        """Verify output buffers are reused."""
+        buffers = {"discharge": np.empty(3), "charge": np.empty(3)}
+        streams = self.splitter.split("Storage", [1.0, -1.0, 2.0], out=buffers)
+        self.assertIs(streams["charge"], buffers["charge"])
+        np.testing.assert_array_equal(buffers["charge"], [0, 1, 0])
+
+    def test_errors(self):
+        """Verify unknown facility types and uninterpretable negatives are rejected."""
+        with self.assertRaises(FlowSplitError):
+            self.splitter.split("Unknown", [1.0])
+        with self.assertRaises(FlowSplitError):
+            self.splitter.split("Generator", [1.0, -1.0])
+        with self.assertRaises(FlowSplitError):
+            charge_is_negative("quantity < 5")
+        self.assertFalse(charge_is_negative("quantity > 0"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+import json
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.loader import OntologyLoader
+from src.fuzzy_index import TrigramIndex, normalize
+from src import server
+
+class TestTrigramIndex(unittest.TestCase):
+    def setUp(self):
+        ontology_dir = os.path.join(os.path.dirname(__file__), '../ontology')
+        self.index = TrigramIndex.from_ontology(OntologyLoader(ontology_dir).get_ontology())
+
+    def test_normalize(self):
+        """Verify separators and case are ignored."""
+        self.assertEqual(normalize("Sent Out_Data"), normalize("sentoutdata"))
+
+    def test_misspelled_and_abbreviated_names(self):
+        """Verify typos, spacing, abbreviations and table names produce ranked candidates."""
+        self.assertEqual(self.index.search("Contingency Raise")[0]["concept"], "ContingencyRaise")
+        self.assertEqual(self.index.search("NAQ")[0]["concept"], "NetworkAccessQuantity")
+        self.assertEqual(self.index.search("RTM")[0]["concept"], "RTM")
+        self.assertIn("sent_out_data", [m["concept"] for m in self.index.search("sentout_data")])
+        self.assertEqual(self.index.search("CapacityFacter")[0]["concept"], "CapacityFactor")
+        self.assertEqual(self.index.search("xyzzy"), [])
+
+    def test_large_vocabulary(self):
+        """Verify lookups stay fast over 100k names."""
+        index = TrigramIndex((f"SyntheticQuantity{i}", f"SyntheticQuantity{i}") for i in range(100000))
+        start = time.perf_counter()
+        result = index.search("SyntheticQuantiy4242", limit=3)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(result[0]["concept"], "SyntheticQuantity4242")
+
+    def test_server_suggestions(self):
+        """Verify not-found responses carry suggestions."""
+        self.assertIn("Did you mean: ContingencyRaise", server.get_concept_definition("Contingency Raise"))
+        result = json.loads(server.resolve_concepts(["NAQ"]))
+        self.assertEqual(result["suggestions"]["NAQ"][0], "NetworkAccessQuantity")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+import shutil
+import subprocess
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.history_index import OntologyHistoryIndex
+
+LOWER_V1 = """
+quantity_types:
+  Injection:
+    name: "Injection"
+    unit: "MWh"
+"""
+
+LOWER_V2 = """
+quantity_types:
+  Injection:
+    name: "Injection"
+    unit: "MWh"
+    description: "Energy sent into the network."
+  DispatchTarget:
+    name: "Dispatch Target"
+    unit: "MW"
+"""
+
+UPPER_V1 = """
+CapacityFactor:
+  name: "Capacity Factor"
+  category: "PerformanceMetric"
+"""
+
+class TestHistoryIndex(unittest.TestCase):
+    def setUp(self):
+        if shutil.which("git") is None:
+            self.skipTest("git not available")
+        self.repo = tempfile.mkdtemp()
+        self._git("init", "-q")
+        os.makedirs(os.path.join(self.repo, "ontology"))
+
+    def tearDown(self):
+        shutil.rmtree(self.repo, ignore_errors=True)
+
+    def _git(self, *args):
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            cwd=self.repo, check=True, capture_output=True
+        )
+
+    def _commit(self, message, **files):
+        for filename, content in files.items():
+            with open(os.path.join(self.repo, "ontology", f"{filename}.yaml"), "w") as f:
+                f.write(content)
+        self._git("add", "-A")
+        self._git("commit", "-q", "-m", message)
+
+    def test_concept_history(self):
+        """Verify change events are recorded per concept."""
+        self._commit("Initial ontology", lower=LOWER_V1, upper=UPPER_V1)
+        self._commit("Describe injection", lower=LOWER_V2)
+
+        index = OntologyHistoryIndex(self.repo)
+        self.assertEqual(len(index.commits), 2)
+
+        injection = index.history("Injection")
+        self.assertEqual([e["change"] for e in injection], ["added", "modified"])
+        self.assertEqual(injection[1]["subject"], "Describe injection")
+
+        dispatch_target = index.history("DispatchTarget")
+        self.assertEqual([e["change"] for e in dispatch_target], ["added"])
+
+        # Top-level upper.yaml quantity types are indexed under quantity_types
+        self.assertEqual(index.history("CapacityFactor", section="quantity_types")[0]["change"], "added")
+
+    def test_incremental_refresh(self):
+        """Verify refresh only indexes new commits."""
+        self._commit("Initial ontology", lower=LOWER_V1)
+        index = OntologyHistoryIndex(self.repo)
+        self.assertEqual(index.refresh(), 0)
+
+        self._commit("Remove injection", lower="quantity_types: {}\n")
+        self.assertEqual(index.refresh(), 1)
+        self.assertEqual([e["change"] for e in index.history("Injection")], ["added", "removed"])
+
+    def test_refresh_after_history_rewrite(self):
+        """Verify refresh rebuilds the index when the last indexed commit left HEAD's history."""
+        self._commit("Initial ontology", lower=LOWER_V1)
+        self._commit("Describe injection", lower=LOWER_V2)
+        index = OntologyHistoryIndex(self.repo)
+        self.assertEqual(len(index.commits), 2)
+
+        self._git("reset", "-q", "--hard", "HEAD~1")
+        self._commit("Remove injection", lower="quantity_types: {}\n")
+        self.assertEqual(index.refresh(), 2)
+        self.assertEqual([c["subject"] for c in index.commits], ["Initial ontology", "Remove injection"])
+        self.assertEqual([e["change"] for e in index.history("Injection")], ["added", "removed"])
+        self.assertEqual(index.history("DispatchTarget"), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import sys
+import os
+import asyncio
+import json
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.http_transport import ClientLimitMiddleware, create_app, transport_security
+from src import server
+
+
+class TestClientLimitMiddleware(unittest.TestCase):
+    def _request(self, middleware, session_id, sent, method='POST'):
+        scope = {"type": "http", "method": method, "headers": [(b"mcp-session-id", session_id.encode())],
+                 "client": ("127.0.0.1", 5000)}
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            sent.append((session_id, message))
+
+        return middleware(scope, receive, send)
+
+    def test_limits_each_client(self):
+        """Verify requests over the per-client limit get 429 while other clients are served."""
+        release = asyncio.Event()
+        served = []
+
+        async def app(scope, receive, send):
+            served.append(scope)
+            await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+
+        async def scenario():
+            middleware = ClientLimitMiddleware(app, limit=2)
+            sent = []
+            tasks = [asyncio.ensure_future(self._request(middleware, "a", sent)) for _ in range(3)]
+            tasks.append(asyncio.ensure_future(self._request(middleware, "b", sent)))
+            tasks.append(asyncio.ensure_future(self._request(middleware, "a", sent, method='GET')))
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            self.assertEqual(middleware.rejected, 1)
+            self.assertEqual(middleware.active, {"session:a": 2, "session:b": 1})
+            release.set()
+            await asyncio.gather(*tasks)
+            self.assertEqual(middleware.active, {})
+            return sent
+
+        sent = asyncio.run(scenario())
+        statuses = [m["status"] for _, m in sent if m["type"] == "http.response.start"]
+        self.assertEqual(sorted(statuses), [200, 200, 200, 200, 429])
+        body = next(m["body"] for _, m in sent if m["type"] == "http.response.body")
+        self.assertIn("limit 2", json.loads(body)["error"]["message"])
+
+    def test_limit_applies_to_streamable_http_only(self):
+        """Verify the cap wraps streamable HTTP but not SSE, whose POSTs return before the tool runs."""
+        original = server.mcp.settings.transport_security
+        try:
+            self.assertIsInstance(create_app(server.mcp, "streamable-http", per_client_limit=2), ClientLimitMiddleware)
+            self.assertNotIsInstance(create_app(server.mcp, "sse"), ClientLimitMiddleware)
+        finally:
+            server.mcp.settings.transport_security = original
+
+    def test_invalid_settings(self):
+        """Verify unknown transports and non-positive limits are rejected."""
+        with self.assertRaises(ValueError):
+            create_app(server.mcp, transport="websocket")
+        with self.assertRaises(ValueError):
+            ClientLimitMiddleware(None, limit=0)
+
+
+class TestTransportSecurity(unittest.TestCase):
+    def test_protection_stays_on_for_network_hosts(self):
+        """Verify binding a network interface keeps DNS rebinding protection and allows only named hosts."""
+        settings = transport_security("0.0.0.0", ["ontology.example.com", "10.0.0.5:8000"])
+        self.assertTrue(settings.enable_dns_rebinding_protection)
+        self.assertIn("127.0.0.1:*", settings.allowed_hosts)
+        self.assertIn("[::1]:*", settings.allowed_hosts)
+        self.assertIn("ontology.example.com:*", settings.allowed_hosts)
+        self.assertIn("10.0.0.5:8000", settings.allowed_hosts)
+        self.assertNotIn("10.0.0.5:*", settings.allowed_hosts)
+        self.assertNotIn("0.0.0.0:*", settings.allowed_hosts)
+        self.assertIn("https://ontology.example.com", settings.allowed_origins)
+
+    def test_bound_host_allowed(self):
+        """Verify the address the server binds is an allowed Host header."""
+        settings = transport_security("192.168.1.20")
+        self.assertIn("192.168.1.20:*", settings.allowed_hosts)
+
+    def test_create_app_applies_settings(self):
+        """Verify create_app installs the protection on the MCP server."""
+        original = server.mcp.settings.transport_security
+        try:
+            create_app(server.mcp, host="0.0.0.0", allowed_hosts=["ontology.example.com"])
+            settings = server.mcp.settings.transport_security
+        finally:
+            server.mcp.settings.transport_security = original
+        self.assertTrue(settings.enable_dns_rebinding_protection)
+        self.assertIn("ontology.example.com:*", settings.allowed_hosts)
+
+
+if __name__ == '__main__':
+    unittest.main()
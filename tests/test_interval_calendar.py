@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import date
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.loader import OntologyLoader
+from src.interval_calendar import IntervalCalendar, CalendarError
+
+class TestIntervalCalendar(unittest.TestCase):
+    def setUp(self):
+        ontology_dir = os.path.join(os.path.dirname(__file__), '../ontology')
+        self.ontology = OntologyLoader(ontology_dir).get_ontology()
+        self.calendar = IntervalCalendar.build(
+            self.ontology, date(2020, 1, 1), date(2049, 12, 31), holidays=[date(2024, 1, 26)])
+
+    def test_interval_arithmetic(self):
+        """Verify dispatch and trading interval indices and interval numbers within the Trading Day."""
+        ts = np.array(['2020-01-01T00:00', '2020-01-01T00:07', '2020-01-01T08:00', '2020-01-02T07:59'],
+                      dtype='datetime64[s]')
+        np.testing.assert_array_equal(self.calendar.interval_index(ts, "DispatchInterval"), [0, 1, 96, 383])
+        np.testing.assert_array_equal(self.calendar.interval_index(ts, "TradingInterval"), [0, 0, 16, 63])
+        np.testing.assert_array_equal(self.calendar.interval_of_day(ts), [33, 33, 1, 48])
+        self.assertEqual(str(self.calendar.interval_start(ts, "DispatchInterval")[1]), "2020-01-01T00:05:00")
+
+    def test_trading_date_and_settlement_month(self):
+        """Verify timestamps before 08:00 belong to the previous Trading Day and settlement month."""
+        result = self.calendar.lookup(['2024-02-01T07:30', '2024-02-01T08:00'])
+        self.assertEqual([str(d) for d in result["trading_date"]], ["2024-01-31", "2024-02-01"])
+        self.assertEqual([str(m) for m in result["settlement_month"]], ["2024-01", "2024-02"])
+
+    def test_business_days(self):
+        """Verify weekends and holidays are excluded and business days can be counted."""
+        flags = self.calendar.is_business_day(['2024-01-25', '2024-01-26', '2024-01-27', '2024-01-29'])
+        np.testing.assert_array_equal(flags, [True, False, False, True])
+        self.assertEqual(int(self.calendar.business_days_between('2024-01-22', '2024-01-29')), 4)
+
+    def test_save_and_memory_map(self):
+        """Verify a saved calendar loads memory-mapped and gives the same lookups."""
+        with tempfile.TemporaryDirectory() as tmp:
+            loaded = IntervalCalendar.load(self.ontology, self.calendar.save(tmp))
+            self.assertIsInstance(loaded.days, np.memmap)
+            ts = ['2031-06-15T12:34', '2045-03-01T01:00']
+            for key, values in self.calendar.lookup(ts).items():
+                np.testing.assert_array_equal(loaded.lookup(ts)[key], values)
+            del loaded
+
+    def test_errors(self):
+        """Verify out-of-range dates and month-length intervals are rejected."""
+        with self.assertRaises(CalendarError):
+            self.calendar.is_business_day(['2019-12-31'])
+        with self.assertRaises(CalendarError):
+            self.calendar.interval_index(['2020-01-01T00:00'], "SettlementPeriod")
+
+if __name__ == "__main__":
+    unittest.main()
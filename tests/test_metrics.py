@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+import json
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.metrics import PHASE_HISTORY, ErrorResult, Histogram, MetricsRegistry, instrument, registry
+from src.loader import OntologyLoader
+from src import server
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram(self):
+        """Verify values land in the right buckets."""
+        histogram = Histogram([1, 10])
+        for value in [0.5, 5, 50]:
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [1, 1, 1])
+        self.assertEqual(histogram.quantile(0.5), 10)
+
+    def test_instrumented_tool_calls(self):
+        """Verify tool calls, response bytes and errors are recorded."""
+        registry.reset()
+        response = server.get_concept_definition("RTM")
+        server.get_concept_definition("RTM")
+
+        stats = json.loads(server.get_server_metrics())["tools"]["get_concept_definition"]
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["errors"], 0)
+        self.assertEqual(stats["response_bytes"]["sum"], 2 * len(response.encode("utf-8")))
+
+        @instrument
+        def failing_tool():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            failing_tool()
+        self.assertEqual(registry.tools["failing_tool"].errors, 1)
+
+    def test_error_results_counted(self):
+        """Verify tools reporting an error as text are counted as errors and still return the text."""
+        registry.reset()
+        response = server.get_concept_definition("NoSuchConcept")
+        self.assertIsInstance(response, ErrorResult)
+        self.assertIn("not found", response)
+        server.get_concept_definition("RTM")
+        self.assertEqual(registry.tools["get_concept_definition"].calls, 2)
+        self.assertEqual(registry.tools["get_concept_definition"].errors, 1)
+        self.assertIsInstance(server.get_table_mapping("NoSuchConcept"), ErrorResult)
+        self.assertIsInstance(server.get_conversion_rule("NoSuchInterval", "TradingInterval"), ErrorResult)
+        self.assertEqual(registry.tools["get_table_mapping"].errors, 1)
+
+    def test_load_phases(self):
+        """Verify loader phases are timed."""
+        registry.reset()
+        OntologyLoader(os.path.join(os.path.dirname(__file__), '../ontology'))
+        phases = registry.to_dict()["load_phases_seconds"]
+        for phase in ["yaml_parse", "rules_load", "pydantic_build"]:
+            self.assertIn(phase, phases)
+
+    def test_phase_history_bounded(self):
+        """Verify only the most recent timings of a phase are kept."""
+        metrics = MetricsRegistry()
+        for i in range(PHASE_HISTORY + 5):
+            metrics.record_phase("index_build", float(i))
+        values = metrics.to_dict()["load_phases_seconds"]["index_build"]
+        self.assertEqual(len(values), PHASE_HISTORY)
+        self.assertEqual(values[-1], PHASE_HISTORY + 4)
+
+    def test_prometheus_format(self):
+        """Verify the Prometheus dump contains counters and histogram series."""
+        metrics = MetricsRegistry()
+        metrics.record_call("list_concepts", 0.002, 300)
+        metrics.record_phase("yaml_parse", 0.1)
+        text = metrics.to_prometheus()
+        self.assertIn('wem_tool_calls_total{tool="list_concepts"} 1', text)
+        self.assertIn('wem_tool_latency_seconds_bucket{tool="list_concepts",le="+Inf"} 1', text)
+        self.assertIn('wem_load_phase_seconds{phase="yaml_parse"} 0.1', text)
+
+if __name__ == "__main__":
+    unittest.main()
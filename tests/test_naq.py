@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.loader import OntologyLoader
+from src.naq import NAQEngine, NAQFacility, NAQError, TIER_EXISTING, TIER_NEW_ENTRANT
+
+class TestNAQEngine(unittest.TestCase):
+    def setUp(self):
+        ontology_dir = os.path.join(os.path.dirname(__file__), '../ontology')
+        self.engine = NAQEngine(OntologyLoader(ontology_dir).get_ontology(), workers=4)
+
+    def test_coverage_from_operation(self):
+        """Verify the coverage threshold is read from the operation logic."""
+        self.assertAlmostEqual(self.engine.required_coverage, 0.95)
+
+    def test_priority_order(self):
+        """Verify existing facilities precede new entrants, and Class 1 precedes Class 3."""
+        facilities = [
+            NAQFacility("WIND", 100, TIER_NEW_ENTRANT, "Class3"),
+            NAQFacility("GAS", 100, TIER_NEW_ENTRANT, "Class1"),
+            NAQFacility("COAL", 100, TIER_EXISTING),
+        ]
+        # One shared constraint with 250 MW of headroom in every scenario
+        sensitivities = np.ones((1, 3))
+        dispatch = np.ones((40, 3))
+        limits = np.full((40, 1), 250.0)
+        result = self.engine.allocate(facilities, sensitivities, dispatch, limits)
+        self.assertEqual(result.allocations, {"WIND": 50.0, "GAS": 100.0, "COAL": 100.0})
+        self.assertEqual([g["facilities"] for g in result.groups], [["COAL"], ["GAS"], ["WIND"]])
+
+    def test_coverage_quantile(self):
+        """Verify allocation may fail the tightest 5% of scenarios but no more."""
+        limits = np.linspace(1.0, 100.0, 100)[:, None]
+        facilities = [NAQFacility("A", 200, TIER_EXISTING)]
+        result = self.engine.allocate(facilities, np.ones((1, 1)), np.ones((100, 1)), limits)
+        self.assertAlmostEqual(result.allocations["A"], 6.0)
+        self.assertGreaterEqual(result.coverage, 0.95)
+
+    def test_pro_rata_and_parallel_coverage(self):
+        """Verify equal-priority facilities share pro rata and coverage matches across chunks."""
+        rng = np.random.default_rng(1)
+        facilities = [NAQFacility(f"F{i}", 50 + i, TIER_EXISTING) for i in range(20)]
+        sensitivities = rng.uniform(0, 1, (5, 20))
+        dispatch = rng.uniform(0.5, 1, (2000, 20))
+        limits = rng.uniform(200, 400, (2000, 5))
+        result = self.engine.allocate(facilities, sensitivities, dispatch, limits)
+        fractions = [result.allocations[f.code] / f.certified_capacity for f in facilities]
+        self.assertTrue(np.allclose(fractions, fractions[0]))
+        allocation = np.array([result.allocations[f.code] for f in facilities])
+        self.assertAlmostEqual(self.engine.coverage(allocation, sensitivities, dispatch, limits), result.coverage)
+        self.assertGreaterEqual(result.coverage, 0.95)
+
+    def test_shape_errors(self):
+        """Verify mismatched matrices are rejected."""
+        with self.assertRaises(NAQError):
+            self.engine.allocate([NAQFacility("A", 1)], np.ones((1, 2)), np.ones((3, 1)), np.ones((3, 1)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+import json
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.loader import OntologyLoader
+from src.models import IntervalType
+from src.ontology_graph import OntologyGraph
+from src.validator import Validator
+from src import server
+
+
+class TestOntologyGraph(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        ontology_dir = os.path.join(os.path.dirname(__file__), '../ontology')
+        cls.ontology = OntologyLoader(ontology_dir).get_ontology()
+        cls.graph = OntologyGraph(cls.ontology)
+
+    def test_links_resolve_to_items(self):
+        """Verify references resolve to the nodes of the items they name."""
+        service = self.graph.node('market_services', 'RegulationRaise')
+        self.assertIs(service.link('dispatch_interval').item, self.ontology.interval_types['DispatchInterval'])
+        self.assertEqual([n.name for n in service.linked('compatible_with')],
+                         self.ontology.market_services['RegulationRaise'].compatible_with)
+
+        storage = self.graph.node('facility_types', 'Storage')
+        self.assertEqual(storage.link('default_class').section, 'facility_classes')
+        self.assertEqual(storage.link('default_technology').name, 'ESR')
+
+        rtm = self.graph.node('markets', 'RTM')
+        self.assertIn('dispatch_prices', [n.name for n in rtm.linked('related_tables')])
+
+    def test_referrers(self):
+        """Verify targets know which items refer to them."""
+        energy = self.graph.node('market_services', 'Energy')
+        self.assertIn(('RTM', 'procures'), [(node.name, field) for node, field in energy.referrers])
+
+    def test_dangling_references(self):
+        """Verify references to undefined concepts are reported rather than dropped."""
+        report = self.graph.dangling_report()
+        self.assertEqual({r['name'] for r in report['by_value']['CapacityYear']},
+                         {'PeakReserveCapacity', 'FlexibleReserveCapacity'})
+        self.assertIsNone(self.graph.node('market_services', 'PeakReserveCapacity').link('pricing_interval'))
+        self.assertEqual(report['dangling'], len(self.graph.dangling))
+
+    def test_validator_reports_unknown_names(self):
+        """Verify the validator reports unknown services, intervals and facility types."""
+        validator = Validator(self.ontology, self.graph)
+        result = validator.validate_operation("aggregate", {
+            "market_services": ["RegulationRaise", "RegulationUp"],
+            "source_interval": "DispatchInterval",
+            "target_interval": "CapacityYear",
+            "facility_type": "Battery"
+        })
+        self.assertFalse(result.is_valid)
+        self.assertTrue(any("Unknown Market Service: 'RegulationUp'" in v for v in result.violations))
+        self.assertTrue(any("Unknown Interval: 'CapacityYear'" in v for v in result.violations))
+        self.assertTrue(any("Unknown Facility Type: 'Battery'" in v for v in result.violations))
+
+    def test_server_tools(self):
+        """Verify the reference report tool and unresolved references in concept definitions."""
+        report = json.loads(server.get_reference_report())
+        self.assertIn('CapacityYear', report['by_value'])
+        definition = json.loads(server.get_concept_definition('PeakReserveCapacity'))
+        self.assertEqual(definition['unresolved_references'][0]['value'], 'CapacityYear')
+
+    def test_server_graph_follows_ontology(self):
+        """Verify the server's graph is rebuilt with the ontology by _init_components."""
+        intervals = {**server.ontology.interval_types, 'CapacityYear': IntervalType(duration_unit='year')}
+        with server.override_sections(interval_types=intervals):
+            definition = json.loads(server.get_concept_definition('PeakReserveCapacity'))
+            report = json.loads(server.get_reference_report())
+        self.assertNotIn('unresolved_references', definition)
+        self.assertNotIn('CapacityYear', report['by_value'])
+
+
+if __name__ == '__main__':
+    unittest.main()
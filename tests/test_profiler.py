@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+import json
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.metrics import instrument
+from src.profiler import profiler, redact
+from src import server
+
+@instrument
+def slow_tool(query: str, api_token: str = "", delay: float = 0.0) -> str:
+    time.sleep(delay)
+    return query
+
+class TestSlowCallProfiler(unittest.TestCase):
+    def setUp(self):
+        profiler.configure(threshold_ms=20, buffer_size=2, sample_interval_ms=2)
+        profiler.profiles.clear()
+
+    def tearDown(self):
+        profiler.configure(threshold_ms=None)
+
+    def test_only_slow_calls_are_profiled(self):
+        """Verify calls under the threshold are not captured and slow ones are sampled."""
+        slow_tool("fast")
+        self.assertEqual(profiler.recent(), [])
+
+        slow_tool("slow", api_token="abc123", delay=0.08)
+        profiles = profiler.recent()
+        self.assertEqual(len(profiles), 1)
+        self.assertEqual(profiles[0]["tool"], "slow_tool")
+        self.assertGreaterEqual(profiles[0]["duration_ms"], 20)
+        self.assertGreater(profiles[0]["samples"], 0)
+        self.assertIn("slow_tool", profiles[0]["stacks"][0]["stack"])
+        self.assertEqual(profiles[0]["arguments"]["api_token"], "[REDACTED]")
+
+    def test_ring_buffer(self):
+        """Verify only the last N profiles are kept, most recent first."""
+        for query in ["a", "b", "c"]:
+            slow_tool(query, delay=0.03)
+        queries = [p["arguments"]["args"][0] for p in profiler.recent()]
+        self.assertEqual(queries, ["c", "b"])
+
+    def test_diagnostics_tool(self):
+        """Verify profiles are exposed through the server."""
+        slow_tool("slow", delay=0.03)
+        result = json.loads(server.get_slow_call_profiles())
+        self.assertEqual(result["threshold_ms"], 20)
+        self.assertEqual(result["profiles"][0]["tool"], "slow_tool")
+
+    def test_redact(self):
+        """Verify nested secrets are redacted and long strings truncated."""
+        redacted = redact({"params": {"password": "x", "q": "y" * 500}})
+        self.assertEqual(redacted["params"]["password"], "[REDACTED]")
+        self.assertLess(len(redacted["params"]["q"]), 300)
+
+if __name__ == "__main__":
+    unittest.main()
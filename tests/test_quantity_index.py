@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import json
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.loader import OntologyLoader
+from src.models import QuantityType
+from src.quantity_index import QuantityTypeIndex
+from src import server
+
+class TestQuantityTypeIndex(unittest.TestCase):
+    def setUp(self):
+        ontology_dir = os.path.join(os.path.dirname(__file__), '../ontology')
+        self.ontology = OntologyLoader(ontology_dir).get_ontology()
+        self.index = QuantityTypeIndex(self.ontology)
+
+    def test_variant_lookup(self):
+        """Verify variants resolve by name and by dotted path to the same entry."""
+        by_name = self.index.get("StorageDischargeCapacityFactor")
+        by_path = self.index.get("CapacityFactor.StorageDischargeCapacityFactor")
+        self.assertIs(by_name, by_path)
+        self.assertEqual(by_name.parent.name, "CapacityFactor")
+        self.assertEqual(by_name.depth, 1)
+
+    def test_inherited_fields(self):
+        """Verify variants inherit unset fields from their parent."""
+        entry = self.index.get("GeneratorCapacityFactor")
+        self.assertEqual(entry.resolved["category"], "PerformanceMetric")
+        self.assertIn("category", entry.inherited_fields)
+        self.assertNotIn("valid_range", entry.inherited_fields)
+
+    def test_nested_units_and_aliases(self):
+        """Verify units inherit through several levels and aliases of variants resolve."""
+        ontology = self.ontology.model_copy(update={"quantity_types": {
+            "Energy": QuantityType(name="Energy", unit="MWh", variants={
+                "Storage": QuantityType(name="Storage", variants={
+                    "Discharge": QuantityType(name="Discharge", aliases=["DischargeEnergy"]),
+                }),
+            }),
+        }})
+        index = QuantityTypeIndex(ontology)
+        entry = index.get("DischargeEnergy")
+        self.assertEqual(entry.path, "Energy.Storage.Discharge")
+        self.assertEqual(entry.unit, "MWh")
+        self.assertEqual([a.name for a in index.ancestors("Discharge")], ["Storage", "Energy"])
+        self.assertEqual([c.name for c in index.children("Energy")], ["Storage"])
+
+    def test_concept_definition_for_variant(self):
+        """Verify get_concept_definition resolves variants and reports their path."""
+        definition = json.loads(server.get_concept_definition("CapacityFactor.GeneratorCapacityFactor"))
+        self.assertEqual(definition["name"], "Generator Capacity Factor")
+        self.assertEqual(definition["parent"], "CapacityFactor")
+        self.assertEqual(definition["category"], "PerformanceMetric")
+
+    def test_concept_definition_for_duplicate_variant_names(self):
+        """Verify a dotted path resolves to its own variant when another parent has one of the same name."""
+        with server.override_sections(quantity_types={
+            "A": QuantityType(name="A", unit="MW", variants={"X": QuantityType(name="A X")}),
+            "B": QuantityType(name="B", unit="MWh", variants={"X": QuantityType(name="B X")}),
+        }):
+            definition = json.loads(server.get_concept_definition("B.X"))
+            resolved = json.loads(server.resolve_concepts(["B.X"]))
+        self.assertEqual(definition["name"], "B X")
+        self.assertEqual(definition["path"], "B.X")
+        self.assertEqual(definition["unit"], "MWh")
+        self.assertEqual(resolved["concepts"]["B.X"]["definition"]["path"], "B.X")
+
+if __name__ == "__main__":
+    unittest.main()
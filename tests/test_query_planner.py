@@ -0,0 +1,88 @@
+import unittest
+import sys
+import os
+import sqlite3
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.loader import OntologyLoader
+from src.models import OperationDefinition
+from src.query_planner import QueryPlanner, PlanningError, quote_identifier
+
+PRICES = [
+    ("2024-01-01 00:05", "Energy", 100.0),
+    ("2024-01-01 00:05", "RegulationRaise", 20.0),
+    ("2024-01-01 00:10", "Energy", 200.0),
+]
+QUANTITIES = [
+    ("2024-01-01 00:05", "GEN1", "Energy", 10.0),
+    ("2024-01-01 00:10", "GEN1", "Energy", 30.0),
+    ("2024-01-01 00:10", "BESS1", "Energy", -5.0),   # charging, filtered out
+    ("2024-01-01 00:05", "GEN1", "RegulationRaise", 4.0),
+]
+
+class TestQueryPlanner(unittest.TestCase):
+    def setUp(self):
+        ontology_dir = os.path.join(os.path.dirname(__file__), '../ontology')
+        self.ontology = OntologyLoader(ontology_dir).get_ontology()
+        self.planner = QueryPlanner(self.ontology)
+
+        self.db = sqlite3.connect(":memory:")
+        self.db.execute('CREATE TABLE dispatch_prices (timestamp TEXT, market_service TEXT, price REAL)')
+        self.db.execute('CREATE TABLE dispatch_quantities (timestamp TEXT, facility TEXT, market_service TEXT, quantity REAL)')
+        self.db.executemany('INSERT INTO dispatch_prices VALUES (?, ?, ?)', PRICES)
+        self.db.executemany('INSERT INTO dispatch_quantities VALUES (?, ?, ?, ?)', QUANTITIES)
+
+    def test_dispatch_weighted_price(self):
+        """Verify the compiled query computes the dispatch-weighted price in the database."""
+        plan = self.planner.plan("calculate_dispatch_weighted_price", bindings={"time_period": "facility"})
+        # Finest grain (dispatch_quantities) drives; prices are a lookup on the join keys
+        self.assertEqual(plan.tables, ["dispatch_quantities", "dispatch_prices"])
+        # The quantity filter is pushed into the dispatch_quantities scan
+        self.assertIn('FROM "dispatch_quantities" WHERE "quantity" > 0', plan.sql)
+
+        rows = self.db.execute(plan.sql, plan.parameters).fetchall()
+        results = {(r[1], r[2]): r[3] for r in rows}
+        self.assertAlmostEqual(results[("GEN1", "Energy")], (100 * 10 + 200 * 30) / 40)
+        self.assertAlmostEqual(results[("GEN1", "RegulationRaise")], 20.0)
+        self.assertNotIn(("BESS1", "Energy"), results)
+
+    def test_parameters_are_pushed_down(self):
+        """Verify parameters become bound predicates on the tables they reference."""
+        plan = self.planner.plan(
+            "calculate_dispatch_weighted_price",
+            params={"market_service": "Energy", "start_time": "2024-01-01 00:10", "unknown": 1},
+            bindings={"time_period": "timestamp"},
+        )
+        # Join key predicates apply to both sides of the join
+        self.assertEqual(plan.sql.count('"market_service" = ?'), 2)
+        self.assertEqual(len(plan.warnings), 1)
+
+        rows = self.db.execute(plan.sql, plan.parameters).fetchall()
+        self.assertEqual(len(rows), 1)
+        self.assertAlmostEqual(rows[0][3], 200.0)
+
+    def test_quoted_physical_columns(self):
+        """Verify physical column names with spaces are quoted."""
+        self.ontology.operations["sent_out_total"] = OperationDefinition(
+            required_inputs=["sent_out_data.quantity"],
+            aggregation={"formula": "SUM(quantity)", "group_by": ["trading_date"]},
+        )
+        plan = self.planner.plan("sent_out_total")
+        self.assertIn('"Total Sent Out Generation (MWh)"', plan.sql)
+
+        self.db.execute('CREATE TABLE sent_out_data ("Trading Date" TEXT, "Total Sent Out Generation (MWh)" REAL)')
+        self.db.executemany('INSERT INTO sent_out_data VALUES (?, ?)', [("2024-01-01", 1.5), ("2024-01-01", 2.5)])
+        self.assertEqual(self.db.execute(plan.sql).fetchall(), [("2024-01-01", 4.0)])
+
+    def test_planning_errors(self):
+        """Verify operations that cannot be compiled raise PlanningError."""
+        with self.assertRaises(PlanningError):
+            self.planner.plan("calculate_capacity_factor")  # wikidata is not in the catalog
+        with self.assertRaises(PlanningError):
+            self.planner.plan("calculate_dispatch_weighted_price")  # time_period needs a binding
+        self.assertEqual(quote_identifier('a"b'), '"a""b"')
+
+if __name__ == "__main__":
+    unittest.main()
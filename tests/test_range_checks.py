@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+import json
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.loader import OntologyLoader
+from src.range_checks import RangeChecker, RangeCheckError
+from src import server
+
+class TestRangeChecks(unittest.TestCase):
+    def setUp(self):
+        ontology_dir = os.path.join(os.path.dirname(__file__), '../ontology')
+        self.checker = RangeChecker(OntologyLoader(ontology_dir).get_ontology())
+
+    def test_violation_masks(self):
+        """Verify below/above/missing masks and summary counts."""
+        values = np.array([0.8, 0.69, 0.96, np.nan, 0.95])
+        result = self.checker.check("RoundTripEfficiency", values)
+        np.testing.assert_array_equal(result.violations, [False, True, True, False, False])
+        self.assertEqual(result.summary()["below"], 1)
+        self.assertEqual(result.summary()["above"], 1)
+        self.assertEqual(result.summary()["missing"], 1)
+
+    def test_variant_resolution(self):
+        """Verify nested variants resolve to their own valid_range."""
+        result = self.checker.check("GeneratorCapacityFactor", [0.0, 1.0, 1.2, -0.1])
+        self.assertEqual(result.summary()["violations"], 2)
+
+    def test_unit_conversion_of_bounds(self):
+        """Verify values in a compatible unit are checked against converted bounds."""
+        result = self.checker.check("GeneratorCapacityFactor", np.array([50.0, 104.0, 106.0]), unit="%")
+        np.testing.assert_array_equal(result.violations, [False, False, True])
+
+    def test_errors(self):
+        """Verify unknown types and types without a range are rejected."""
+        with self.assertRaises(RangeCheckError):
+            self.checker.check("NotAQuantity", [1.0])
+        with self.assertRaises(RangeCheckError):
+            self.checker.check("SentOut", [1.0])  # alias of SentOutGeneration, which has no range
+
+    def test_server_tool(self):
+        """Verify the server reports violation indices."""
+        result = json.loads(server.check_value_range("RoundTripEfficiency", [0.8, 0.99]))
+        self.assertEqual(result["violation_indices"], [1])
+
+if __name__ == "__main__":
+    unittest.main()
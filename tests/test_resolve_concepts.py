@@ -0,0 +1,45 @@
+import unittest
+import sys
+import os
+import json
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import WEMRule
+from src import server
+
+RULES = {
+    "r1": WEMRule(id="r1", title="Regulation", content="Regulation Service.", section="3.9.2"),
+}
+
+class TestResolveConcepts(unittest.TestCase):
+    def test_batch_resolution(self):
+        """Verify concepts, aliases and table names resolve in one call."""
+        result = json.loads(server.resolve_concepts(["SentOutData", "dpv_forecast", "Energy", "Unknown"]))
+
+        self.assertEqual(result["not_found"], ["Unknown"])
+
+        sent_out = result["concepts"]["SentOutData"]
+        self.assertEqual(sent_out["resolved_as"], "SentOutGeneration")
+        self.assertEqual(sent_out["table_mapping"]["table"], "sent_out_data")
+
+        dpv = result["concepts"]["dpv_forecast"]
+        self.assertEqual(dpv["resolved_as"], "DPVForecast")
+        self.assertIn("trading_date", dpv["table_mapping"]["columns"])
+
+        energy = result["concepts"]["Energy"]
+        self.assertIsNone(energy["table_mapping"])
+        self.assertEqual(energy["conversion_rules"][0]["target"], "TradingInterval")
+
+    def test_shared_rule_enrichment(self):
+        """Verify rule details are shared across concepts rather than repeated."""
+        with server.override_sections(wem_rules=RULES):
+            result = json.loads(server.resolve_concepts(["RegulationRaise", "RegulationLower"]))
+
+        self.assertEqual(result["concepts"]["RegulationRaise"]["definition"]["related_wem_rules"], ["r1"])
+        self.assertEqual(result["concepts"]["RegulationLower"]["definition"]["related_wem_rules"], ["r1"])
+        self.assertEqual(list(result["wem_rules"].keys()), ["r1"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+import json
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import WEMRule
+from src.rule_tagger import AhoCorasick, RuleTagIndex, tokenize
+from src import server
+
+RULES = {
+    "r1": WEMRule(id="r1", title="Network access", section="4.15.1",
+                  content="AEMO must determine the Network Access Quantity (NAQ) for each Facility.",
+                  entities=["Storage"]),
+    "r2": WEMRule(id="r2", title="Loading", content="Loading of the RoCoF Control Service.", section="3.9.7"),
+}
+
+class TestRuleTagger(unittest.TestCase):
+    def setUp(self):
+        self.ontology = server.ontology.model_copy(update={"wem_rules": RULES})
+        self.tags = RuleTagIndex(self.ontology)
+
+    def test_automaton_overlapping_patterns(self):
+        """Verify overlapping and nested token patterns are all reported."""
+        matcher = AhoCorasick([("a", "b", "c"), ("b",), ("b", "c", "d")])
+        tokens = tokenize("A b c d")
+        found = sorted((matcher.patterns[p], first, last) for p, first, last in matcher.matches(tokens))
+        self.assertEqual(found, [(("a", "b", "c"), 0, 2), (("b",), 1, 1), (("b", "c", "d"), 1, 3)])
+
+    def test_rule_hits_with_positions(self):
+        """Verify display names and abbreviations are tagged with offsets into the field."""
+        hits = [h for h in self.tags.hits["r1"] if h["concept"] == "NetworkAccessQuantity"]
+        self.assertEqual([h["text"] for h in hits], ["Network Access Quantity", "NAQ"])
+        content = RULES["r1"].content
+        self.assertEqual(content[hits[1]["start"]:hits[1]["end"]], "NAQ")
+        self.assertIn("Storage", self.tags.concepts_for_rule("r1"))
+
+    def test_word_boundaries(self):
+        """Verify concepts are not matched inside longer words."""
+        self.assertNotIn("Load", self.tags.concepts_for_rule("r2"))
+        self.assertEqual(self.tags.rules_for_concept("RoCoF"), ["r2"])
+
+    def test_server_uses_tags(self):
+        """Verify related rules and the rule concepts tool use the tag index."""
+        with server.override_sections(wem_rules=RULES):
+            self.assertEqual(server._get_related_rule_ids("NetworkAccessQuantity"), ["r1"])
+            result = json.loads(server.get_rule_concepts("r2"))
+            self.assertIn("RoCoF", result["concepts"])
+            self.assertIn("not found", server.get_rule_concepts("missing"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+import json
+from datetime import date
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import WEMRule
+from src.temporal_index import RuleTemporalIndex
+from src import server
+
+RULES = {
+    "3.9.2@2020": WEMRule(id="3.9.2@2020", title="Regulation Raise", content="Regulation Raise Service (old).",
+                          section="3.9.2", effective_date="2020-01-01"),
+    "3.9.2@2023": WEMRule(id="3.9.2@2023", title="Regulation Raise", content="Regulation Raise Service (new).",
+                          section="3.9.2", effective_date="2023-10-01"),
+    "3.9.7": WEMRule(id="3.9.7", title="RoCoF Control Service", content="RoCoF Control Service.",
+                     section="3.9.7"),
+}
+
+class TestRuleTemporalIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = RuleTemporalIndex(RULES)
+
+    def test_governing_version(self):
+        """Verify the version in force is resolved by effective date."""
+        self.assertIsNone(self.index.governing_rule_id("3.9.2", date(2019, 12, 31)))
+        self.assertEqual(self.index.governing_rule_id("3.9.2", date(2022, 6, 1)), "3.9.2@2020")
+        self.assertEqual(self.index.governing_rule_id("3.9.2", date(2023, 10, 1)), "3.9.2@2023")
+
+    def test_undated_rules_always_in_force(self):
+        """Verify rules without an effective date are always in force."""
+        self.assertTrue(self.index.is_in_force("3.9.7", date(1990, 1, 1)))
+        self.assertEqual(sorted(self.index.rules_in_force(date(2021, 1, 1))), ["3.9.2@2020", "3.9.7"])
+
+    def test_distinct_clauses_in_one_section(self):
+        """Verify different clauses sharing a section are not treated as versions of each other."""
+        index = RuleTemporalIndex({
+            "2.1.1": WEMRule(id="2.1.1", title="Objectives", content="...", section="Chapter 2"),
+            "2.1.2": WEMRule(id="2.1.2", title="Functions", content="...", section="Chapter 2",
+                             effective_date="2020-01-01"),
+        })
+        self.assertEqual(sorted(index.rules_in_force(date(2024, 1, 1))), ["2.1.1", "2.1.2"])
+        self.assertEqual(index.rules_in_force(date(2019, 1, 1)), ["2.1.1"])
+
+    def test_search_as_of(self):
+        """Verify search_wem_rules filters to versions in force."""
+        with server.override_sections(wem_rules=RULES):
+            all_versions = json.loads(server.search_wem_rules("Regulation Raise"))
+            self.assertEqual(len(all_versions), 2)
+
+            in_force = json.loads(server.search_wem_rules("Regulation Raise", as_of="2021-07-01"))
+            self.assertEqual([r["id"] for r in in_force], ["3.9.2@2020"])
+
+            self.assertIn("Invalid as_of date", server.search_wem_rules("Regulation", as_of="not-a-date"))
+
+    def test_concept_definition_as_of(self):
+        """Verify related rules on a concept definition respect as_of."""
+        with server.override_sections(wem_rules=RULES):
+            definition = json.loads(server.get_concept_definition("RoCoF", as_of="2024-01-01"))
+        self.assertEqual(definition["related_wem_rules"], ["3.9.7"])
+
+if __name__ == "__main__":
+    unittest.main()
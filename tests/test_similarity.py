@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+import json
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import WEMRule
+from src.similarity import TfidfIndex, analyze
+from src import server
+
+RULES = {
+    "r1": WEMRule(id="r1", title="Regulation Raise", content="Regulation Raise Service enablement and pricing.", section="3.9.2"),
+    "r2": WEMRule(id="r2", title="Regulation Lower", content="Regulation Lower Service enablement and pricing.", section="3.9.3"),
+    "r3": WEMRule(id="r3", title="Reserve Capacity", content="Certified Reserve Capacity for each Capacity Year.", section="4.11"),
+}
+
+class TestSimilarity(unittest.TestCase):
+    def test_analyze(self):
+        """Verify CamelCase splitting and stop word removal."""
+        self.assertEqual(analyze("ContingencyRaise is the service"), ["contingency", "raise", "service"])
+
+    def test_matrix_layout_and_normalisation(self):
+        """Verify CSR rows are unit length and the transpose holds the same entries."""
+        index = TfidfIndex({"a": "storage charge", "b": "storage discharge discharge", "c": ""})
+        for i in range(2):
+            _, values = index.matrix.row(i)
+            self.assertAlmostEqual(float(values @ values), 1.0)
+        self.assertEqual(index.matrix.nnz, index._by_term.nnz)
+        self.assertEqual(index.similar_to_text("nothing matches"), [])
+
+    def test_ranking(self):
+        """Verify related documents rank first and the query document is excluded."""
+        index = TfidfIndex({rule_id: f"{r.title} {r.content}" for rule_id, r in RULES.items()})
+        self.assertEqual(index.similar_to_document("r1")[0][0], "r2")
+        self.assertNotIn("r1", [doc for doc, _ in index.similar_to_document("r1")])
+        self.assertEqual(index.similar_to_text("capacity year")[0][0], "r3")
+
+    def test_large_corpus_query(self):
+        """Verify top-k queries over 100k documents answer quickly."""
+        rng = np.random.default_rng(0)
+        words = np.array([f"w{i}" for i in range(5000)])
+        documents = {str(i): " ".join(row) for i, row in enumerate(words[rng.integers(0, 5000, (100000, 30))])}
+        index = TfidfIndex(documents)
+        start = time.perf_counter()
+        self.assertEqual(len(index.similar_to_document("42", k=10)), 10)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_server_tools(self):
+        """Verify the similar-rules and similar-concepts tools."""
+        with server.override_sections(wem_rules=RULES):
+            rules = json.loads(server.find_similar_rules("r2", limit=1))
+        self.assertEqual(rules[0]["id"], "r1")
+        concepts = json.loads(server.find_similar_concepts("RegulationRaise", limit=3))
+        self.assertEqual(concepts[0]["concept"], "RegulationLower")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+import json
+import io
+import contextlib
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.loader import OntologyLoader
+from src.validator import Validator
+from src.units import UnitSystem, UnitError, parse_unit
+from src import server
+
+class TestUnits(unittest.TestCase):
+    def setUp(self):
+        ontology_dir = os.path.join(os.path.dirname(__file__), '../ontology')
+        self.ontology = OntologyLoader(ontology_dir).get_ontology()
+        self.units = UnitSystem(self.ontology)
+
+    def test_parse_unit(self):
+        """Verify units are parsed into dimension vectors and scales."""
+        self.assertEqual(parse_unit("MW·h"), parse_unit("MWh"))
+        self.assertEqual(parse_unit("AUD/MWh")[0], (-1, 0, 1, 0))
+        self.assertEqual(parse_unit("MWs/h")[0], (1, -1, 0, 0))
+        with self.assertRaises(UnitError):
+            parse_unit("furlongs")
+
+    def test_ontology_units_interned(self):
+        """Verify every unit in the ontology parses."""
+        self.assertEqual(self.units.unknown_units, {})
+        self.assertIn("AUD/MWh", self.units.describe())
+
+    def test_bulk_conversion(self):
+        """Verify arrays are converted with precomputed factors."""
+        np.testing.assert_allclose(self.units.convert(np.array([30.0, 90.0]), "minutes", "hours"), [0.5, 1.5])
+        np.testing.assert_allclose(self.units.convert([1500.0], "kW", "MW"), [1.5])
+        self.assertEqual(self.units.factor("MW*h", "MWh"), 1.0)
+        with self.assertRaises(UnitError):
+            self.units.convert([1.0], "MW", "MWh")
+
+    def test_request_units_not_interned(self):
+        """Verify converting units that are not in the ontology leaves the interned table alone."""
+        interned = dict(self.units.describe())
+        self.assertAlmostEqual(self.units.factor("GW*s", "MWh"), 1000 / 3600)
+        self.assertEqual(self.units.dims("kW/min"), (1, -2, 0, 0))
+        self.assertEqual(self.units.describe(), interned)
+
+    def test_non_integer_exponents(self):
+        """Verify fractional exponents are rejected rather than truncated."""
+        with self.assertRaises(UnitError):
+            parse_unit("MW^0.5")
+        with self.assertRaises(UnitError):
+            self.units.formula_dims("a ** 0.5", {"a": "MW"})
+        self.assertEqual(self.units.formula_dims("a ** 2", {"a": "MW"}), (2, -2, 0, 0))
+
+    def test_formula_consistency(self):
+        """Verify formulas are checked for dimensional consistency at load time."""
+        report = self.units.formula_report
+        self.assertEqual(report["quantity_types.DurationRating"]["status"], "consistent")
+        self.assertEqual(report["unit_validation.capacity_factor"]["status"], "consistent")
+        self.assertEqual(report["quantity_types.AvailabilityFactor"]["derived_dimensions"], "dimensionless")
+        with self.assertRaises(UnitError):
+            self.units.formula_dims("a + b", {"a": "MW", "b": "MWh"})
+
+    def test_unitless_quantities_are_dimensionless(self):
+        """Verify formulas of quantity types without a unit are checked as dimensionless ratios."""
+        report = self.units.formula_report
+        self.assertEqual(report["quantity_types.AvailabilityFactor"]["status"], "consistent")
+        self.assertEqual(report["quantity_types.StorageChargeCapacityFactor"]["status"], "inconsistent")
+        self.assertIn("quantity_types.StorageChargeCapacityFactor", self.units.inconsistent_formulas())
+
+    def test_inconsistent_formulas_reported_at_load(self):
+        """Verify inconsistent formulas are warned about when the server builds its components."""
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            server._init_components(server.ontology)
+        self.assertIn("StorageChargeCapacityFactor formula is dimensionally inconsistent", stderr.getvalue())
+
+    def test_validator_accepts_equivalent_units(self):
+        """Verify unit validation compares dimensions and scale rather than strings."""
+        validator = Validator(self.ontology)
+        result = validator.validate_operation("capacity_factor", {"units": {"generation": "MW·h", "hours": "hours"}})
+        self.assertTrue(result.is_valid, result.violations)
+
+        result = validator.validate_operation("capacity_factor", {"units": {"hours": "minutes"}})
+        self.assertFalse(result.is_valid)
+        self.assertIn("multiply by 0.0166667", result.alternatives[0])
+
+    def test_unit_report_tool(self):
+        """Verify the unit report is exposed through the server."""
+        report = json.loads(server.get_unit_report())
+        self.assertIn("quantity_types.DurationRating", report["formulas"])
+
+if __name__ == "__main__":
+    unittest.main()